@@ -32,6 +32,12 @@ from app.db.base import Base
 target_metadata = Base.metadata
 
 import app.db.models_import
+from app.db.models.task_orm import UNMAPPED_SEARCH_OBJECTS
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Search column/indexes exist only in the database, keep autogenerate from dropping them
+    return name not in UNMAPPED_SEARCH_OBJECTS
 
 
 # other values from the config, defined by the needs of env.py,
@@ -56,6 +62,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -79,7 +86,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
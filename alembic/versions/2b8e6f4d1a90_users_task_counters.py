@@ -0,0 +1,38 @@
+"""users task counters
+
+Revision ID: 2b8e6f4d1a90
+Revises: 7c1f0b3e9a24
+Create Date: 2026-10-18 19:12:37.561204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e6f4d1a90'
+down_revision: Union[str, Sequence[str], None] = '7c1f0b3e9a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('pending_tasks', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('completed_tasks', sa.BigInteger(), server_default='0', nullable=False))
+    # Backfill from existing tasks; from here on every task write maintains them
+    op.execute(
+        """
+        UPDATE users SET
+            pending_tasks = (SELECT count(*) FROM tasks WHERE tasks.owner_id = users.id AND tasks.status = 'pending'),
+            completed_tasks = (SELECT count(*) FROM tasks WHERE tasks.owner_id = users.id AND tasks.status = 'completed')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'completed_tasks')
+    op.drop_column('users', 'pending_tasks')
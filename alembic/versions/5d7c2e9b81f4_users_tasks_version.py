@@ -0,0 +1,28 @@
+"""users tasks_version
+
+Revision ID: 5d7c2e9b81f4
+Revises: e3f08a61c4d2
+Create Date: 2026-10-18 15:02:44.730918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7c2e9b81f4'
+down_revision: Union[str, Sequence[str], None] = 'e3f08a61c4d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('tasks_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'tasks_version')
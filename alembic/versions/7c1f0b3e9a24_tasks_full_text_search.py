@@ -0,0 +1,57 @@
+"""tasks full text search
+
+Revision ID: 7c1f0b3e9a24
+Revises: 5d7c2e9b81f4
+Create Date: 2026-10-18 17:26:13.402871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f0b3e9a24'
+down_revision: Union[str, Sequence[str], None] = '5d7c2e9b81f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gin lets owner_id lead the GIN indexes; pg_trgm backs prefix/fuzzy title matches
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Stored generated column: rewrites tasks once, then kept current by PostgreSQL on every write
+    op.add_column(
+        'tasks',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_tasks_owner_search', 'tasks', ['owner_id', 'search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_tasks_owner_title_trgm',
+        'tasks',
+        ['owner_id', 'title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_owner_title_trgm', table_name='tasks')
+    op.drop_index('ix_tasks_owner_search', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
+    # Extensions are left installed; other schemas may depend on them
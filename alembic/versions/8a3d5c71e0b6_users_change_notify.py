@@ -0,0 +1,48 @@
+"""users change notify
+
+Revision ID: 8a3d5c71e0b6
+Revises: 2b8e6f4d1a90
+Create Date: 2026-10-18 21:04:52.118390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a3d5c71e0b6'
+down_revision: Union[str, Sequence[str], None] = '2b8e6f4d1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Workers cache resolved users and LISTEN on user_changed to drop stale entries.
+    # Only account columns fire it: task writes bump users.tasks_version and counters on every request.
+    op.execute(
+        """
+        CREATE FUNCTION notify_user_changed() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM pg_notify('user_changed', OLD.id::text);
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER users_notify_changed
+        AFTER UPDATE OF email, password_hash OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_user_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS users_notify_changed ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_user_changed()")
@@ -0,0 +1,32 @@
+"""tasks keyset pagination index
+
+Revision ID: 9b1e4d7a2c35
+Revises: 4c2ac6f25bd9
+Create Date: 2026-10-18 09:12:31.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e4d7a2c35'
+down_revision: Union[str, Sequence[str], None] = '4c2ac6f25bd9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # (owner_id, created_at, id) serves keyset pages for GET /api/tasks and
+    # covers every lookup the old owner_id-only index did.
+    op.create_index('ix_tasks_owner_created_id', 'tasks', ['owner_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_tasks_owner_id', table_name='tasks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tasks_owner_id', 'tasks', ['owner_id'], unique=False)
+    op.drop_index('ix_tasks_owner_created_id', table_name='tasks')
@@ -0,0 +1,43 @@
+"""tasks filter and sort indexes
+
+Revision ID: e3f08a61c4d2
+Revises: 9b1e4d7a2c35
+Create Date: 2026-10-18 11:40:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f08a61c4d2'
+down_revision: Union[str, Sequence[str], None] = '9b1e4d7a2c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_owner_status_created_id', 'tasks', ['owner_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_owner_updated_id', 'tasks', ['owner_id', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_tasks_owner_due_id', 'tasks', ['owner_id', 'due_date', 'id'], unique=False)
+    op.create_index('ix_tasks_owner_title_id', 'tasks', ['owner_id', 'title', 'id'], unique=False)
+    # Pending tasks by due date: overdue and "what's next" queries
+    op.create_index(
+        'ix_tasks_owner_pending_due',
+        'tasks',
+        ['owner_id', 'due_date', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_owner_pending_due', table_name='tasks')
+    op.drop_index('ix_tasks_owner_title_id', table_name='tasks')
+    op.drop_index('ix_tasks_owner_due_id', table_name='tasks')
+    op.drop_index('ix_tasks_owner_updated_id', table_name='tasks')
+    op.drop_index('ix_tasks_owner_status_created_id', table_name='tasks')
@@ -0,0 +1,24 @@
+import hashlib
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the values that determine a response body.
+    - Join parts, hash them, return quoted hex digest
+    """
+    raw = "|".join(str(part) for part in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+    - "*" matches anything
+    - Weak comparison (W/ prefixes ignored), as required for If-None-Match
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
@@ -0,0 +1,34 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+
+from app.api.serializers import task_orm_to_public
+from app.db.models.task_orm import TaskORM
+from app.models.task import TaskPublic
+
+# Export rows carry exactly the fields clients already see from TaskPublic
+EXPORT_FIELDS = list(TaskPublic.model_fields)
+
+
+async def ndjson_chunks(batches: AsyncIterator[Sequence[TaskORM]]) -> AsyncIterator[str]:
+    """
+    Serialize streamed task batches as NDJSON, one chunk per batch.
+    """
+    async for batch in batches:
+        yield "".join(task_orm_to_public(task).model_dump_json() + "\n" for task in batch)
+
+
+async def csv_chunks(batches: AsyncIterator[Sequence[TaskORM]]) -> AsyncIterator[str]:
+    """
+    Serialize streamed task batches as CSV, header first, then one chunk per batch.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(task_orm_to_public(task).model_dump(mode="json") for task in batch)
+        yield buffer.getvalue()
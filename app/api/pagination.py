@@ -0,0 +1,66 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from app.core.errors import InvalidCursorError
+
+CursorValue = datetime | float | str | None
+
+# Value kinds a cursor may carry for each sort key: d = datetime, n = null, f = float, s = string.
+# A cursor whose value does not fit the sort column is rejected here, not by the database.
+SORT_KEY_KINDS = {
+    "created_at": "d",
+    "updated_at": "dn",
+    "due_date": "dn",
+    "title": "s",
+    "rank": "f",        # search relevance
+}
+
+
+def encode_cursor(sort_key: str, value: CursorValue, task_id: UUID) -> str:
+    """
+    Encode a keyset position as an opaque cursor.
+    - Serialize the sort key, the sort column value and id of the last row on the page
+    - Return URL-safe base64 string (no padding)
+    """
+    if isinstance(value, datetime):
+        kind, raw_value = "d", value.isoformat()
+    elif value is None:
+        kind, raw_value = "n", None
+    elif isinstance(value, float):
+        kind, raw_value = "f", value
+    else:
+        kind, raw_value = "s", value
+    raw = json.dumps([sort_key, kind, raw_value, str(task_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple[CursorValue, UUID]:
+    """
+    Decode an opaque cursor back into a keyset position.
+    - Raise InvalidCursorError if the cursor was not produced by encode_cursor
+    - Raise InvalidCursorError if the cursor belongs to a different sort order
+    - Raise InvalidCursorError if the value kind does not match the sort column (see SORT_KEY_KINDS)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_key, kind, raw_value, task_id_raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if cursor_sort_key != sort_key or not isinstance(task_id_raw, str):
+            raise InvalidCursorError()
+        if kind not in SORT_KEY_KINDS.get(sort_key.removeprefix("-"), ""):
+            raise InvalidCursorError()
+        if kind == "d" and isinstance(raw_value, str):
+            value = datetime.fromisoformat(raw_value)
+        elif kind == "n":
+            value = None
+        elif kind == "f" and isinstance(raw_value, (int, float)):
+            value = float(raw_value)
+        elif kind == "s" and isinstance(raw_value, str):
+            value = raw_value
+        else:
+            raise InvalidCursorError()
+        return value, UUID(task_id_raw)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise InvalidCursorError()
@@ -1,8 +1,19 @@
+from collections.abc import Iterable
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
 from app.models.task import TaskPublic, TaskStatus
 from app.db.models.task_orm import TaskORM
 from app.models.user import UserPublic
 from app.db.models.user_orm import UserORM
 
+# Serialization-only mirror of TaskPublic: same fields and JSON, but rows are plain dicts (no model instance,
+# no validators) and status stays the stored string (TaskStatus values)
+TaskRow = TypedDict("TaskRow", {**{name: field.annotation for name, field in TaskPublic.model_fields.items()}, "status": str})
+TASK_ROWS_ADAPTER = TypeAdapter(list[TaskRow])
+
 def task_orm_to_public(task: TaskORM) -> TaskPublic:
     public = TaskPublic(
         id=task.id,
@@ -15,6 +26,30 @@ def task_orm_to_public(task: TaskORM) -> TaskPublic:
     )
     return public
 
+def task_orm_to_row(task: TaskORM) -> TaskRow:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "due_date": task.due_date,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
+
+def tasks_json_response(tasks: Iterable[TaskORM], response: Response) -> Response:
+    """
+    Task list endpoints: JSON bytes straight from ORM rows, for data from our own database (already validated on write).
+    - Skips building TaskPublic (validators), FastAPI's response_model validation and its json.dumps pass;
+      the route keeps response_model=list[TaskPublic], so the OpenAPI schema is unchanged
+    - Output is byte-identical to the response_model path
+    - Headers set on the endpoint's injected response (ETag, X-Next-Cursor) are carried over
+    """
+    body = TASK_ROWS_ADAPTER.dump_json([task_orm_to_row(task) for task in tasks])
+    json_response = Response(body, media_type="application/json")
+    json_response.headers.raw.extend(response.headers.raw)
+    return json_response
+
 def user_orm_to_public(user: UserORM) -> UserPublic:
     public = UserPublic(
         id=user.id,
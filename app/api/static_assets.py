@@ -0,0 +1,145 @@
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+
+from starlette.responses import Response
+
+from app.api.etag import etag_matches
+from app.core.http import negotiate_encoding
+
+try:
+    import brotli
+except ImportError:     # optional: gzip only
+    brotli = None
+
+# Vite writes content-hashed bundles here, so their URLs never serve different bytes
+HASHED_ASSET_DIR = "assets"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# index.html and other unhashed files: cache, but revalidate (ETag) before every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = frozenset((
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+))
+# Smaller bodies are not worth a compressed variant
+MIN_COMPRESS_BYTES = 256
+
+
+class AssetVariant:
+    """
+    One encoding of an asset: the body and its precomputed response headers.
+    """
+    __slots__ = ("body", "etag", "raw_headers")
+
+    def __init__(self, body: bytes, etag: str, headers: dict[str, str]):
+        self.body = body
+        self.etag = etag
+        self.raw_headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+
+
+class StaticAsset:
+    """
+    A file from the frontend build, loaded once: identity body plus gzip/brotli variants when they are smaller.
+    """
+    __slots__ = ("path", "variants")
+
+    def __init__(self, path: str, body: bytes):
+        self.path = path
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        compressible = content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+        if content_type.startswith("text/") or content_type == "application/javascript":
+            content_type += "; charset=utf-8"
+        digest = hashlib.sha1(body).hexdigest()
+
+        encodings = {"identity": body}
+        if compressible and len(body) >= MIN_COMPRESS_BYTES:
+            if brotli is not None:
+                encodings["br"] = brotli.compress(body, quality=11)
+            encodings["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+
+        base_headers = {
+            "content-type": content_type,
+            "cache-control": IMMUTABLE_CACHE_CONTROL if path.startswith(HASHED_ASSET_DIR + "/") else REVALIDATE_CACHE_CONTROL,
+        }
+        if len(encodings) > 1:
+            base_headers["vary"] = "Accept-Encoding"
+
+        self.variants: dict[str, AssetVariant] = {}
+        for encoding, encoded in encodings.items():
+            if encoding != "identity" and len(encoded) >= len(body):
+                continue
+            # Strong ETags must differ between encodings of the same file
+            etag = f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            headers = {**base_headers, "etag": etag}
+            if encoding != "identity":
+                headers["content-encoding"] = encoding
+            self.variants[encoding] = AssetVariant(encoded, etag, headers)
+
+    def variant(self, accept_encoding: str | None) -> AssetVariant:
+        if len(self.variants) > 1:
+            encoding = negotiate_encoding(accept_encoding, [name for name in ("br", "gzip") if name in self.variants])
+            if encoding is not None:
+                return self.variants[encoding]
+        return self.variants["identity"]
+
+
+class AssetResponse(Response):
+    """
+    Sends a variant's body and headers as built at startup; only the header list is copied (middleware edits it).
+    """
+
+    def __init__(self, variant: AssetVariant, status_code: int = 200):
+        self.status_code = status_code
+        self.background = None
+        if status_code == 304:
+            self.body = b""
+            self.raw_headers = [header for header in variant.raw_headers if header[0] != b"content-type"]
+        else:
+            self.body = variant.body
+            self.raw_headers = [*variant.raw_headers, (b"content-length", str(len(variant.body)).encode())]
+
+
+class StaticAssets:
+    """
+    Frontend build (dist) held in memory, scanned once at startup.
+    - Lookups are by exact relative URL path in the manifest, never by joining request paths onto the filesystem,
+      so "..", encoded separators and symlinks cannot reach files outside dist
+    - Unknown paths get index.html (client-side routes), except under assets/ where a miss is a 404
+    """
+
+    def __init__(self, assets: dict[str, StaticAsset], fallback: str = "index.html"):
+        self.assets = assets
+        self.fallback = assets.get(fallback)
+
+    @classmethod
+    def scan(cls, root: Path) -> "StaticAssets":
+        assets = {}
+        if root.is_dir():
+            root = root.resolve()
+            for file in sorted(root.rglob("*")):
+                if file.is_file() and file.resolve().is_relative_to(root):
+                    path = file.relative_to(root).as_posix()
+                    assets[path] = StaticAsset(path, file.read_bytes())
+        return cls(assets)
+
+    def lookup(self, path: str) -> StaticAsset | None:
+        path = path.lstrip("/")
+        asset = self.assets.get(path)
+        if asset is None and not path.startswith(HASHED_ASSET_DIR + "/"):
+            asset = self.fallback
+        return asset
+
+    def response(self, path: str, if_none_match: str | None, accept_encoding: str | None) -> Response:
+        asset = self.lookup(path)
+        if asset is None:
+            return Response(status_code=404)
+        variant = asset.variant(accept_encoding)
+        # Any encoding's ETag means the client has the file (If-None-Match uses weak comparison)
+        if if_none_match and any(etag_matches(if_none_match, other.etag) for other in asset.variants.values()):
+            return AssetResponse(variant, status_code=304)
+        return AssetResponse(variant)
@@ -0,0 +1,143 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+
+from app.core.errors import InvalidImportFileError, ImportLimitExceededError
+from app.models.task import TaskCreate, TaskFileFormat, TaskImportLineError
+
+# Columns read from import rows; anything else (id and timestamps from an export) is ignored
+IMPORT_FIELDS = set(TaskCreate.model_fields)
+
+# A record is either parsed fields or the reason it could not be parsed
+Record = tuple[int, dict | str]
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """
+    Split a streamed request body into numbered lines (1-based).
+    - Accept \n and \r\n line endings and a leading UTF-8 BOM
+    - Raise InvalidImportFileError if the body is not valid UTF-8
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_no = 0
+    try:
+        async for chunk in body:
+            pending += decoder.decode(chunk)
+            *complete, pending = pending.split("\n")
+            for line in complete:
+                line_no += 1
+                yield line_no, line.removesuffix("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise InvalidImportFileError("Import file must be UTF-8 encoded")
+    if pending:
+        yield line_no + 1, pending.removesuffix("\r")
+
+
+async def _ndjson_records(body: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    One record per non-blank line.
+    """
+    async for line_no, line in _lines(body):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_no, "invalid JSON"
+            continue
+        yield line_no, data if isinstance(data, dict) else "expected a JSON object"
+
+
+async def _csv_records(body: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """
+    One record per CSV row, numbered by the line the row starts on.
+    - First row is the header and must name a title column
+    - Quoted fields may span lines; empty fields are treated as missing
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    start = 0
+    async for line_no, line in _lines(body):
+        if not pending:
+            if not line.strip():
+                continue
+            start = line_no
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            # Inside a quoted field, the row continues on the next line
+            continue
+        pending = []
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as exc:
+            yield start, f"invalid CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            if "title" not in header:
+                raise InvalidImportFileError("CSV header must include a title column")
+            continue
+        if len(values) != len(header):
+            yield start, f"expected {len(header)} fields, got {len(values)}"
+            continue
+        yield start, {name: value for name, value in zip(header, values) if name in IMPORT_FIELDS and value != ""}
+    if pending:
+        yield start, "unterminated quoted field"
+    if header is None:
+        raise InvalidImportFileError("CSV import is missing a header row")
+
+
+def _error_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+        for error in exc.errors()
+    )
+
+
+class TaskImportReader:
+    """
+    Turn an uploaded NDJSON or CSV body into chunks of validated TaskCreate rows.
+    - Invalid rows are skipped: all are counted in failed, the first max_errors are kept in errors
+    - Raise ImportLimitExceededError once the body holds more than max_rows rows
+    """
+
+    def __init__(self, file_format: TaskFileFormat, *, chunk_size: int, max_rows: int, max_errors: int):
+        self.file_format = file_format
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.max_errors = max_errors
+        self.failed = 0
+        self.errors: list[TaskImportLineError] = []
+
+    def _fail(self, line_no: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(TaskImportLineError(line=line_no, error=message))
+
+    async def chunks(self, body: AsyncIterator[bytes]) -> AsyncIterator[list[TaskCreate]]:
+        records = _ndjson_records(body) if self.file_format == TaskFileFormat.ndjson else _csv_records(body)
+        rows = 0
+        chunk: list[TaskCreate] = []
+        async for line_no, data in records:
+            rows += 1
+            if rows > self.max_rows:
+                raise ImportLimitExceededError(f"Import cannot contain more than {self.max_rows} rows")
+            if isinstance(data, str):
+                self._fail(line_no, data)
+                continue
+            try:
+                chunk.append(TaskCreate.model_validate(data))
+            except ValidationError as exc:
+                self._fail(line_no, _error_message(exc))
+                continue
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -1,32 +1,63 @@
-from fastapi import Depends, HTTPException, status
+import secrets
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.auth.jwt import VerifiedToken, verify_access_token
+from app.db.session import get_async_db
 from app.core.errors import InvalidCredentialsError
-from app.services.auth_service import resolve_current_user
+from app.services.auth_service_async import resolve_current_user
+from app.core.settings import get_settings
 
 bearer_scheme = HTTPBearer()
 
-def get_current_user(
+
+def request_verified_token(request: Request, token: str) -> VerifiedToken:
+    """
+    Claims of the request's bearer token.
+    - Reuse the verification done by AuthContextMiddleware, verify here only if it did not succeed
+    - Raise JWTError if the token is invalid or expired
+    """
+    verified = getattr(request.state, "verified_token", None)
+    if verified is not None and verified.token == token:
+        return verified
+    return verify_access_token(token)
+
+
+async def get_current_user(
+    request: Request,
     creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get the current user.
     
-    - Verify JWT access token and retrieve subject (User ID)
-    - Fetch User from db by User ID
-    - Return User
+    - Take the verified JWT claims of the request and retrieve subject (User ID)
+    - Fetch User by User ID (user cache, then db)
+    - Return UserPublic
     """
     if creds is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
-    token = creds.credentials
-
     try:
-        user = resolve_current_user(db, token)
-    except InvalidCredentialsError:
+        verified = request_verified_token(request, creds.credentials)
+        user = await resolve_current_user(db, verified.subject)
+    except (JWTError, InvalidCredentialsError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
     return user
 
+
+def require_internal_access(x_internal_token: str | None = Header(None)) -> None:
+    """
+    Guard internal (operational) endpoints.
+    - If INTERNAL_API_TOKEN is set, require it in the X-Internal-Token header
+    - Otherwise only serve in DEV; in PROD respond as if the route did not exist
+    """
+    settings = get_settings()
+    if settings.INTERNAL_API_TOKEN:
+        if x_internal_token is None or not secrets.compare_digest(x_internal_token, settings.INTERNAL_API_TOKEN):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+    elif settings.ENV != "DEV":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
@@ -1,3 +1,6 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
 from jose import jwt
 
@@ -41,4 +44,71 @@ def get_token_subject(token: str) -> str:
     Get access token subject.
     - Returns the "sub" field from access token payload if token is valid, otherwise raises JWTError.
     """
-    return decode_access_token(token).get("sub")
\ No newline at end of file
+    return verify_access_token(token).subject
+
+
+class VerifiedToken:
+    """
+    Claims of an access token whose signature and expiry have been checked.
+    """
+    __slots__ = ("token", "claims", "subject", "expires_at")
+
+    def __init__(self, token: str, claims: dict):
+        self.token = token
+        self.claims = claims
+        self.subject: str | None = claims.get("sub")
+        exp = claims.get("exp")
+        self.expires_at: float | None = float(exp) if isinstance(exp, (int, float)) else None
+
+
+class VerifiedTokenCache:
+    """
+    LRU of recently verified access tokens, so repeat requests skip signature verification.
+    - Keyed by the full token string (signature included): a token that differs in any byte is verified again
+    - An entry is only served before its exp; tokens without exp and failures are never cached
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[str, VerifiedToken] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> VerifiedToken | None:
+        verified = self._entries.get(token)
+        if verified is not None and verified.expires_at <= self._clock():
+            self._entries.pop(token, None)
+            verified = None
+        if verified is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return verified
+
+    def put(self, verified: VerifiedToken) -> None:
+        if self.max_size <= 0 or verified.expires_at is None:
+            return
+        self._entries[verified.token] = verified
+        self._entries.move_to_end(verified.token)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.JWT_VERIFIED_CACHE_SIZE)
+
+
+def verify_access_token(token: str) -> VerifiedToken:
+    """
+    Verify an access token, reusing a recent verification of the same token.
+    - Raises JWTError if the token is invalid or expired.
+    """
+    verified = verified_tokens.get(token)
+    if verified is None:
+        verified = VerifiedToken(token, decode_access_token(token))
+        verified_tokens.put(verified)
+    return verified
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.auth import security
+from app.core.errors import PasswordHasherBusyError
+from app.core.histogram import Histogram
+from app.core.settings import get_settings
+
+# Upper bounds (seconds) of the queue wait and bcrypt duration histogram buckets; one hash is ~250ms
+HASH_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PasswordHasher:
+    """
+    Bounded executor for bcrypt, separate from the threadpool that serves requests.
+    - bcrypt releases the GIL, so one thread per core hashes in parallel without pickling or worker processes
+    - At most max_queue jobs wait for a thread; beyond that submit fails fast with PasswordHasherBusyError
+    - Jobs are counted from the event loop only, so no locking is needed
+    - A job holds its slot until its thread is done with it: a cancelled request does not free a
+      slot that is still hashing (only a job still queued is dropped at once)
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.queue_wait = Histogram(HASH_BUCKETS_S)
+        self.hash_time = Histogram(HASH_BUCKETS_S)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.in_flight - self.workers, 0)
+
+    def _timed(self, submitted: float, fn: Callable, args: tuple):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.queue_wait.observe(started - submitted)
+            self.hash_time.observe(time.perf_counter() - started)
+
+    async def submit(self, fn: Callable, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordHasherBusyError()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        loop = asyncio.get_running_loop()
+        job = self._executor.submit(self._timed, time.perf_counter(), fn, args)
+        self.in_flight += 1
+        # Registered before wrap_future, so the counters are updated before the awaiter resumes
+        job.add_done_callback(lambda done: self._call_in_loop(loop, self._finished, done))
+        return await asyncio.wrap_future(job)
+
+    @staticmethod
+    def _call_in_loop(loop: asyncio.AbstractEventLoop, callback: Callable, *args) -> None:
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass    # loop already closed (shutdown); its counters are gone with it
+
+    def _finished(self, job: Future) -> None:
+        self.in_flight -= 1
+        if job.cancelled():
+            return
+        if job.exception() is None:
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    async def hash_password(self, password: str) -> str:
+        return await self.submit(security.hash_password, password)
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        return await self.submit(security.verify_password, password, password_hash)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "hash_seconds": self.hash_time.snapshot(),
+        }
+
+
+settings = get_settings()
+password_hasher = PasswordHasher(
+    settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -1,16 +1,104 @@
+import logging
+import math
+import time
+
 import bcrypt
 
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Calibrated work factors are clamped to this range; a fixed BCRYPT_ROUNDS is used as configured
+MIN_CALIBRATED_ROUNDS = 10
+MAX_CALIBRATED_ROUNDS = 16
+# Calibration times a few cheap hashes at this cost and extrapolates (each extra round doubles the time)
+CALIBRATION_ROUNDS = 8
+CALIBRATION_SAMPLES = 3
+
+_rounds: int | None = None
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """
+    Pick the bcrypt work factor whose hash time on this machine is closest to target_ms.
+    """
+    password = b"calibration-password"
+    salt = bcrypt.gensalt(rounds=CALIBRATION_ROUNDS)
+    samples = []
+    for _ in range(CALIBRATION_SAMPLES):
+        start = time.perf_counter()
+        bcrypt.hashpw(password, salt)
+        samples.append(time.perf_counter() - start)
+    sample_ms = max(min(samples) * 1000.0, 1e-3)
+    rounds = CALIBRATION_ROUNDS + round(math.log2(target_ms / sample_ms))
+    return min(max(rounds, MIN_CALIBRATED_ROUNDS), MAX_CALIBRATED_ROUNDS)
+
+
+def bcrypt_rounds() -> int:
+    """
+    Work factor for new hashes: BCRYPT_ROUNDS, or calibrated to BCRYPT_TARGET_HASH_MS on first use.
+    - Calibrating hashes for a while, so call this on the password hasher's threads only
+      (the app lifespan does, at startup)
+    """
+    global _rounds
+    if _rounds is None:
+        if settings.BCRYPT_ROUNDS:
+            _rounds = settings.BCRYPT_ROUNDS
+        else:
+            _rounds = calibrate_rounds(settings.BCRYPT_TARGET_HASH_MS)
+            logger.info("Calibrated bcrypt rounds=%d for target %dms", _rounds, settings.BCRYPT_TARGET_HASH_MS)
+    return _rounds
+
+
+def current_rounds() -> int | None:
+    """
+    Work factor for new hashes if already known, None while calibration is pending; never calibrates.
+    """
+    if _rounds is not None:
+        return _rounds
+    return settings.BCRYPT_ROUNDS or None
+
+
+def hash_rounds(password_hash: str) -> int | None:
+    """
+    Work factor stored in a bcrypt hash ("$2b$12$..."), None if it is not a bcrypt hash.
+    """
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+    Whether a stored hash should be replaced at the next successful login.
+    - Any difference from a fixed BCRYPT_ROUNDS
+    - More than one round away from a calibrated cost: workers calibrating on similar hardware
+      can land one round apart, and rehashing on each would flip users' hashes back and forth
+    - Runs on the event loop, so a cost still being calibrated counts as matching (the next login checks again)
+    """
+    stored = hash_rounds(password_hash)
+    if stored is None:
+        return True
+    rounds = current_rounds()
+    if rounds is None:
+        return False
+    tolerance = 0 if settings.BCRYPT_ROUNDS else 1
+    return abs(stored - rounds) > tolerance
+
+
 def hash_password(password: str) ->str:
     """
     Create a hash for plaintext password.
     - Convert plaintext password to bytes (utf-8)
-    - Generate salt
+    - Generate salt at the configured or calibrated cost
     - Generate hash
     - Return decoded hash (utf-8)
     """
     # bcrypt expects bytes
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=bcrypt_rounds())
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode("utf-8")
 
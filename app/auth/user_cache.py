@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from uuid import UUID
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from app.core.settings import get_settings
+from app.models.user import UserPublic
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY channel of the users trigger (migration 8a3d5c71e0b6); payload is the user id
+USER_CHANGED_CHANNEL = "user_changed"
+# Wait before reconnecting a dropped listener connection
+LISTEN_RETRY_S = 5.0
+
+
+class UserCache:
+    """
+    Bounded LRU of resolved users with a TTL (per process).
+    - Entries are UserPublic snapshots (no password hash, no session), safe to share between requests
+    - invalidate()/clear() bump epoch; a lookup that started before either does not store its result
+    """
+
+    def __init__(self, max_size: int, ttl_s: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._clock = clock
+        # user id -> (expires at, user); least recently used first
+        self._entries: OrderedDict[UUID, tuple[float, UserPublic]] = OrderedDict()
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, user_id: UUID) -> UserPublic | None:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] <= self._clock():
+            del self._entries[user_id]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user: UserPublic, epoch: int) -> None:
+        """
+        Store a user read from the database; epoch is the value seen before the read.
+        """
+        if self.max_size <= 0 or epoch != self.epoch:
+            return
+        self._entries[user.id] = (self._clock() + self.ttl_s, user)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: UUID) -> None:
+        self.epoch += 1
+        self.invalidations += 1
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_s": self.ttl_s,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+settings = get_settings()
+user_cache = UserCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_S)
+
+
+def _handle_notification(cache: UserCache, payload: str) -> None:
+    try:
+        user_id = UUID(payload)
+    except ValueError:
+        logger.warning("Unexpected %s payload %r, clearing user cache", USER_CHANGED_CHANNEL, payload)
+        cache.clear()
+        return
+    cache.invalidate(user_id)
+
+
+async def listen_for_user_changes(conninfo: str, cache: UserCache, *, retry_s: float = LISTEN_RETRY_S) -> None:
+    """
+    Invalidate cached users changed by any process (LISTEN/NOTIFY), until cancelled.
+    - Notifications sent while disconnected are lost, so the cache is cleared on every (re)connect
+    - While the listener is down, entries changed elsewhere can be served until USER_CACHE_TTL_S
+    """
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(
+                conninfo, autocommit=True, connect_timeout=settings.DB_CONNECT_TIMEOUT_S
+            ) as conn:
+                await conn.execute(f"LISTEN {USER_CHANGED_CHANNEL}")
+                cache.clear()
+                logger.info("Listening for user changes on %s", USER_CHANGED_CHANNEL)
+                async for notification in conn.notifies():
+                    _handle_notification(cache, notification.payload)
+        except (psycopg.Error, OSError) as exc:
+            logger.warning("User cache listener unavailable (%s), retrying in %.0fs", exc, retry_s)
+        await asyncio.sleep(retry_s)
+
+
+def start_user_change_listener() -> asyncio.Task | None:
+    """
+    Start the invalidation listener for this worker (PostgreSQL only; the cache is per process).
+    """
+    url = make_url(settings.DATABASE_URL)
+    if user_cache.max_size <= 0 or url.get_backend_name() != "postgresql":
+        return None
+    conninfo = url.set(drivername="postgresql").render_as_string(hide_password=False)
+    return asyncio.create_task(listen_for_user_changes(conninfo, user_cache), name="user-cache-listener")
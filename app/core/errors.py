@@ -19,6 +19,42 @@ class EmailAlreadyInUseError(Exception):
     """
     pass
 
+class InvalidCursorError(Exception):
+    """
+    Raised when a pagination cursor cannot be decoded.
+    """
+    pass
+
+class InvalidImportFileError(Exception):
+    """
+    Raised when an uploaded import file cannot be parsed at all (encoding, missing CSV header).
+    """
+    pass
+
+class ImportLimitExceededError(Exception):
+    """
+    Raised when an import file contains more rows than allowed.
+    """
+    pass
+
+class InvalidRefreshTokenError(Exception):
+    """
+    Raised when a refresh token is unknown, expired, revoked or already used.
+    """
+    pass
+
+class PasswordHasherBusyError(Exception):
+    """
+    Raised when the password hashing queue is full.
+    """
+    pass
+
+class PinStoreError(Exception):
+    """
+    Raised when the shared read-your-writes pin store is unavailable.
+    """
+    pass
+
 
 def _payload(error: str, message: str, details=None, request_id: str | None = None) -> dict:
     data = {"error": error, "message": message}
@@ -36,8 +72,10 @@ def _http_error_code_from_status(status_code: int) -> str:
         403: "forbidden",
         404: "not_found",
         409: "conflict",
+        413: "payload_too_large",
         422: "validation_error",
         500: "internal_error",
+        503: "service_unavailable",
     }
     return mapping.get(status_code, "http_error")
 
@@ -49,6 +87,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         return JSONResponse(
             status_code=exc.status_code,
             content=_payload(error_code, str(exc.detail)),
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
@@ -0,0 +1,28 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of durations (seconds).
+    - bounds are the bucket upper bounds; values above the last one land in +Inf
+    """
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+
+    def snapshot(self) -> dict:
+        """
+        Buckets are cumulative (Prometheus "le" style), so "+Inf" equals count.
+        """
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*map(str, self.bounds), "+Inf"), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": self.sum, "count": cumulative}
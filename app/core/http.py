@@ -0,0 +1,46 @@
+from collections.abc import Iterable
+
+
+def encoding_qvalues(accept_encoding: str) -> dict[str, float]:
+    """
+    q-value of each coding named in an Accept-Encoding header (lowercased; "*" included as named).
+    - A coding without q= has q=1; entries with an invalid or out of range q are ignored
+    """
+    qvalues = {}
+    for part in accept_encoding.lower().split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = -1.0
+        if 0 <= q <= 1:
+            qvalues[coding] = q
+    return qvalues
+
+
+def negotiate_encoding(accept_encoding: str | None, supported: Iterable[str]) -> str | None:
+    """
+    Coding to respond with, or None to send the response as is (identity).
+    - Highest q-value wins; ties go to the coding listed first in supported (server preference)
+    - "*" gives its q-value to every supported coding the header does not name; q=0 refuses a coding
+    - An explicitly listed identity that outranks every coding keeps the response uncompressed
+    """
+    if not accept_encoding:
+        return None
+    qvalues = encoding_qvalues(accept_encoding)
+    wildcard = qvalues.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = qvalues.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    if best is not None and qvalues.get("identity", 0.0) > best_q:
+        return None
+    return best
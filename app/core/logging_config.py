@@ -0,0 +1,154 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# Structured fields passed with extra= that the JSON formatter copies into the document
+EXTRA_FIELDS = ("method", "path", "status_code", "duration_ms", "db_queries", "db_ms")
+
+
+class RequestLogContext:
+    """
+    Logging state of one HTTP request, shared by every record logged while handling it.
+    - user_id is read from the ASGI scope when a record is logged, i.e. after AuthContextMiddleware
+    - sampled is decided on the request's first INFO record and kept, so a request logs all or none of them
+    """
+    __slots__ = ("request_id", "scope", "sampled")
+
+    def __init__(self, request_id: str, scope: dict | None = None):
+        self.request_id = request_id
+        self.scope = scope
+        self.sampled: bool | None = None
+
+    @property
+    def user_id(self) -> str | None:
+        state = self.scope.get("state") if self.scope else None
+        return state.get("user_id") if state else None
+
+
+# Set per request by RequestLoggingMiddleware; None outside a request
+current_request_log: ContextVar[RequestLogContext | None] = ContextVar("current_request_log", default=None)
+
+
+class RequestLogFilter(logging.Filter):
+    """
+    Runs in the caller's thread, before the queue: stamps request_id/user_id and samples INFO records of successful requests.
+    - WARNING and above, and records logged outside a request, are always kept
+    - The request summary line (has status_code) is kept for 4xx/5xx and slow requests even when not sampled
+    """
+
+    def __init__(self, sample_rate: float = 1.0, slow_request_ms: float = 0.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = current_request_log.get()
+        if context is None:
+            return True
+        record.request_id = context.request_id
+        record.user_id = context.user_id
+        if record.levelno >= logging.WARNING:
+            return True
+
+        if context.sampled is None:
+            context.sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        if context.sampled or self._always_kept(record):
+            return True
+        self.dropped += 1
+        return False
+
+    def _always_kept(self, record: logging.LogRecord) -> bool:
+        status_code = getattr(record, "status_code", None)
+        if status_code is None:
+            return False
+        duration_ms = getattr(record, "duration_ms", 0.0)
+        return status_code >= 400 or bool(self.slow_request_ms and duration_ms >= self.slow_request_ms)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, message, request_id/user_id when in a request, EXTRA_FIELDS, exc_info.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in ("request_id", "user_id", *EXTRA_FIELDS):
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        if record.stack_info:
+            data["stack_info"] = record.stack_info
+        return json.dumps(data, default=str)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread with the message already rendered.
+    - Unlike QueueHandler.prepare, the traceback stays in exc_text instead of being appended to the message
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.message = record.msg
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def configure_logging(level: int, log_format: str, *, sample_rate: float = 1.0, slow_request_ms: float = 0.0) -> None:
+    """
+    Route the root logger through a queue so formatting and stream writes happen in one background thread.
+    - Callers (event loop, threadpool) only render the message and enqueue it
+    - Replaces a previous configuration; the listener is flushed and stopped at exit
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _ContextQueueHandler(log_queue)
+    handler.addFilter(RequestLogFilter(sample_rate, slow_request_ms))
+
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if type(h) in (_ContextQueueHandler, logging.StreamHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+atexit.register(_stop_listener)
@@ -0,0 +1,52 @@
+import math
+
+from limits.errors import StorageError
+from limits.storage import Storage, storage_from_string
+
+from app.core import rate_limit_storage  # noqa: F401  registers the shm:// storage scheme
+from app.core.errors import PinStoreError
+from app.core.settings import Settings
+
+
+class LimitsPinStore:
+    """
+    Read-your-writes pins (app.db.routing.PinStore) on a limits storage, e.g. shm:// or redis://.
+    - A pin is a counter expiring after ttl_s seconds; a fresh counter gets a fresh expiry,
+      so pinning again restarts the window
+    - Storage errors are raised as PinStoreError
+    """
+
+    KEY_PREFIX = "read-your-writes:"
+
+    def __init__(self, storage: Storage):
+        self.storage = storage
+
+    def pin(self, user_key: str, ttl_s: float) -> None:
+        key = self.KEY_PREFIX + user_key
+        try:
+            self.storage.clear(key)
+            self.storage.incr(key, math.ceil(ttl_s))
+        except StorageError as exc:
+            raise PinStoreError() from exc
+
+    def is_pinned(self, user_key: str) -> bool:
+        try:
+            return self.storage.get(self.KEY_PREFIX + user_key) > 0
+        except StorageError as exc:
+            raise PinStoreError() from exc
+
+
+def read_your_writes_pin_store(settings: Settings) -> LimitsPinStore | None:
+    """
+    Shared store for read-your-writes pins, or None to keep them in each worker.
+    - Per-worker pins with replicas and several workers would let a user's next read land on a
+      worker that never saw their write, so that combination is refused at startup
+    """
+    if settings.DB_READ_YOUR_WRITES_STORAGE_URI:
+        return LimitsPinStore(storage_from_string(settings.DB_READ_YOUR_WRITES_STORAGE_URI, wrap_exceptions=True))
+    if settings.database_replica_urls_list() and settings.WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            "DATABASE_REPLICA_URLS with WEB_CONCURRENCY > 1 needs DB_READ_YOUR_WRITES_STORAGE_URI "
+            "(e.g. shm:///run/taskbeacon/read-your-writes) so every worker sees each user's writes"
+        )
+    return None
@@ -4,6 +4,7 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from starlette.requests import Request
 
+from app.core import rate_limit_storage  # noqa: F401  registers the shm:// storage scheme
 from app.core.settings import get_settings
 
 settings = get_settings()
@@ -24,4 +25,9 @@ limiter = Limiter(
     key_func=rate_limit_key_func,
     default_limits=[settings.RATE_LIMIT_DEFAULT] if settings.RATE_LIMIT_ENABLED else [],
     headers_enabled=True,
+    enabled=settings.RATE_LIMIT_ENABLED,   # also turns off the per-route auth limits
+    strategy="sliding-window-counter",     # no burst of 2x the limit across a window boundary
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    # If a shared storage fails, keep limiting with per-worker counters instead of erroring
+    in_memory_fallback_enabled=not settings.RATE_LIMIT_STORAGE_URI.startswith("memory://"),
 )
\ No newline at end of file
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from math import floor
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import fcntl
+except ImportError:     # Windows: only memory:// and networked storages are available
+    fcntl = None
+
+from limits.errors import ConfigurationError
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+# Slot: key hash (0 = never used), expires at (epoch seconds), window number, current count, previous count
+_SLOT = struct.Struct("<Qdqqq")
+_SLOT_KEY = struct.Struct("<Qd")    # leading (key hash, expires at) of a slot
+# Header: magic, slot count; the first byte also serves as the initialisation lock
+_HEADER = struct.Struct("<QQ")
+_HEADER_BYTES = 64
+_MAGIC = int.from_bytes(b"TBRATE01", "little")
+
+# A key lives in one group of slots, selected by its hash; each group has its own lock
+GROUP_SLOTS = 8
+DEFAULT_SLOTS = 65536
+
+
+def key_hash(key: str) -> int:
+    """
+    Stable across processes (unlike hash()); 0 is reserved for empty slots.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate limit counters shared by every worker process on the host, in a fixed-size mmap'd hash table.
+    - URI: shm:///path/to/file?slots=65536 (rounded up to whole groups of GROUP_SLOTS)
+    - Each group of slots is guarded by a byte-range lock on the file (fcntl) plus a lock for this process's threads
+    - Expired slots are reused in place; when a group is full, the slot closest to expiry is evicted (fails open)
+    - Sliding window counter: one slot holds the current and previous window, so a hit is one locked read-modify-write
+    """
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **options):
+        if fcntl is None:
+            raise ConfigurationError("shm:// rate limit storage needs fcntl (POSIX)")
+        parsed = urlparse(uri or "")
+        if not parsed.path:
+            raise ConfigurationError("shm:// rate limit storage needs a file path, e.g. shm:///run/taskbeacon/rate-limit")
+        slots = int(parse_qs(parsed.query).get("slots", [DEFAULT_SLOTS])[0])
+        self.path = parsed.path
+        self.groups = max(-(-slots // GROUP_SLOTS), 1)
+        self.slots = self.groups * GROUP_SLOTS
+        self.size = _HEADER_BYTES + self.slots * _SLOT.size
+        self.evictions = 0   # this process only
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 0)
+        try:
+            if os.fstat(self._fd).st_size != self.size:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.size)
+            self._mmap = mmap.mmap(self._fd, self.size)
+            if _HEADER.unpack_from(self._mmap, 0) != (_MAGIC, self.slots):
+                self._mmap[:] = bytes(self.size)
+                _HEADER.pack_into(self._mmap, 0, _MAGIC, self.slots)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 0)
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return OSError
+
+    def _locked(self, key: str, operation):
+        """
+        Run operation(slot offset or None, hash, group offset, now) holding the key's group lock.
+        """
+        hashed = key_hash(key)
+        group = _HEADER_BYTES + (hashed % self.groups) * GROUP_SLOTS * _SLOT.size
+        with self._thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, group)
+            try:
+                now = time.time()
+                return operation(self._find(group, hashed, now), hashed, group, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, group)
+
+    def _find(self, group: int, hashed: int, now: float) -> int | None:
+        for offset in range(group, group + GROUP_SLOTS * _SLOT.size, _SLOT.size):
+            slot_hash, expires_at = _SLOT_KEY.unpack_from(self._mmap, offset)
+            if slot_hash == hashed and expires_at > now:
+                return offset
+        return None
+
+    def _claim(self, group: int, now: float) -> int:
+        oldest, oldest_expiry = group, None
+        for offset in range(group, group + GROUP_SLOTS * _SLOT.size, _SLOT.size):
+            slot_hash, expires_at = _SLOT_KEY.unpack_from(self._mmap, offset)
+            if slot_hash == 0 or expires_at <= now:
+                return offset
+            if oldest_expiry is None or expires_at < oldest_expiry:
+                oldest, oldest_expiry = offset, expires_at
+        self.evictions += 1
+        return oldest
+
+    # Fixed window (limits' Storage interface)
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        def _incr(offset, hashed, group, now):
+            if offset is None:
+                offset = self._claim(group, now)
+                _SLOT.pack_into(self._mmap, offset, hashed, now + expiry, 0, amount, 0)
+                return amount
+            _, expires_at, window, current, previous = _SLOT.unpack_from(self._mmap, offset)
+            _SLOT.pack_into(self._mmap, offset, hashed, expires_at, window, current + amount, previous)
+            return current + amount
+
+        return self._locked(key, _incr)
+
+    def get(self, key: str) -> int:
+        def _get(offset, hashed, group, now):
+            return _SLOT.unpack_from(self._mmap, offset)[3] if offset is not None else 0
+
+        return self._locked(key, _get)
+
+    def get_expiry(self, key: str) -> float:
+        def _get_expiry(offset, hashed, group, now):
+            return _SLOT.unpack_from(self._mmap, offset)[1] if offset is not None else now
+
+        return self._locked(key, _get_expiry)
+
+    def clear(self, key: str) -> None:
+        def _clear(offset, hashed, group, now):
+            if offset is not None:
+                _SLOT.pack_into(self._mmap, offset, 0, 0.0, 0, 0, 0)
+
+        self._locked(key, _clear)
+
+    def check(self) -> bool:
+        return not self._mmap.closed
+
+    def reset(self) -> int | None:
+        with self._thread_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 0)
+            try:
+                self._mmap[_HEADER_BYTES:] = bytes(self.size - _HEADER_BYTES)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 0)
+        return None
+
+    # Sliding window counter
+
+    def _windows(self, offset: int | None, now: float, expiry: int) -> tuple[int, int, int]:
+        """
+        (window number, previous count, current count) as of now, rolling the stored windows forward.
+        """
+        window = int(now // expiry)
+        if offset is None:
+            return window, 0, 0
+        _, _, stored_window, current, previous = _SLOT.unpack_from(self._mmap, offset)
+        if stored_window == window:
+            return window, previous, current
+        if stored_window == window - 1:
+            return window, current, 0
+        return window, 0, 0
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+
+        def _acquire(offset, hashed, group, now):
+            window, previous, current = self._windows(offset, now, expiry)
+            previous_weight = 1 - (now / expiry) % 1
+            if floor(previous * previous_weight + current) + amount > limit:
+                return False
+            if offset is None:
+                offset = self._claim(group, now)
+            # Both windows are stale two windows from now
+            _SLOT.pack_into(self._mmap, offset, hashed, (window + 2) * expiry, window, current + amount, previous)
+            return True
+
+        return self._locked(key, _acquire)
+
+    def get_sliding_window(self, key: str, expiry: int) -> tuple[int, float, int, float]:
+        def _get(offset, hashed, group, now):
+            _, previous, current = self._windows(offset, now, expiry)
+            remaining = (1 - (now / expiry) % 1) * expiry
+            return previous, remaining if previous else 0.0, current, remaining + expiry
+
+        return self._locked(key, _get)
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
@@ -0,0 +1,263 @@
+import mmap
+import os
+from bisect import bisect_left
+from pathlib import Path
+
+# Upper bounds (seconds) of the request latency histogram buckets
+REQUEST_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+# Route slots per process; the last one counts every route beyond it under OTHER_ROUTE
+MAX_ROUTES = 256
+OTHER_ROUTE = "(other)"
+# Route label for requests no route matched (404s, rejected hosts)
+UNROUTED = "(none)"
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+# One file per worker process under METRICS_DIR
+FILE_PREFIX = "requests_"
+FILE_SUFFIX = ".db"
+
+# Layout, all 8-byte words: header (magic, in flight, slots used, unused), then MAX_ROUTES slots of
+# a utf-8 label ("METHOD route"), status class counts, bucket counts (+Inf last) and the sum (float)
+_MAGIC = int.from_bytes(b"TBREQM01", "little")
+_MAGIC_WORD, _IN_FLIGHT_WORD, _USED_WORD = 0, 1, 2
+_HEADER_BYTES = 4 * 8
+_LABEL_BYTES = 128
+_STATUS_WORDS = len(STATUS_CLASSES)
+_BUCKET_WORDS = len(REQUEST_BUCKETS_S) + 1
+_SUM_WORD = _STATUS_WORDS + _BUCKET_WORDS   # relative to a slot's first counter word
+_SLOT_BYTES = _LABEL_BYTES + (_SUM_WORD + 1) * 8
+_FILE_BYTES = _HEADER_BYTES + MAX_ROUTES * _SLOT_BYTES
+
+
+def _label_offset(slot: int) -> int:
+    return _HEADER_BYTES + slot * _SLOT_BYTES
+
+
+def _counters_word(slot: int) -> int:
+    return (_label_offset(slot) + _LABEL_BYTES) // 8
+
+
+def _read_labels(buffer, used: int) -> list[tuple[str, str]]:
+    labels = []
+    for slot in range(min(used, MAX_ROUTES)):
+        offset = _label_offset(slot)
+        label = bytes(buffer[offset:offset + _LABEL_BYTES]).rstrip(b"\0").decode(errors="ignore")
+        method, _, route = label.partition(" ")
+        labels.append((method, route))
+    return labels
+
+
+class RequestMetrics:
+    """
+    Request counters of one worker process in a preallocated buffer (a file under METRICS_DIR, or anonymous memory).
+    - Only the owning process writes, from the event loop, so increments need no locking
+    - Recording is a few word increments; a route's slot is allocated and labelled on its first request
+    - Other workers read the file to aggregate; a slot is published (slots used) after its label is written
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path
+        if path is None:
+            self._mmap = mmap.mmap(-1, _FILE_BYTES)
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                os.ftruncate(fd, _FILE_BYTES)
+                self._mmap = mmap.mmap(fd, _FILE_BYTES)
+            finally:
+                os.close(fd)
+        self._words = memoryview(self._mmap).cast("q")
+        self._floats = memoryview(self._mmap).cast("d")
+        # route -> method -> first counter word of the slot
+        self._slots: dict[str, dict[str, int]] = {}
+
+        if self._words[_MAGIC_WORD] == _MAGIC:
+            # Left by an earlier process with the same pid: keep its totals so sums stay monotonic
+            self._words[_IN_FLIGHT_WORD] = 0
+            for slot, (method, route) in enumerate(_read_labels(self._mmap, self._words[_USED_WORD])):
+                self._slots.setdefault(route, {})[method] = _counters_word(slot)
+        else:
+            self._mmap[:] = bytes(_FILE_BYTES)
+            self._words[_MAGIC_WORD] = _MAGIC
+
+    def request_started(self) -> None:
+        self._words[_IN_FLIGHT_WORD] += 1
+
+    def request_finished(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        words = self._words
+        words[_IN_FLIGHT_WORD] -= 1
+        methods = self._slots.get(route)
+        base = methods.get(method) if methods is not None else None
+        if base is None:
+            base = self._allocate(method, route)
+
+        words[base + min(max(status_code // 100, 1), 5) - 1] += 1
+        words[base + _STATUS_WORDS + bisect_left(REQUEST_BUCKETS_S, seconds)] += 1
+        self._floats[base + _SUM_WORD] += seconds
+
+    def _allocate(self, method: str, route: str) -> int:
+        used = self._words[_USED_WORD]
+        slot = used
+        if used >= MAX_ROUTES - 1:
+            overflow = self._slots.get(OTHER_ROUTE, {}).get("")
+            if overflow is not None:
+                self._slots.setdefault(route, {})[method] = overflow
+                return overflow
+            slot = MAX_ROUTES - 1
+            label = f" {OTHER_ROUTE}"
+        else:
+            label = f"{method} {route}"
+
+        offset = _label_offset(slot)
+        self._mmap[offset:offset + _LABEL_BYTES] = label.encode()[:_LABEL_BYTES].ljust(_LABEL_BYTES, b"\0")
+        self._words[_USED_WORD] = slot + 1
+
+        base = _counters_word(slot)
+        if slot == MAX_ROUTES - 1:
+            self._slots.setdefault(OTHER_ROUTE, {})[""] = base
+        self._slots.setdefault(route, {})[method] = base
+        return base
+
+    def snapshot(self) -> "MetricsSnapshot":
+        snapshot = MetricsSnapshot()
+        snapshot.add_buffer(bytes(self._mmap), alive=True)
+        return snapshot
+
+    def close(self) -> None:
+        self._words.release()
+        self._floats.release()
+        self._mmap.close()
+
+
+class RouteTotals:
+    __slots__ = ("statuses", "buckets", "sum")
+
+    def __init__(self):
+        self.statuses = [0] * _STATUS_WORDS
+        self.buckets = [0] * _BUCKET_WORDS
+        self.sum = 0.0
+
+
+class MetricsSnapshot:
+    """
+    Totals over one or more worker buffers.
+    - Counters of exited workers are kept (so totals never go down); their in-flight gauge is not
+    """
+
+    def __init__(self):
+        self.processes = 0
+        self.in_flight = 0
+        self.routes: dict[tuple[str, str], RouteTotals] = {}
+
+    def add_buffer(self, data: bytes, *, alive: bool) -> None:
+        if len(data) < _FILE_BYTES:
+            return
+        view = memoryview(data)[:_FILE_BYTES]
+        words = view.cast("q")
+        floats = view.cast("d")
+        if words[_MAGIC_WORD] != _MAGIC:
+            return
+        if alive:
+            self.processes += 1
+            self.in_flight += words[_IN_FLIGHT_WORD]
+        for slot, key in enumerate(_read_labels(data, words[_USED_WORD])):
+            base = _counters_word(slot)
+            totals = self.routes.get(key)
+            if totals is None:
+                totals = self.routes[key] = RouteTotals()
+            for i in range(_STATUS_WORDS):
+                totals.statuses[i] += words[base + i]
+            for i in range(_BUCKET_WORDS):
+                totals.buckets[i] += words[base + _STATUS_WORDS + i]
+            totals.sum += floats[base + _SUM_WORD]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect(metrics_dir: str) -> MetricsSnapshot:
+    """
+    Sum the files of every worker that wrote to metrics_dir, including exited ones.
+    """
+    snapshot = MetricsSnapshot()
+    for path in sorted(Path(metrics_dir).glob(f"{FILE_PREFIX}*{FILE_SUFFIX}")):
+        try:
+            pid = int(path.name[len(FILE_PREFIX):-len(FILE_SUFFIX)])
+            data = path.read_bytes()
+        except (ValueError, OSError):
+            continue
+        snapshot.add_buffer(data, alive=_pid_alive(pid))
+    return snapshot
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: MetricsSnapshot) -> str:
+    """
+    Prometheus text exposition (format 0.0.4), buckets cumulative.
+    """
+    lines = [
+        "# HELP http_requests_total Requests by method, route template and status class.",
+        "# TYPE http_requests_total counter",
+    ]
+    routes = sorted(snapshot.routes.items(), key=lambda item: (item[0][1], item[0][0]))
+    for (method, route), totals in routes:
+        labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+        for status_class, count in zip(STATUS_CLASSES, totals.statuses):
+            if count:
+                lines.append(f'http_requests_total{{{labels},status="{status_class}"}} {count}')
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency up to the last response byte.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), totals in routes:
+        labels = f'method="{_escape(method)}",route="{_escape(route)}"'
+        cumulative = 0
+        for bound, count in zip((*map(str, REQUEST_BUCKETS_S), "+Inf"), totals.buckets):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {totals.sum!r}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+    lines += [
+        "# HELP http_requests_in_flight Requests being handled by live workers.",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {snapshot.in_flight}",
+        "# HELP http_metrics_worker_processes Live worker processes reporting metrics.",
+        "# TYPE http_metrics_worker_processes gauge",
+        f"http_metrics_worker_processes {snapshot.processes}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# Counters of this worker: anonymous memory until open_worker_metrics() moves them to METRICS_DIR
+worker_metrics = RequestMetrics()
+
+
+def open_worker_metrics(metrics_dir: str) -> None:
+    """
+    Back this worker's counters by METRICS_DIR/requests_<pid>.db (called per worker, after any fork).
+    """
+    global worker_metrics
+    if not metrics_dir:
+        return
+    Path(metrics_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(metrics_dir) / f"{FILE_PREFIX}{os.getpid()}{FILE_SUFFIX}"
+    if worker_metrics.path != path:
+        worker_metrics = RequestMetrics(path)
+
+
+def metrics_snapshot(metrics_dir: str) -> MetricsSnapshot:
+    return collect(metrics_dir) if metrics_dir else worker_metrics.snapshot()
@@ -19,17 +19,57 @@ class Settings(BaseSettings):
     # Environment
     ENV: Literal["DEV", "PROD"] = "DEV"
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    # Fraction of successful requests whose INFO lines are kept; 4xx/5xx, slow requests and warnings always are
+    LOG_SAMPLE_RATE: float = Field(default=1.0, ge=0.0, le=1.0)
+    LOG_SLOW_REQUEST_MS: int = Field(default=1000)   # 0: only the status code bypasses sampling
+    # Directory shared by the workers of one instance for /api/metrics; empty reports only the answering worker.
+    # Files of exited workers are still counted, so empty it when the instance is redeployed
+    METRICS_DIR: str = Field(default="")
+    # Worker processes per instance (uvicorn's default for --workers)
+    WEB_CONCURRENCY: int = Field(default=1)
 
     # Database
     DATABASE_URL: str
     DB_SESSION_TIMEOUT_MS: int = Field(default=5000)
     DB_CONNECT_TIMEOUT_S: int = 2
     DB_POOL_TIMEOUT_S: int = 2
+    # Pool sizing is per engine and per worker process: max connections = workers * (size + overflow)
+    DB_POOL_SIZE: int = Field(default=5)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_RECYCLE_S: int = Field(default=1800)   # -1 never recycles
+    # True: test each connection on checkout (one extra round trip). False: rely on
+    # recycle and on invalidating the pool when a disconnect error is seen
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    # Read replicas: comma-separated URLs, empty means every query goes to DATABASE_URL
+    DATABASE_REPLICA_URLS: str = Field(default="")
+    DB_READ_YOUR_WRITES_S: float = Field(default=5.0)
+    # Where read-your-writes pins live: empty keeps them per worker, which replicas refuse when WEB_CONCURRENCY > 1;
+    # shm:///path shares them between the workers on a host, redis:// between hosts
+    DB_READ_YOUR_WRITES_STORAGE_URI: str = Field(default="")
+    DB_REPLICA_RETRY_S: float = Field(default=30.0)
+    # Log statements slower than this (logger "sql.slow"); 0 disables
+    DB_SLOW_QUERY_MS: int = Field(default=200)
 
     # JWT
     JWT_SECRET: str
     JWT_ALGORITHM: str = Field(default="HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60)
+    # Rotating refresh tokens renew access tokens without a password (and without bcrypt)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=30)
+    # Recently verified tokens kept per worker, each only until its exp (0 disables)
+    JWT_VERIFIED_CACHE_SIZE: int = Field(default=4096)
+    # bcrypt runs on its own threads (0 = one per CPU core); logins/registers beyond
+    # workers + queue are rejected with 503 instead of queueing
+    PASSWORD_HASH_WORKERS: int = Field(default=0)
+    PASSWORD_HASH_MAX_QUEUE: int = Field(default=16)
+    # bcrypt work factor; 0 calibrates at startup to BCRYPT_TARGET_HASH_MS on this machine.
+    # Stored hashes at another cost are replaced on the user's next successful login
+    BCRYPT_ROUNDS: int = Field(default=0)
+    BCRYPT_TARGET_HASH_MS: int = Field(default=250)
+    # Resolved users cached per worker; invalidated across workers via LISTEN/NOTIFY (0 disables)
+    USER_CACHE_SIZE: int = Field(default=10_000)
+    USER_CACHE_TTL_S: float = Field(default=60.0)
 
     # Web
     CORS_ORIGINS: List[str] = Field(default_factory=lambda: ["http://localhost:3000"])
@@ -40,7 +80,39 @@ class Settings(BaseSettings):
     RATE_LIMIT_DEFAULT: str = Field(default="120/minute")
     RATE_LIMIT_AUTH_LOGIN: str = Field(default="10/minute")
     RATE_LIMIT_AUTH_REGISTER: str = Field(default="5/minute")
+    RATE_LIMIT_AUTH_REFRESH: str = Field(default="30/minute")
     RATE_LIMIT_AUTH_ME: str = Field(default="60/minute")
+    # memory:// counts per worker (N workers allow N x the limit); shm:///path shares counters between the
+    # workers on a host; redis://host:6379/0?socket_timeout=0.1&socket_connect_timeout=0.1 between hosts (checks
+    # block the event loop for a round trip, so keep the timeouts short). A shared storage that fails falls back to memory://
+    RATE_LIMIT_STORAGE_URI: str = Field(default="memory://")
+
+    # Response compression (zstd/br when their package is installed, else gzip). Streamed responses
+    # are only compressed when the endpoint opts in; responses that already have a Content-Encoding never are
+    COMPRESSION_ENABLED: bool = Field(default=True)
+    COMPRESSION_MIN_SIZE: int = Field(default=1024)
+    COMPRESSION_CONTENT_TYPES: str = Field(default="application/json,application/x-ndjson,text/csv,text/plain,text/html")
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, ge=1, le=9)
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=4, ge=0, le=11)
+    COMPRESSION_ZSTD_LEVEL: int = Field(default=3, ge=1, le=22)
+
+    # Internal (operational) endpoints: open in DEV; in PROD only served when this token is set
+    INTERNAL_API_TOKEN: str = Field(default="")
+
+    # Pagination
+    TASKS_PAGE_SIZE_DEFAULT: int = Field(default=100)
+    TASKS_PAGE_SIZE_MAX: int = Field(default=500)
+
+    # Batch operations
+    TASKS_BATCH_MAX_OPERATIONS: int = Field(default=500)
+
+    # Export
+    TASKS_EXPORT_BATCH_SIZE: int = Field(default=1000)
+
+    # Import
+    TASKS_IMPORT_CHUNK_SIZE: int = Field(default=1000)
+    TASKS_IMPORT_MAX_ROWS: int = Field(default=100_000)
+    TASKS_IMPORT_MAX_ERRORS: int = Field(default=1000)
 
     def get_log_level(self) -> int:
         return getattr(logging, self.LOG_LEVEL.upper(), logging.INFO)
@@ -48,6 +120,12 @@ class Settings(BaseSettings):
     def allowed_hosts_list(self) -> list[str]:
         return [h.strip() for h in self.ALLOWED_HOSTS.split(",") if h.strip()]
 
+    def database_replica_urls_list(self) -> list[str]:
+        return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+
+    def compression_content_types_list(self) -> list[str]:
+        return [t.strip().lower() for t in self.COMPRESSION_CONTENT_TYPES.split(",") if t.strip()]
+
 
 _settings: Settings | None = None
 
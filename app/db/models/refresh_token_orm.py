@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import String, DateTime, ForeignKey, func, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RefreshTokenORM(Base):
+    """
+    One issued refresh token. Only the SHA-256 of the token is stored.
+    - Every rotation adds a row to the same family; a family is one login session
+    - used_at marks a token that was exchanged; presenting it again revokes the family
+    """
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    family_id: Mapped[str] = mapped_column(UUID(as_uuid=True), nullable=False)
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
+    expires_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# token_hash is unique (its own index); family revocation and per-user cleanup look up by these
+Index("ix_refresh_tokens_family_id", RefreshTokenORM.family_id)
+Index("ix_refresh_tokens_user_id", RefreshTokenORM.user_id)
@@ -1,6 +1,7 @@
+from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import String, DateTime, ForeignKey, func, Index
+from sqlalchemy import String, DateTime, ForeignKey, func, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,10 +24,38 @@ class TaskORM(Base):
     status: Mapped[str] = mapped_column(String(50), nullable=False, server_default="pending")
     due_date: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Python-side default keeps microsecond precision on every backend, so keyset
+    # cursors round-trip exactly; server_default still covers raw SQL inserts.
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+    )
     updated_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), onupdate=func.now())
 
     owner = relationship("UserORM", back_populates="tasks")
 
 
-Index("ix_tasks_owner_id", TaskORM.owner_id)
+# Owner-scoped indexes for GET /api/tasks (list_tasks_query documents which
+# filter/sort combinations they serve in sort order)
+Index("ix_tasks_owner_created_id", TaskORM.owner_id, TaskORM.created_at, TaskORM.id)
+Index("ix_tasks_owner_status_created_id", TaskORM.owner_id, TaskORM.status, TaskORM.created_at, TaskORM.id)
+Index("ix_tasks_owner_updated_id", TaskORM.owner_id, TaskORM.updated_at, TaskORM.id)
+Index("ix_tasks_owner_due_id", TaskORM.owner_id, TaskORM.due_date, TaskORM.id)
+Index("ix_tasks_owner_title_id", TaskORM.owner_id, TaskORM.title, TaskORM.id)
+Index(
+    "ix_tasks_owner_pending_due",
+    TaskORM.owner_id,
+    TaskORM.due_date,
+    TaskORM.id,
+    postgresql_where=text("status = 'pending'"),
+    sqlite_where=text("status = 'pending'"),
+)
+
+# Full-text search is PostgreSQL-only (migration 7c1f0b3e9a24): a generated tsvector
+# column over title/description plus owner-scoped GIN indexes. These objects are
+# deliberately left unmapped, so task rows never load the vector and SQLite (tests)
+# can still create the schema; app.storage.db_tasks refers to the column by name.
+TASKS_SEARCH_CONFIG = "english"
+TASKS_SEARCH_VECTOR_COLUMN = "search_vector"
+UNMAPPED_SEARCH_OBJECTS = frozenset({TASKS_SEARCH_VECTOR_COLUMN, "ix_tasks_owner_search", "ix_tasks_owner_title_trgm"})
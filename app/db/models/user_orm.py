@@ -1,6 +1,6 @@
 from uuid import uuid4
 
-from sqlalchemy import String, DateTime, func, Index
+from sqlalchemy import BigInteger, String, DateTime, func, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,11 @@ class UserORM(Base):
     email: Mapped[str] = mapped_column(String(320), nullable=False, unique=True)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Bumped on every write to this user's tasks; backs ETags on task reads
+    tasks_version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    # Task counts by status, kept current by the same statement that bumps tasks_version
+    pending_tasks: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    completed_tasks: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
 
     tasks = relationship("TaskORM", back_populates="owner", cascade="all, delete-orphan")
 
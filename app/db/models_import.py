@@ -1,3 +1,4 @@
 # Imports all ORM models so they register on Base.metadata
 from app.db.models.user_orm import UserORM
 from app.db.models.task_orm import TaskORM
+from app.db.models.refresh_token_orm import RefreshTokenORM
@@ -0,0 +1,112 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.histogram import Histogram
+
+# Upper bounds (seconds) of the checkout wait histogram buckets; DB_POOL_TIMEOUT_S defaults to 2
+WAIT_BUCKETS_S = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+
+
+class PoolMetrics:
+    """
+    Counters and a checkout wait histogram for one connection pool (per process).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.wait = Histogram(WAIT_BUCKETS_S)
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        """
+        Current pool state plus cumulative counters.
+        - Histogram buckets are cumulative (Prometheus "le" style)
+        """
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "soft_invalidations": self.soft_invalidations,
+            "checkout_wait_seconds": self.wait.snapshot(),
+        }
+
+
+class _TimedCheckoutMixin:
+    """
+    Time every checkout: waiting for a free slot, opening a new connection if needed and pre-ping.
+    There is no pool event before a checkout starts, so this is done by wrapping connect().
+    """
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Instrumented pools of this process, by name
+POOL_METRICS: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def instrument_pool(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach metrics to an engine created with a Timed*QueuePool poolclass.
+    - Pool events (kept across engine.dispose()) count checkouts, new connections and invalidations
+    """
+    metrics = PoolMetrics(name)
+    engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.soft_invalidations += 1
+
+    POOL_METRICS[name] = (engine, metrics)
+    return metrics
+
+
+def pool_snapshots() -> dict[str, dict]:
+    return {name: metrics.snapshot(engine.pool) for name, (engine, metrics) in POOL_METRICS.items()}
@@ -0,0 +1,136 @@
+import logging
+import re
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.histogram import Histogram
+
+logger = logging.getLogger("sql.slow")
+
+# Upper bounds (seconds) of the per-statement latency histogram buckets
+QUERY_BUCKETS_S = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Bound on distinct (route, statement) histograms per process; later ones are counted under OTHER_STATEMENT
+MAX_QUERY_HISTOGRAMS = 500
+OTHER_STATEMENT = "(other)"
+# Route label for statements run outside a routed request (startup, scripts, unmatched paths)
+UNROUTED = "(none)"
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%\(\w+\)s|\$\d+|\?")
+_PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_REPEATED_ROWS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Stack of start times per connection (conn.info), so nested or failed executes stay balanced
+_START_KEY = "query_start_s"
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Normalise a SQL statement so executions with different values share one histogram.
+    - Literals and bind placeholders become ?, IN lists and multi-row VALUES collapse to one entry
+    - Compiled statements are cached by SQLAlchemy, so the same strings repeat and this is cached too
+    """
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _LITERALS.sub("?", text)
+    text = _PLACEHOLDER_LISTS.sub("?, ...", text)
+    return _REPEATED_ROWS.sub(r"\1, ...", text)
+
+
+def route_label(scope: dict | None) -> str:
+    """
+    "METHOD /path/{template}" of the matched route; path parameters never make new labels.
+    """
+    route = scope.get("route") if scope else None
+    path = getattr(route, "path", None)
+    return f"{scope['method']} {path}" if path else UNROUTED
+
+
+class RequestQueryStats:
+    """
+    Statements run on behalf of one HTTP request.
+    - The route is read from the ASGI scope when a statement runs, i.e. after routing
+    """
+    __slots__ = ("scope", "request_id", "count", "total_s")
+
+    def __init__(self, scope: dict | None = None, request_id: str | None = None):
+        self.scope = scope
+        self.request_id = request_id
+        self.count = 0
+        self.total_s = 0.0
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope)
+
+
+# Set per request by RequestLoggingMiddleware; None outside a request
+current_request_queries: ContextVar[RequestQueryStats | None] = ContextVar("current_request_queries", default=None)
+
+# Statement latency histograms of this process, by (route, fingerprint)
+QUERY_METRICS: dict[tuple[str, str], Histogram] = {}
+
+
+def record_query(statement: str, seconds: float, slow_query_s: float) -> None:
+    stats = current_request_queries.get()
+    route = UNROUTED
+    if stats is not None:
+        stats.count += 1
+        stats.total_s += seconds
+        route = stats.route
+
+    key = (route, fingerprint(statement))
+    histogram = QUERY_METRICS.get(key)
+    if histogram is None:
+        if len(QUERY_METRICS) >= MAX_QUERY_HISTOGRAMS:
+            key = (route, OTHER_STATEMENT)
+        histogram = QUERY_METRICS.setdefault(key, Histogram(QUERY_BUCKETS_S))
+    histogram.observe(seconds)
+
+    if slow_query_s and seconds >= slow_query_s:
+        logger.warning(
+            "slow query (%.2fms) route=%s request_id=%s: %s",
+            seconds * 1000.0,
+            route,
+            stats.request_id if stats is not None else None,
+            key[1],
+        )
+
+
+def instrument_queries(engine: Engine, *, slow_query_s: float) -> None:
+    """
+    Time every statement the engine sends to the driver.
+    - Failed statements are timed too (handle_error), so timeouts show up in the histograms
+    - slow_query_s <= 0 disables the slow-query log
+    - Statements run on the raw driver connection (COPY) are not seen
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        record_query(statement, time.perf_counter() - conn.info[_START_KEY].pop(), slow_query_s)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        starts = context.connection.info.get(_START_KEY) if context.connection is not None else None
+        if starts and context.statement is not None:
+            record_query(context.statement, time.perf_counter() - starts.pop(), slow_query_s)
+
+
+def query_snapshots() -> list[dict]:
+    """
+    Statement histograms, most total time first.
+    """
+    rows = [
+        {"route": route, "statement": statement, "seconds": histogram.snapshot()}
+        for (route, statement), histogram in list(QUERY_METRICS.items())
+    ]
+    return sorted(rows, key=lambda row: row["seconds"]["sum"], reverse=True)
@@ -0,0 +1,133 @@
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Protocol
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.errors import PinStoreError
+
+logger = logging.getLogger(__name__)
+
+
+class PinStore(Protocol):
+    """
+    Read-your-writes pins shared between workers.
+    - pin: pin the user for ttl_s seconds, restarting the window if already pinned
+    - is_pinned: whether the user is pinned now
+    - Both raise PinStoreError when the store is unavailable
+    """
+
+    def pin(self, user_key: str, ttl_s: float) -> None: ...
+
+    def is_pinned(self, user_key: str) -> bool: ...
+
+
+class ReadRouter:
+    """
+    Decide which database serves a read-only request.
+    - Round-robin over healthy replicas, falling back to the primary
+    - Users who wrote within the last sticky_s seconds read from the primary (read-your-writes)
+    - A replica that fails to connect is skipped for retry_s seconds, then tried again
+    - Pins are kept in this process and, with pin_store (wired in by the app, see app.core.pin_store),
+      shared with every worker using it, so the next read is pinned whichever worker serves it
+    - If pin_store fails, reads go to the primary (stale reads are the failure to avoid)
+    Replica health is tracked per process.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: Sequence[async_sessionmaker] = (),
+        *,
+        sticky_s: float,
+        retry_s: float,
+        pin_store: PinStore | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.sticky_s = sticky_s
+        self.retry_s = retry_s
+        self.pin_store = pin_store
+        self._clock = clock
+        self._turn = itertools.count()
+        self._down_until: dict[int, float] = {}
+        # user key -> pinned until; every pin has the same lifetime, so insertion order is expiry order
+        self._pinned: OrderedDict[str, float] = OrderedDict()
+
+    def pin(self, user_key: str | None) -> None:
+        """
+        Send this user's reads to the primary for the next sticky_s seconds.
+        """
+        if user_key is None or not self.replicas:
+            return
+        now = self._clock()
+        self._pinned[user_key] = now + self.sticky_s
+        self._pinned.move_to_end(user_key)
+        while self._pinned:
+            oldest, until = next(iter(self._pinned.items()))
+            if until > now:
+                break
+            del self._pinned[oldest]
+        if self.pin_store is not None:
+            try:
+                self.pin_store.pin(user_key, self.sticky_s)
+            except PinStoreError:
+                logger.warning("Read-your-writes storage unavailable, pin kept in this worker only", exc_info=True)
+
+    def is_pinned(self, user_key: str | None) -> bool:
+        if user_key is None:
+            return False
+        until = self._pinned.get(user_key)
+        if until is not None and until > self._clock():
+            return True
+        if self.pin_store is None:
+            return False
+        try:
+            return self.pin_store.is_pinned(user_key)
+        except PinStoreError:
+            logger.warning("Read-your-writes storage unavailable, reading from the primary", exc_info=True)
+            return True
+
+    def read_candidates(self, user_key: str | None) -> list[async_sessionmaker]:
+        """
+        Session factories to try for a read, in order; the primary is always last.
+        """
+        if not self.replicas or self.is_pinned(user_key):
+            return [self.primary]
+        now = self._clock()
+        start = next(self._turn)
+        count = len(self.replicas)
+        healthy = [
+            self.replicas[index]
+            for index in ((start + offset) % count for offset in range(count))
+            if self._down_until.get(index, 0.0) <= now
+        ]
+        return healthy + [self.primary]
+
+    def mark_down(self, replica: async_sessionmaker) -> None:
+        self._down_until[self.replicas.index(replica)] = self._clock() + self.retry_s
+
+    async def open_read_session(self, user_key: str | None) -> AsyncSession:
+        """
+        Open a session on the first candidate that accepts a connection.
+        - Replicas are checked eagerly (pool_pre_ping), so an unhealthy one costs a retry, not the request
+        - Primary errors are not caught; they surface as they would without replicas
+        """
+        for factory in self.read_candidates(user_key):
+            db = factory()
+            if factory is self.primary:
+                return db
+            try:
+                await db.connection()
+            except (DBAPIError, OSError):
+                await db.close()
+                self.mark_down(factory)
+                logger.warning("Read replica unavailable, skipping for %.0fs", self.retry_s, exc_info=True)
+                continue
+            return db
+        raise AssertionError("primary is always a read candidate")
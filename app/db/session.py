@@ -1,37 +1,126 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator
+from fastapi import Request
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.core.settings import get_settings
+from app.db.pool_metrics import TimedAsyncAdaptedQueuePool, instrument_pool
+from app.db.query_metrics import instrument_queries
+from app.db.routing import ReadRouter
 
 settings = get_settings()
 DATABASE_URL = settings.DATABASE_URL
 DB_SESSION_TIMEOUT_MS = settings.DB_SESSION_TIMEOUT_MS
 args_string = "-c statement_timeout=" + str(DB_SESSION_TIMEOUT_MS)
 
+POOL_OPTIONS = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_recycle": settings.DB_POOL_RECYCLE_S,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,  # helps avoid stale connections
+    "pool_timeout": settings.DB_POOL_TIMEOUT_S,
+}
+SLOW_QUERY_S = settings.DB_SLOW_QUERY_MS / 1000.0
+
+# Sync engine for maintenance scripts only (the app serves every request on the async
+# engine below): one session per run, so no pool is kept open in app workers
 engine = create_engine(
     DATABASE_URL,
     connect_args={
         "options": args_string,
         "connect_timeout": settings.DB_CONNECT_TIMEOUT_S
     },
-    pool_pre_ping=True,  # helps avoid stale connections
-    pool_timeout=settings.DB_POOL_TIMEOUT_S
+    poolclass=NullPool,
 )
+instrument_queries(engine, slow_query_s=SLOW_QUERY_S)
 
 SessionLocal = sessionmaker(
     bind=engine,
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False, # rows returned by INSERT/UPDATE ... RETURNING stay usable after commit
+)
+
+
+# Async stack (postgresql+psycopg selects psycopg's async driver under create_async_engine).
+# Endpoints on this path do not hold a threadpool thread while waiting on the
+# database, so concurrency is bounded by the connection pool instead.
+def _create_async_engine(url: str, pool_name: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        url,
+        connect_args={
+            "options": args_string,
+            "connect_timeout": settings.DB_CONNECT_TIMEOUT_S
+        },
+        poolclass=TimedAsyncAdaptedQueuePool,
+        **POOL_OPTIONS
+    )
+    instrument_pool(async_engine.sync_engine, pool_name)
+    instrument_queries(async_engine.sync_engine, slow_query_s=SLOW_QUERY_S)
+    return async_engine
+
+async_engine = _create_async_engine(DATABASE_URL, "primary")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
 )
 
-def get_db() -> Generator[Session, None, None]:
+replica_async_engines = [
+    _create_async_engine(url, f"replica_{index}") for index, url in enumerate(settings.database_replica_urls_list())
+]
+
+
+db_router = ReadRouter(
+    AsyncSessionLocal,
+    [async_sessionmaker(**{**AsyncSessionLocal.kw, "bind": replica}) for replica in replica_async_engines],
+    sticky_s=settings.DB_READ_YOUR_WRITES_S,
+    retry_s=settings.DB_REPLICA_RETRY_S,
+)   # pin_store is wired in by app.main (shared read-your-writes pins)
+
+# Handlers for these methods must not write: their sessions may be on a replica
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _request_user_key(request: Request) -> str | None:
+    """
+    Token subject of the request (set by AuthContextMiddleware), used only to pick a database.
+    """
+    return getattr(request.state, "user_id", None)
+
+
+def pin_to_primary(user_key: str) -> None:
+    """
+    Pin a user to the primary for writes made before the request carried their token (registration).
+    """
+    db_router.pin(user_key)
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency.
+    Creates an async DB session per request and always closes it.
+    - GET/HEAD requests read from a replica when DATABASE_REPLICA_URLS is set (see ReadRouter)
+    - Any other request uses the primary and pins its user there for DB_READ_YOUR_WRITES_S
+    """
+    router = db_router
+    user_key = _request_user_key(request) if router.replicas else None
+    if request.method in READ_METHODS:
+        db = await router.open_read_session(user_key)
+    else:
+        router.pin(user_key)
+        db = router.primary()
+    async with db:
+        yield db
+
+
+async def get_primary_db() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency.
-    Creates a DB session per request and always closes it.
+    Creates an async session on the primary whatever the request method (readiness checks).
     """
-    db: Session = SessionLocal()
-    try:
+    async with db_router.primary() as db:
         yield db
-    finally:
-        db.close()
@@ -7,16 +7,16 @@ import { Routes, Route } from 'react-router';
 import { useState, useEffect } from 'react';
 import type { User } from './lib/types/index';
 import { UserContext, TitleContext } from './context.tsx';
+import { hasSession } from './lib/api/session';
 
 function App() {
   const [title, setTitle] = useState<string>("Task Beacon");
   const [user, setUser] = useState<User | null>(() => {
     const id = localStorage.getItem("id");
     const email = localStorage.getItem("email");
-    const token = localStorage.getItem("token");
 
-    if (id && email && token) {
-      return { id, email, token }
+    if (id && email && hasSession()) {
+      return { id, email }
     }
 
     return null;
@@ -1,5 +1,6 @@
 import type { User } from '../types/index';
 import { CONFIG } from '../../config';
+import { saveTokens } from './session';
 
 export async function register(email: string, password: string): Promise<boolean> {
     try {
@@ -30,7 +31,8 @@ export async function login(email: string, password: string): Promise<User | nul
         if (!me) {
             return null;
         }
-        return { id: me.id, email: me.email, token };
+        saveTokens(token, data.refresh_token);
+        return { id: me.id, email: me.email };
     } catch {
         return null;
     }
@@ -0,0 +1,88 @@
+import { CONFIG } from '../../config';
+
+const TOKEN_KEY = "token";
+const REFRESH_TOKEN_KEY = "refresh_token";
+
+// Refresh tokens are single use, so requests that get a 401 together share one refresh
+let refreshing: Promise<boolean> | null = null;
+
+export function saveTokens(token: string, refreshToken: string): void {
+    localStorage.setItem(TOKEN_KEY, token);
+    localStorage.setItem(REFRESH_TOKEN_KEY, refreshToken);
+}
+
+export function hasSession(): boolean {
+    return localStorage.getItem(TOKEN_KEY) !== null && localStorage.getItem(REFRESH_TOKEN_KEY) !== null;
+}
+
+export function clearSession(): void {
+    localStorage.removeItem("id");
+    localStorage.removeItem("email");
+    localStorage.removeItem(TOKEN_KEY);
+    localStorage.removeItem(REFRESH_TOKEN_KEY);
+}
+
+async function refreshTokens(): Promise<boolean> {
+    const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY);
+    if (!refreshToken) {
+        return false;
+    }
+    const res = await fetch(`${CONFIG.API_BASE_URL}/auth/refresh`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+    });
+    if (!res.ok) {
+        return false;
+    }
+    const data = await res.json();
+    saveTokens(data.access_token, data.refresh_token);
+    return true;
+}
+
+function refreshAccessToken(): Promise<boolean> {
+    if (!refreshing) {
+        refreshing = refreshTokens().finally(() => {
+            refreshing = null;
+        });
+    }
+    return refreshing;
+}
+
+export async function authFetch(
+    path: string,
+    init: { method: string; headers?: Record<string, string>; body?: string }
+): Promise<Response> {
+    const send = () => fetch(`${CONFIG.API_BASE_URL}${path}`, {
+        ...init,
+        headers: { ...init.headers, "Authorization": `Bearer ${localStorage.getItem(TOKEN_KEY)}` },
+    });
+    const res = await send();
+    if (res.status !== 401) {
+        return res;
+    }
+    if (!(await refreshAccessToken())) {
+        // Refresh token expired or revoked: back to sign in
+        clearSession();
+        window.location.assign("/");
+        return res;
+    }
+    return send();
+}
+
+export async function logout(): Promise<void> {
+    const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY);
+    clearSession();
+    if (!refreshToken) {
+        return;
+    }
+    try {
+        await fetch(`${CONFIG.API_BASE_URL}/auth/logout`, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ refresh_token: refreshToken }),
+        });
+    } catch {
+        // Signed out locally either way
+    }
+}
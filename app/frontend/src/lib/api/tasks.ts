@@ -1,28 +1,35 @@
 import type { Task, TaskStatus } from '../types/index';
-import { CONFIG } from '../../config';
+import { authFetch } from './session';
 
-export async function fetchTasks(token: string): Promise<Array<Task>> {
+// Server caps pages at TASKS_PAGE_SIZE_MAX (500)
+const TASKS_PAGE_SIZE = 500;
+
+export async function fetchTasks(): Promise<Array<Task>> {
     try {
-        const result = await fetch(`${CONFIG.API_BASE_URL}/tasks`, {
-            method: "GET",
-            headers: { "Authorization": `Bearer ${token}` },
-        });
-        if (!result.ok) {
-            return [];
-        }
-        const tasks: Array<Task> = await result.json();
+        const tasks: Array<Task> = [];
+        let cursor: string | null = null;
+        do {
+            let query = `?limit=${TASKS_PAGE_SIZE}`;
+            if (cursor) {
+                query += `&cursor=${encodeURIComponent(cursor)}`;
+            }
+            const result = await authFetch(`/tasks${query}`, { method: "GET" });
+            if (!result.ok) {
+                return [];
+            }
+            const page: Array<Task> = await result.json();
+            tasks.push(...page);
+            cursor = result.headers.get("X-Next-Cursor");
+        } while (cursor);
         return tasks;
     } catch {
         return [];
     }
 }
 
-export async function fetchTaskById(token: string, task_id: string): Promise<Task | null> {
+export async function fetchTaskById(task_id: string): Promise<Task | null> {
     try {
-        const res = await fetch(`${CONFIG.API_BASE_URL}/tasks/${task_id}`, {
-            method: "GET",
-            headers: { "Authorization": `Bearer ${token}` },
-        });
+        const res = await authFetch(`/tasks/${task_id}`, { method: "GET" });
         if (!res.ok) {
             return null;
         }
@@ -33,14 +40,11 @@ export async function fetchTaskById(token: string, task_id: string): Promise<Tas
     }
 }
 
-export async function createTask(token: string, title: string, description: string | null, due_date: string | null): Promise<Task | null> {
+export async function createTask(title: string, description: string | null, due_date: string | null): Promise<Task | null> {
     try {
-        const res = await fetch(`${CONFIG.API_BASE_URL}/tasks`, {
+        const res = await authFetch("/tasks", {
             method: "POST",
-            headers: {
-                "Content-Type": "application/json",
-                "Authorization": `Bearer ${token}`
-            },
+            headers: { "Content-Type": "application/json" },
             body: JSON.stringify({ title, description, due_date }),
         });
         if (!res.ok) {
@@ -54,17 +58,13 @@ export async function createTask(token: string, title: string, description: stri
 }
 
 export async function updateTask(
-    token: string,
     task_id: string,
     changes: { title?: string; description?: string | null; status?: TaskStatus; due_date?: string | null }
 ): Promise<Task | null> {
     try {
-        const res = await fetch(`${CONFIG.API_BASE_URL}/tasks/${task_id}`, {
+        const res = await authFetch(`/tasks/${task_id}`, {
             method: "PATCH",
-            headers: {
-                "Content-Type": "application/json",
-                "Authorization": `Bearer ${token}`
-            },
+            headers: { "Content-Type": "application/json" },
             body: JSON.stringify(changes),
         });
         if (!res.ok) {
@@ -77,12 +77,9 @@ export async function updateTask(
     }
 }
 
-export async function deleteTask(token: string, task_id: string): Promise<boolean> {
+export async function deleteTask(task_id: string): Promise<boolean> {
     try {
-        const res = await fetch(`${CONFIG.API_BASE_URL}/tasks/${task_id}`, {
-            method: "DELETE",
-            headers: { "Authorization": `Bearer ${token}` },
-        });
+        const res = await authFetch(`/tasks/${task_id}`, { method: "DELETE" });
         return res.ok;
     } catch {
         return false;
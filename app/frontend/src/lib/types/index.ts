@@ -1,7 +1,6 @@
 export interface User {
     id: string;
     email: string;
-    token: string;
 }
 
 export type TaskStatus = "pending" | "completed";
@@ -34,7 +34,6 @@ function AddTask() {
         }
         setSubmitDisabled(true);
         const task = await createTask(
-            userContext.user!.token,
             title,
             description || null,
             dueDate ? new Date(dueDate).toISOString() : null,
@@ -2,6 +2,7 @@ import { useContext, useEffect, useState } from 'react';
 import { useNavigate } from 'react-router';
 import { UserContext, TitleContext } from '../../context';
 import { fetchTasks } from '../../lib/api/tasks';
+import { logout } from '../../lib/api/session';
 import { TaskRow } from './TaskRow';
 import type { Task } from '../../lib/types';
 import './Dashboard.css'
@@ -22,7 +23,7 @@ function Dashboard() {
         }
 
         async function loadTasks() {
-            const fetched = await fetchTasks(userContext.user!.token);
+            const fetched = await fetchTasks();
             setTasks(fetched);
             setLoading(false);
         }
@@ -102,12 +103,10 @@ function SignOutButton() {
     const [state, setState] = useState<"enabled" | "disabled">("enabled");
     const [label, setLabel] = useState<string>("Sign out");
 
-    function clickHandler() {
+    async function clickHandler() {
         setState("disabled");
         setLabel("Signing out...");
-        localStorage.removeItem("id");
-        localStorage.removeItem("email");
-        localStorage.removeItem("token");
+        await logout();
         userContext.setUser(null);
         setLabel("Sign out");
         setState("enabled");
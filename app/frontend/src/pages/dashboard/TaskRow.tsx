@@ -1,6 +1,5 @@
-import { useState, useContext } from "react";
+import { useState } from "react";
 import { useNavigate } from "react-router";
-import { UserContext } from "../../context";
 import { deleteTask, updateTask } from "../../lib/api/tasks";
 import type { Task } from "../../lib/types";
 
@@ -12,14 +11,13 @@ type TaskRowProps = {
 
 export function TaskRow({ task, onChange, onDelete }: TaskRowProps) {
     const navigate = useNavigate();
-    const userContext = useContext(UserContext);
     const [toggleDisabled, setToggleDisabled] = useState<boolean>(false);
     const [deleteDisabled, setDeleteDisabled] = useState<boolean>(false);
 
     async function handleToggle() {
         setToggleDisabled(true);
         const nextStatus = task.status === "completed" ? "pending" : "completed";
-        const updated = await updateTask(userContext.user!.token, task.id, { status: nextStatus });
+        const updated = await updateTask(task.id, { status: nextStatus });
         if (updated) {
             onChange(updated);
         }
@@ -29,7 +27,7 @@ export function TaskRow({ task, onChange, onDelete }: TaskRowProps) {
     async function handleDelete() {
         if (!confirm("Are you sure you want to permanently delete this task?")) return;
         setDeleteDisabled(true);
-        if (await deleteTask(userContext.user!.token, task.id)) {
+        if (await deleteTask(task.id)) {
             onDelete(task.id);
         }
         setDeleteDisabled(false);
@@ -101,7 +101,6 @@ function SubmitButton({
             userContext.setUser(user);
             localStorage.setItem("id", user.id);
             localStorage.setItem("email", user.email);
-            localStorage.setItem("token", user.token);
             navigate("/dashboard");
             return;
         }
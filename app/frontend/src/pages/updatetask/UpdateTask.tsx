@@ -32,7 +32,7 @@ function UpdateTask() {
         }
 
         async function loadTask() {
-            const task = await fetchTaskById(userContext.user!.token, task_id!);
+            const task = await fetchTaskById(task_id!);
             if (!task) {
                 setNotFound(true);
                 setLoading(false);
@@ -58,7 +58,7 @@ function UpdateTask() {
             return;
         }
         setSubmitDisabled(true);
-        const updated = await updateTask(userContext.user!.token, task_id!, {
+        const updated = await updateTask(task_id!, {
             title,
             description: description || null,
             status,
@@ -1,40 +1,79 @@
+import asyncio
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 from pathlib import Path
 import mimetypes
 
+from app.api.static_assets import StaticAssets
 from app.core.settings import get_settings
+from app.core.logging_config import configure_logging
+from app.core.pin_store import read_your_writes_pin_store
+from app.db.session import db_router
+from app.auth.password_hasher import password_hasher
+from app.auth.security import bcrypt_rounds
+from app.auth.user_cache import start_user_change_listener
+from app.core.request_metrics import open_worker_metrics
 from app.routers.health import router as health_endpoint_router
 from app.routers.tasks import router as tasks_endpoint_router
 from app.routers.auth import router as auth_endpoint_router
+from app.routers.internal import router as internal_endpoint_router
+from app.routers.metrics import router as metrics_endpoint_router
 
 
 tags_metadata = [
     {"name": "health", "description": "Service health checks."},
     {"name": "auth", "description": "Registration, login, and authentication helpers."},
     {"name": "tasks", "description": "Task CRUD operations (requires authentication)."},
+    {"name": "internal", "description": "Operational metrics (DEV, or X-Internal-Token)."},
 ]
 
 FRONTEND_DIR = Path(__file__).resolve().parent / "frontend" / "dist"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Per-worker background tasks.
+    - User cache invalidation listener (PostgreSQL LISTEN/NOTIFY)
+    - Password hasher threads (started on first use, stopped here)
+    - bcrypt cost calibration on a hasher thread, so neither the first login nor the event loop pays for it
+    - Request metrics file of this worker (METRICS_DIR)
+    """
+    open_worker_metrics(get_settings().METRICS_DIR)
+    await password_hasher.submit(bcrypt_rounds)
+    listener = start_user_change_listener()
+    yield
+    if listener is not None:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+    password_hasher.shutdown()
+
+
 def create_app() -> FastAPI:
     """
     Creates the TaskBeacon FastAPI app.
     - load settings
     - configure logging
+    - wire shared read-your-writes pins into the database router
     - create app
     - attach routers
     """
     settings = get_settings()
 
-    # Configure logging
-    logging.basicConfig(
-        level=settings.get_log_level(),
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    # Configure logging (queued: formatting and writes happen off the request path)
+    configure_logging(
+        settings.get_log_level(),
+        settings.LOG_FORMAT,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+        slow_request_ms=settings.LOG_SLOW_REQUEST_MS,
     )
 
+    # Share read-your-writes pins between workers (raises if replicas need it and it is missing)
+    db_router.pin_store = read_your_writes_pin_store(settings)
+
     # Hide docs in production env mode
     docs_url = "/docs" if settings.ENV == "DEV" else None
     redoc_url = "/redoc" if settings.ENV == "DEV" else None
@@ -47,12 +86,27 @@ def create_app() -> FastAPI:
         docs_url=docs_url,
         redoc_url=redoc_url,
         openapi_url=openapi_url,
+        lifespan=lifespan,
     )
     
     # Specify mimetypes
     mimetypes.add_type("application/javascript", ".js")
     mimetypes.add_type("text/css", ".css")
     
+    # Response compression (innermost: sees the app's own headers and body)
+    if settings.COMPRESSION_ENABLED:
+        from app.middleware.compression import CompressionMiddleware
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            content_types=settings.compression_content_types_list(),
+            levels={
+                "gzip": settings.COMPRESSION_GZIP_LEVEL,
+                "br": settings.COMPRESSION_BROTLI_QUALITY,
+                "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+            },
+        )
+
     # Request logging 
     from app.middleware.request_logging import RequestLoggingMiddleware
     app.add_middleware(RequestLoggingMiddleware)
@@ -72,6 +126,7 @@ def create_app() -> FastAPI:
         allow_credentials=False,    # JWT in Authorization header -> cookies not needed
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],   # Task list pagination, conditional GETs
     )
     
     # TrustedHost middleware
@@ -97,23 +152,33 @@ def create_app() -> FastAPI:
     app.state.limiter = limiter
     app.add_middleware(SlowAPIMiddleware)
 
+    # Request metrics (outermost, so latency covers every middleware and rejected requests are counted)
+    from app.middleware.request_metrics import RequestMetricsMiddleware
+    app.add_middleware(RequestMetricsMiddleware)
+
     # Routers
     app.include_router(health_endpoint_router)
     app.include_router(tasks_endpoint_router)
     app.include_router(auth_endpoint_router)
+    app.include_router(internal_endpoint_router)
+    app.include_router(metrics_endpoint_router)
     
     # Frontend built assets (JS/CSS bundles)
     app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR), check_dir=True), name="static",)
 
-    # React SPA: serve the matching static file if one exists (e.g. /assets/*.js),
+    # React SPA: serve the matching build file if one exists (e.g. /assets/*.js),
     # otherwise fall back to index.html so client-side routes (e.g. /dashboard)
     # work on a hard refresh too, not just on in-app navigation.
+    # The build is read, hashed and compressed once here and served from memory.
+    spa_assets = StaticAssets.scan(FRONTEND_DIR)
+
     @app.get("/{full_path:path}", include_in_schema=False)
-    def serve_spa(full_path: str):
-        candidate = FRONTEND_DIR / full_path
-        if full_path and candidate.is_file():
-            return FileResponse(candidate)
-        return FileResponse(FRONTEND_DIR / "index.html")
+    async def serve_spa(full_path: str, request: Request):
+        return spa_assets.response(
+            full_path,
+            request.headers.get("if-none-match"),
+            request.headers.get("accept-encoding"),
+        )
 
 
 
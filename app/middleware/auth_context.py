@@ -1,20 +1,42 @@
 from __future__ import annotations
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.auth.jwt import get_token_subject
+from app.auth.jwt import verify_access_token
 
-class AuthContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.user_id = None
 
-        auth = request.headers.get("Authorization")
-        if auth and auth.startswith("Bearer "):
-            token = auth.removeprefix("Bearer ").strip()
+def _bearer_token(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            auth = value.decode("latin-1")
+            return auth.removeprefix("Bearer ").strip() if auth.startswith("Bearer ") else None
+    return None
+
+
+class AuthContextMiddleware:
+    """
+    Pure ASGI: sets request.state.verified_token and request.state.user_id (None when absent or invalid).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # The token is verified once here; get_current_user and DB routing reuse the result
+        state = scope.setdefault("state", {})
+        state["verified_token"] = None
+        state["user_id"] = None
+
+        token = _bearer_token(scope)
+        if token:
             try:
-                request.state.user_id = get_token_subject(token)
+                state["verified_token"] = verify_access_token(token)
+                state["user_id"] = state["verified_token"].subject
             except Exception:
                 pass # Token is invalid so will rate limit based on IP instead
 
-        return await call_next(request)
\ No newline at end of file
+        await self.app(scope, receive, send)
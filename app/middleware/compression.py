@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.http import negotiate_encoding
+
+try:
+    import brotli
+except ImportError:     # optional: br is offered only when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:     # optional: zstd is offered only when installed
+    zstandard = None
+
+# request.state flag set by endpoints whose streamed bodies should be compressed too
+STREAM_COMPRESSION_STATE = "compress_stream"
+
+
+def allow_stream_compression(request: Request) -> None:
+    """
+    Opt a streaming response in to compression; each chunk is flushed so the client still receives it promptly.
+    """
+    setattr(request.state, STREAM_COMPRESSION_STATE, True)
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)   # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+# Defaults per coding: fast settings suited to dynamic responses (gzip 1-9, brotli quality 0-11, zstd 1-22)
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+# Server preference, best first; only codings whose module is installed
+ENCODERS = {
+    name: encoder
+    for name, encoder, available in (
+        ("zstd", _ZstdEncoder, zstandard is not None),
+        ("br", _BrotliEncoder, brotli is not None),
+        ("gzip", _GzipEncoder, True),
+    )
+    if available
+}
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI: compresses responses with the best coding the client accepts (zstd, br, gzip).
+    - Only allow-listed content types of at least minimum_size bytes; never responses with a Content-Encoding
+      (pre-compressed SPA assets), 204/304, or streamed bodies unless the endpoint called allow_stream_compression
+    - A strong ETag becomes weak: the compressed bytes differ, but If-None-Match (weak comparison) still matches
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        content_types: list[str] | None = None,
+        levels: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = frozenset(content_types or ("application/json",))
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), ENCODERS)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self, scope, encoding, send)(receive)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, receive: Receive) -> None:
+        await self.middleware.app(self.scope, receive, self.send_compressed)
+
+    def _eligible(self, message: Message) -> bool:
+        if message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message.get("headers", []))
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return content_type in self.middleware.content_types
+
+    def _compressed_headers(self, streaming: bool) -> MutableHeaders:
+        headers = MutableHeaders(scope=self.start)
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+        if streaming:
+            del headers["Content-Length"]
+        return headers
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if self._eligible(message):
+                self.start = message
+            else:
+                self.passthrough = True
+                await self.send(message)
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        encoder = self.encoder
+
+        if encoder is None:
+            if more_body:
+                state = self.scope.get("state") or {}
+                skip = not state.get(STREAM_COMPRESSION_STATE)
+            else:
+                skip = len(body) < self.middleware.minimum_size
+                if skip:
+                    MutableHeaders(scope=self.start).add_vary_header("Accept-Encoding")
+            if skip:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            encoder = self.encoder = ENCODERS[self.encoding](self.middleware.levels[self.encoding])
+            headers = self._compressed_headers(streaming=more_body)
+            if not more_body:
+                compressed = encoder.compress(body) + encoder.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(self.start)
+
+        chunk = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
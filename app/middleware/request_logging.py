@@ -2,45 +2,93 @@ import time
 import uuid
 import logging
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.logging_config import RequestLogContext, current_request_log
+from app.db.query_metrics import RequestQueryStats, current_request_queries
 
 logger = logging.getLogger("request")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+def _request_id(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            return value.decode("latin-1")
+    return None
+
+
+class RequestLoggingMiddleware:
+    """
+    Pure ASGI: one log line per request, and X-Request-ID on every response.
+    - The line is written when the response starts, as with the BaseHTTPMiddleware version: duration and
+      db_queries stop at the headers, so a streamed body's time is only in the request metrics histograms
+    - Records logged while handling the request carry its id and user (see app.core.logging_config)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get existing request id or create a new one
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request_id = _request_id(scope) or str(uuid.uuid4())
+
+        # Store it so handlers/other middleware can access it (request.state.request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        # Statements run while handling the request, including while streaming the body (see app.db.query_metrics)
+        queries = RequestQueryStats(scope, request_id)
+        queries_token = current_request_queries.set(queries)
+        log_token = current_request_log.set(RequestLogContext(request_id, scope))
 
-        # Store it so handlers/other middleware can access it
-        request.state.request_id = request_id
+        response_started = False
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+                self._log(logging.INFO, scope, message["status"], start, queries)
+            await send(message)
 
         start = time.perf_counter()  # Log request handling time
 
         try:
-            response: Response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         except Exception:
-            duration_ms = (time.perf_counter() - start) * 1000.0
-            logger.exception(
-                "%s %s -> 500 (%.2fms) request_id=%s",
-                request.method,
-                request.url.path,
-                duration_ms,
-                request_id,
-            )
+            # Failing mid-body leaves the line already written, as before
+            if not response_started:
+                self._log(logging.ERROR, scope, 500, start, queries, exc_info=True)
             raise
+        finally:
+            current_request_log.reset(log_token)
+            current_request_queries.reset(queries_token)
 
+    @staticmethod
+    def _log(level: int, scope: Scope, status_code: int, start: float, queries: RequestQueryStats, **kwargs) -> None:
         duration_ms = (time.perf_counter() - start) * 1000.0
-        response.headers["X-Request-ID"] = request_id
-        logger.info(
-            "%s %s -> %s (%.2fms) request_id=%s",
-            request.method,
-            request.url.path,
-            response.status_code,
+        db_ms = queries.total_s * 1000.0
+        logger.log(
+            level,
+            "%s %s -> %s (%.2fms) db_queries=%d db_ms=%.1f request_id=%s",
+            scope["method"],
+            scope["path"],
+            status_code,
             duration_ms,
-            request_id,
+            queries.count,
+            db_ms,
+            queries.request_id,
+            extra={
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration_ms": round(duration_ms, 2),
+                "db_queries": queries.count,
+                "db_ms": round(db_ms, 1),
+            },
+            **kwargs,
         )
-
-        return response
\ No newline at end of file
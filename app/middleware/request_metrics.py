@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import request_metrics
+from app.core.request_metrics import KNOWN_METHODS, UNROUTED
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI: counts each request under its route template (never the raw path) in this worker's metrics buffer.
+    - The route is read from the scope after the app returns, i.e. after routing
+    - Latency runs to the last body message, so streamed responses are fully counted
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics = request_metrics.worker_metrics
+        metrics.request_started()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            status_code = 500
+            raise
+        finally:
+            method = scope["method"]
+            route = getattr(scope.get("route"), "path", None) or UNROUTED
+            metrics.request_finished(
+                method if method in KNOWN_METHODS else "OTHER",
+                route,
+                status_code,
+                time.perf_counter() - start,
+            )
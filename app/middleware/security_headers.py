@@ -1,33 +1,52 @@
 from __future__ import annotations
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+}
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, enable_csp: bool = False):
-        super().__init__(app)
+CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; "
+    "script-src 'self'; "
+    "style-src 'self'; "
+    "img-src 'self'; "
+    "connect-src 'self'; "
+    "object-src 'none'; "
+    "base-uri 'self'; "
+    "frame-ancestors 'none'; "
+    "form-action 'self'"
+)
+
+
+class SecurityHeadersMiddleware:
+    """
+    Pure ASGI: headers are encoded once here and added to http.response.start, the body is passed through untouched.
+    - Headers of the same name set by the app are replaced, as before
+    """
+
+    def __init__(self, app: ASGIApp, enable_csp: bool = False):
+        self.app = app
         self.enable_csp = enable_csp
 
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
-
-        if self.enable_csp:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self'; "
-                "style-src 'self'; "
-                "img-src 'self'; "
-                "connect-src 'self'; "
-                "object-src 'none'; "
-                "base-uri 'self'; "
-                "frame-ancestors 'none'; "
-                "form-action 'self'"
-            )
-
-        return response
\ No newline at end of file
+        headers = dict(SECURITY_HEADERS)
+        if enable_csp:
+            headers["Content-Security-Policy"] = CONTENT_SECURITY_POLICY
+        self.raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+        self.raw_names = frozenset(name for name, _ in self.raw_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [header for header in message.get("headers", ()) if header[0].lower() not in self.raw_names]
+                message["headers"] = headers + self.raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
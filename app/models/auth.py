@@ -22,6 +22,12 @@ class LoginRequest(BaseModel):
         return password_value
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=256)
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    expires_in: int                 # access token lifetime, seconds
+    refresh_token: str              # single use: exchange at /api/auth/refresh for a new pair
@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.core.settings import get_settings
+
+
+TASKS_BATCH_MAX_OPERATIONS = get_settings().TASKS_BATCH_MAX_OPERATIONS
 
 
 class TaskStatus(str, Enum):
@@ -13,6 +18,35 @@ class TaskStatus(str, Enum):
     completed = "completed"
 
 
+class TaskFileFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class TaskSort(str, Enum):
+    """
+    Sort order for task listings.
+    - Value is the field name, prefixed with "-" for descending order
+    - Ties are always broken by task id in the same direction
+    """
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    updated_at = "updated_at"
+    updated_at_desc = "-updated_at"
+    due_date = "due_date"
+    due_date_desc = "-due_date"
+    title = "title"
+    title_desc = "-title"
+
+    @property
+    def field(self) -> str:
+        return self.value.removeprefix("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
 class TaskCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=120)
     description: Optional[str] = Field(None, max_length=400)
@@ -147,3 +181,87 @@ class TaskPublic(BaseModel):
             return None
         description_value = description_value.strip()
         return description_value if description_value else None
+
+
+class TaskBatchUpdate(TaskUpdate):
+    id: UUID
+
+
+class TaskBatchRequest(BaseModel):
+    create: List[TaskCreate] = Field(default_factory=list, max_length=TASKS_BATCH_MAX_OPERATIONS)
+    update: List[TaskBatchUpdate] = Field(default_factory=list, max_length=TASKS_BATCH_MAX_OPERATIONS)
+    delete: List[UUID] = Field(default_factory=list, max_length=TASKS_BATCH_MAX_OPERATIONS)
+
+    @model_validator(mode="before")
+    @classmethod
+    def operation_count_within_limit(cls, data: object) -> object:
+        """
+        Verify the batch size before any item is validated.
+        - Count the raw create/update/delete lists
+        - If the total exceeds TASKS_BATCH_MAX_OPERATIONS raise ValueError
+        """
+        if isinstance(data, dict):
+            count = sum(len(ops) for ops in (data.get(key) for key in ("create", "update", "delete")) if isinstance(ops, list))
+            if count > TASKS_BATCH_MAX_OPERATIONS:
+                raise ValueError(f"batch cannot contain more than {TASKS_BATCH_MAX_OPERATIONS} operations")
+        return data
+
+    @field_validator("update")
+    @classmethod
+    def update_ids_must_be_unique(cls, update_value: List[TaskBatchUpdate]) -> List[TaskBatchUpdate]:
+        """
+        Verify that each task is updated at most once per batch.
+        - If an id repeats raise ValueError
+        """
+        ids = [item.id for item in update_value]
+        if len(ids) != len(set(ids)):
+            raise ValueError("each task can only be updated once per batch")
+        return update_value
+
+    @field_validator("delete")
+    @classmethod
+    def delete_ids_must_be_unique(cls, delete_value: List[UUID]) -> List[UUID]:
+        """
+        Verify that each task is deleted at most once per batch.
+        - If an id repeats raise ValueError
+        """
+        if len(delete_value) != len(set(delete_value)):
+            raise ValueError("each task can only be deleted once per batch")
+        return delete_value
+
+
+class TaskBatchItemStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+
+
+class TaskBatchItemResult(BaseModel):
+    id: UUID
+    status: TaskBatchItemStatus
+    task: Optional[TaskPublic] = None
+
+
+class TaskBatchResponse(BaseModel):
+    created: List[TaskBatchItemResult]
+    updated: List[TaskBatchItemResult]
+    deleted: List[TaskBatchItemResult]
+
+
+class TaskSummary(BaseModel):
+    pending: int
+    completed: int
+    overdue: int
+    total: int
+
+
+class TaskImportLineError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[TaskImportLineError]
@@ -1,13 +1,24 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Request, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.models.user import UserCreate, UserPublic
-from app.models.auth import LoginRequest, TokenResponse
-from app.core.errors import InvalidCredentialsError, EmailAlreadyInUseError
+from app.models.auth import LoginRequest, RefreshRequest, TokenResponse
+from app.core.errors import (
+    InvalidCredentialsError,
+    EmailAlreadyInUseError,
+    InvalidRefreshTokenError,
+    PasswordHasherBusyError,
+)
 from app.auth.jwt import create_access_token
-from app.db.session import get_db
-from app.services.auth_service import authenticate_user, register_user
+from app.db.session import get_async_db, pin_to_primary
+from app.services.auth_service_async import (
+    authenticate_user,
+    issue_refresh_token,
+    register_user,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
 from app.auth.dependencies import get_current_user
 from app.api.serializers import user_orm_to_public
 from app.core.rate_limit import limiter
@@ -18,14 +29,31 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
+def _hasher_busy() -> HTTPException:
+    # Fail fast rather than queue behind a burst of bcrypt work; clients retry shortly
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _token_response(user_id, refresh_token: str) -> TokenResponse:
+    return TokenResponse(
+        access_token=create_access_token(user_id=str(user_id)),
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_token,
+    )
+
+
 
 @router.post("/register", status_code=status.HTTP_201_CREATED, response_model=UserPublic)
 @limiter.limit(settings.RATE_LIMIT_AUTH_REGISTER)
-def register_endpoint(
+async def register_endpoint(
         request: Request,
         response: Response, # Need to include Response param for limiter override
         data: UserCreate, 
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
     ) -> UserPublic:
     """
     Register a new user.
@@ -37,9 +65,12 @@ def register_endpoint(
     logger.info("Register attempt email=%s", email)
 
     try:
-        user = register_user(db, email=email, password=data.password)
+        user = await register_user(db, email=email, password=data.password)
     except EmailAlreadyInUseError:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already in use")
+    except PasswordHasherBusyError:
+        raise _hasher_busy()
+    pin_to_primary(str(user.id))
     user_public = user_orm_to_public(user)
     return user_public
 
@@ -47,33 +78,66 @@ def register_endpoint(
 
 @router.post("/login", response_model=TokenResponse)
 @limiter.limit(settings.RATE_LIMIT_AUTH_LOGIN)
-def login_endpoint(
+async def login_endpoint(
         request: Request,
         response: Response, # Need to include Response param for limiter override
         data: LoginRequest, 
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
     ) -> TokenResponse:
     """
     Login.
     - Verify email + password
-    - Return JWT access token
+    - Return JWT access token and a refresh token starting a new session
     """
     email, password = data.email, data.password
     logger.info("Login attempt email=%s", email)
     
     try:
-        user = authenticate_user(db, email=email, password=password)
+        user = await authenticate_user(db, email=email, password=password)
     except InvalidCredentialsError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    except PasswordHasherBusyError:
+        raise _hasher_busy()
+
+    refresh_token = await issue_refresh_token(db, user.id)
+    return _token_response(user.id, refresh_token)
+
+
+
+@router.post("/refresh", response_model=TokenResponse)
+@limiter.limit(settings.RATE_LIMIT_AUTH_REFRESH)
+async def refresh_endpoint(
+        request: Request,
+        response: Response, # Need to include Response param for limiter override
+        data: RefreshRequest,
+        db: AsyncSession = Depends(get_async_db)
+    ) -> TokenResponse:
+    """
+    Renew a session without the password.
+    - Exchange a single-use refresh token for a new access + refresh token pair (no bcrypt)
+    - Reusing an exchanged refresh token revokes the whole session
+    """
+    try:
+        user_id, refresh_token = await rotate_refresh_token(db, data.refresh_token)
+    except InvalidRefreshTokenError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    return _token_response(user_id, refresh_token)
 
-    token = create_access_token(user_id=str(user.id))
-    return TokenResponse(access_token=token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_endpoint(data: RefreshRequest, db: AsyncSession = Depends(get_async_db)) -> None:
+    """
+    End a session.
+    - Revoke the refresh token and every token rotated from it (access tokens expire on their own)
+    """
+    await revoke_refresh_token(db, data.refresh_token)
 
 
 
 @router.get("/me", response_model=UserPublic)
 @limiter.limit(settings.RATE_LIMIT_AUTH_ME)
-def me_endpoint(
+async def me_endpoint(
         request: Request,
         response: Response, # Need to include Response param for limiter override
         current_user = Depends(get_current_user)
@@ -83,6 +147,5 @@ def me_endpoint(
     - Verify user exists
     - Return UserPublic
     """
-    public = user_orm_to_public(current_user)
-    return public
+    return current_user
 
@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import logging
 
-from app.db.session import get_db
+from app.db.session import get_primary_db
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/health", tags=["health"])
@@ -16,9 +16,9 @@ def live():
 
 
 @router.get("/ready")   # Check services/dependencies are reachable (DB)
-def ready(db: Session = Depends(get_db)):
+async def ready(db: AsyncSession = Depends(get_primary_db)):
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
     except Exception:
         logger.exception("Readiness check failed: DB unreachable")
         return JSONResponse(
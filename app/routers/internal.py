@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+import os
+
+from app.auth.dependencies import require_internal_access
+from app.auth.password_hasher import password_hasher
+from app.auth.user_cache import user_cache
+from app.db.pool_metrics import pool_snapshots
+from app.db.query_metrics import query_snapshots
+
+router = APIRouter(prefix="/api/internal", tags=["internal"], dependencies=[Depends(require_internal_access)])
+
+
+@router.get("/pool")    # Connection pool state and checkout metrics of the worker that answers
+def pool_metrics():
+    return {"pid": os.getpid(), "pools": pool_snapshots()}
+
+
+@router.get("/queries")     # Statement latency histograms by route of the worker that answers
+def query_metrics():
+    return {"pid": os.getpid(), "queries": query_snapshots()}
+
+
+@router.get("/user-cache")  # Resolved-user cache size and hit/miss counters of the worker that answers
+def user_cache_metrics():
+    return {"pid": os.getpid(), "user_cache": user_cache.snapshot()}
+
+
+@router.get("/password-hasher")  # bcrypt queue depth, rejections and latency of the worker that answers
+def password_hasher_metrics():
+    return {"pid": os.getpid(), "password_hasher": password_hasher.snapshot()}
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.auth.dependencies import require_internal_access
+from app.core.request_metrics import metrics_snapshot, render_prometheus
+from app.core.settings import get_settings
+
+router = APIRouter(prefix="/api", tags=["internal"], dependencies=[Depends(require_internal_access)])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)  # Request metrics of all workers sharing METRICS_DIR
+def metrics():
+    snapshot = metrics_snapshot(get_settings().METRICS_DIR)
+    return PlainTextResponse(render_prometheus(snapshot), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,45 +1,213 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from datetime import datetime
 import logging
 
 from app.auth.dependencies import get_current_user
-from app.models.task import TaskPublic, TaskCreate, TaskUpdate
+from app.models.task import (
+    TaskPublic, TaskCreate, TaskUpdate, TaskStatus, TaskSort, TaskFileFormat,
+    TaskBatchRequest, TaskBatchResponse, TaskBatchItemResult, TaskBatchItemStatus, TaskImportResponse,
+    TaskSummary,
+)
 from app.models.user import User
-from app.db.session import get_db
-from app.storage.db_tasks import create_task, list_tasks, get_task_by_id, update_task, delete_task
-from app.api.serializers import task_orm_to_public
+from app.db.session import get_async_db
+from app.storage.db_tasks_async import (
+    create_task, list_tasks, search_tasks, stream_tasks, get_task_summary, get_task_by_id, update_task, delete_task, apply_task_batch, import_tasks,
+)
+from app.storage.db_users_async import get_tasks_version
+from app.api.serializers import task_orm_to_public, tasks_json_response
+from app.api.pagination import encode_cursor, decode_cursor
+from app.api.etag import make_etag, etag_matches
+from app.api.export import ndjson_chunks, csv_chunks
+from app.api.task_import import TaskImportReader
+from app.core.errors import InvalidCursorError, InvalidImportFileError, ImportLimitExceededError
+from app.core.settings import get_settings
+from app.middleware.compression import allow_stream_compression
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Cursor sort key for search results, which are always ordered by rank
+SEARCH_CURSOR_KEY = "rank"
+# Let browsers keep task reads but revalidate them with If-None-Match every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def _not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """
+    Conditional GET support.
+    - Attach ETag and Cache-Control to the outgoing response
+    - Return a 304 response if the client already holds this version, otherwise None
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
 
 
 @router.get("", response_model=list[TaskPublic])
-def list_tasks_endpoint(
+async def list_tasks_endpoint(
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.TASKS_PAGE_SIZE_DEFAULT, ge=1, le=settings.TASKS_PAGE_SIZE_MAX),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    sort: TaskSort = Query(TaskSort.created_at, description="Sort field, prefix with '-' for descending"),
+    status_filter: TaskStatus | None = Query(None, alias="status"),
+    due_after: datetime | None = Query(None, description="Only tasks due at or after this time"),
+    due_before: datetime | None = Query(None, description="Only tasks due before this time"),
+    overdue: bool = Query(False, description="Only pending tasks whose due date has passed"),
     current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ) ->list[TaskPublic]:
     """
     Task listing endpoint.
-    - Retrieve list of all tasks from database (specific to authenticated user)
+    - Retrieve one page of matching tasks from database (specific to authenticated user)
     - Serialize to TaskPublic and return
+    - If more tasks remain, return the cursor for the next page in the X-Next-Cursor header
+    - If the client's If-None-Match matches the user's current task version, return 304
     """
-    task_list_public = list()
+    try:
+        after = decode_cursor(cursor, sort.value) if cursor else None
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    # overdue results change with the clock as well as with writes, so they are never cached
+    if not overdue:
+        version = await get_tasks_version(db, current_user.id)
+        etag = make_etag("tasks", current_user.id, version, sorted(request.query_params.multi_items()))
+        not_modified = _not_modified(request, response, etag)
+        if not_modified:
+            return not_modified
+
     logger.info("Fetching tasks for user_id=%s", str(current_user.id))
-    task_list = list_tasks(db, user_id=current_user.id)
-    for task in task_list:
-        public = task_orm_to_public(task)
-        task_list_public.append(public)
-    return task_list_public
+    # Fetch one extra row to learn whether another page exists
+    task_list = await list_tasks(
+        db,
+        user_id=current_user.id,
+        limit=limit + 1,
+        after=after,
+        sort=sort,
+        status=status_filter,
+        due_after=due_after,
+        due_before=due_before,
+        overdue=overdue
+        )
+    if len(task_list) > limit:
+        task_list = task_list[:limit]
+        last = task_list[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort.value, getattr(last, sort.field), last.id)
+    # Rows are trusted: JSON bytes directly, without response_model revalidation (schema is unchanged)
+    return tasks_json_response(task_list, response)
+
+
+
+@router.get("/summary", response_model=TaskSummary)
+async def task_summary_endpoint(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+    ) -> TaskSummary:
+    """
+    Task summary endpoint.
+    - Return task counts by status and the overdue count (specific to authenticated user)
+    - Status counts are read from counters maintained on every task write, not by scanning tasks
+    """
+    summary = await get_task_summary(db, current_user.id)
+    if summary is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    pending, completed, overdue = summary
+    return TaskSummary(pending=pending, completed=completed, overdue=overdue, total=pending + completed)
+
+
+
+@router.get("/search", response_model=list[TaskPublic])
+async def search_tasks_endpoint(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (quotes, OR and -word supported)"),
+    limit: int = Query(settings.TASKS_PAGE_SIZE_DEFAULT, ge=1, le=settings.TASKS_PAGE_SIZE_MAX),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+    ) -> list[TaskPublic]:
+    """
+    Task search endpoint.
+    - Match the query against title and description (specific to authenticated user), best match first
+    - If more matches remain, return the cursor for the next page in the X-Next-Cursor header
+    - If the client's If-None-Match matches the user's current task version, return 304
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail="Search query cannot be blank")
+    try:
+        after = decode_cursor(cursor, SEARCH_CURSOR_KEY) if cursor else None
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    version = await get_tasks_version(db, current_user.id)
+    etag = make_etag("tasks-search", current_user.id, version, sorted(request.query_params.multi_items()))
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    logger.info("Searching tasks for user_id=%s", str(current_user.id))
+    # Fetch one extra row to learn whether another page exists
+    results = await search_tasks(db, user_id=current_user.id, q=q, limit=limit + 1, after=after)
+    if len(results) > limit:
+        results = results[:limit]
+        last, last_rank = results[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(SEARCH_CURSOR_KEY, float(last_rank), last.id)
+    return tasks_json_response((task for task, _ in results), response)
+
+
+
+EXPORT_MEDIA_TYPES = {
+    TaskFileFormat.ndjson: "application/x-ndjson",
+    TaskFileFormat.csv: "text/csv",
+}
+
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}},
+)
+async def export_tasks_endpoint(
+    request: Request,
+    export_format: TaskFileFormat = Query(TaskFileFormat.ndjson, alias="format"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+    ) -> StreamingResponse:
+    """
+    Task export endpoint.
+    - Stream every task of the authenticated user as NDJSON or CSV
+    - Rows are read from a server-side cursor in batches, so memory stays flat
+    - Compressed per batch when the client accepts it (exports are large and repetitive)
+    """
+    allow_stream_compression(request)
+    logger.info("Exporting tasks for user_id=%s format=%s", str(current_user.id), export_format.value)
+    batches = stream_tasks(db, user_id=current_user.id, batch_size=settings.TASKS_EXPORT_BATCH_SIZE)
+    chunks = ndjson_chunks(batches) if export_format == TaskFileFormat.ndjson else csv_chunks(batches)
+    filename = f"tasks.{export_format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=TaskPublic)
-def create_task_endpoint(
+async def create_task_endpoint(
     data: TaskCreate, 
     current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ) -> TaskPublic:
     """
     Create new task endpoint.
@@ -47,7 +215,7 @@ def create_task_endpoint(
     - Return task
     """
     logger.info("Creating task with title='%s'", data.title)
-    task = create_task(
+    task = await create_task(
         db,
         owner_id=current_user.id,
         title=data.title, 
@@ -61,19 +229,109 @@ def create_task_endpoint(
 
 
 
+@router.post(":batch", response_model=TaskBatchResponse)
+async def batch_tasks_endpoint(
+    data: TaskBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+    ) -> TaskBatchResponse:
+    """
+    Batch create/update/delete endpoint.
+    - Apply all operations in a single transaction (one statement per operation kind)
+    - Return a per-item result for every operation, in request order
+    - Batches over the operation limit are rejected with 422 by TaskBatchRequest
+    """
+    logger.info(
+        "Applying task batch user_id=%s create=%d update=%d delete=%d",
+        str(current_user.id), len(data.create), len(data.update), len(data.delete),
+    )
+    created, updated, deleted = await apply_task_batch(
+        db,
+        owner_id=current_user.id,
+        creates=data.create,
+        updates=data.update,
+        deletes=data.delete
+        )
+
+    created_results = [
+        TaskBatchItemResult(id=task.id, status=TaskBatchItemStatus.created, task=task_orm_to_public(task))
+        for task in created
+    ]
+    updated_results = []
+    for item in data.update:
+        task = updated.get(item.id)
+        if task is None:
+            updated_results.append(TaskBatchItemResult(id=item.id, status=TaskBatchItemStatus.not_found))
+        else:
+            updated_results.append(
+                TaskBatchItemResult(id=item.id, status=TaskBatchItemStatus.updated, task=task_orm_to_public(task))
+            )
+    deleted_results = [
+        TaskBatchItemResult(
+            id=task_id,
+            status=TaskBatchItemStatus.deleted if task_id in deleted else TaskBatchItemStatus.not_found,
+        )
+        for task_id in data.delete
+    ]
+    return TaskBatchResponse(created=created_results, updated=updated_results, deleted=deleted_results)
+
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks_endpoint(
+    request: Request,
+    import_format: TaskFileFormat = Query(TaskFileFormat.ndjson, alias="format"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+    ) -> TaskImportResponse:
+    """
+    Bulk task import endpoint.
+    - Stream an NDJSON or CSV body, validating rows against TaskCreate in chunks
+    - Load all valid rows in one transaction; invalid rows are reported by line and skipped
+    - If the file cannot be parsed or is too large, raise HTTPException (nothing is imported)
+    """
+    reader = TaskImportReader(
+        import_format,
+        chunk_size=settings.TASKS_IMPORT_CHUNK_SIZE,
+        max_rows=settings.TASKS_IMPORT_MAX_ROWS,
+        max_errors=settings.TASKS_IMPORT_MAX_ERRORS,
+        )
+    try:
+        imported = await import_tasks(db, owner_id=current_user.id, chunks=reader.chunks(request.stream()))
+    except InvalidImportFileError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except ImportLimitExceededError as e:
+        raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE, detail=str(e))
+
+    logger.info(
+        "Imported tasks user_id=%s format=%s imported=%d failed=%d",
+        str(current_user.id), import_format.value, imported, reader.failed,
+    )
+    return TaskImportResponse(imported=imported, failed=reader.failed, errors=reader.errors)
+
+
+
 @router.get("/{task_id}", response_model=TaskPublic)
-def get_task_by_id_endpoint(
+async def get_task_by_id_endpoint(
     task_id: UUID, 
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ) -> TaskPublic:
     """
     Fetch a task by id endpoint.
     - Call task getter method
     - Return task
+    - If the client's If-None-Match matches the user's current task version, return 304
     """
+    version = await get_tasks_version(db, current_user.id)
+    not_modified = _not_modified(request, response, make_etag("task", current_user.id, version, task_id))
+    if not_modified:
+        return not_modified
+
     logger.info("Fetching task id=%s", str(task_id))
-    task = get_task_by_id(
+    task = await get_task_by_id(
         db, 
         task_id=task_id, 
         user_id=current_user.id
@@ -87,11 +345,11 @@ def get_task_by_id_endpoint(
 
 
 @router.patch("/{task_id}", response_model=TaskPublic)
-def update_task_endpoint(
+async def update_task_endpoint(
     task_id: UUID, 
     data: TaskUpdate, 
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ) -> TaskPublic:
     """
     Update an existing task endpoint.
@@ -100,7 +358,7 @@ def update_task_endpoint(
     - If no task matching id exists, raise HTTPException
     """
     logger.info("Updating task id=%s", str(task_id))
-    task = update_task(
+    task = await update_task(
         db, 
         task_id=task_id, 
         data=data,
@@ -116,10 +374,10 @@ def update_task_endpoint(
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task_endpoint(
+async def delete_task_endpoint(
     task_id: UUID, 
     current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
     ):
     """
     Delete a task endpoint.
@@ -127,7 +385,7 @@ def delete_task_endpoint(
     - If no task matching id exists, raise HTTPException
     """
     logger.info("Deleting task id=%s", str(task_id))
-    deleted = delete_task(db, task_id=task_id, user_id=current_user.id)
+    deleted = await delete_task(db, task_id=task_id, user_id=current_user.id)
     if not deleted:
         logger.warning("Task not found for delete id=%s", str(task_id))
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
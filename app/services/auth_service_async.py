@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import secrets
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from app.core.errors import (
+    InvalidCredentialsError,
+    EmailAlreadyInUseError,
+    InvalidRefreshTokenError,
+    PasswordHasherBusyError,
+)
+from app.auth.password_hasher import password_hasher
+from app.auth.security import needs_rehash
+from app.db.models.user_orm import UserORM
+from app.storage.db_users_async import create_user, get_user_by_email, get_user_by_id, update_password_hash
+from app.storage.db_refresh_tokens_async import (
+    add_refresh_token,
+    claim_refresh_token,
+    get_refresh_token,
+    revoke_refresh_token_family,
+)
+from app.auth.user_cache import user_cache
+from app.api.serializers import user_orm_to_public
+from app.models.user import UserPublic
+from app.core.settings import get_settings
+
+# bcrypt is CPU-bound, so it runs on the password hasher's own threads to keep the event loop and the
+# request threadpool free (PasswordHasherBusyError when its queue is full).
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+async def authenticate_user(db, email: str, password: str) -> UserORM:
+    """
+    Authenticate user by email and password.
+    - Return UserORM if successful, raise InvalidCredentialsError if not.
+    - Rehash at the current bcrypt cost if the stored hash uses another one (skipped while the hasher is busy;
+      the next login retries).
+    """
+    user = await get_user_by_email(db, email)
+    if user is None or not await password_hasher.verify_password(password, user.password_hash):
+        raise InvalidCredentialsError()
+    if needs_rehash(user.password_hash):
+        try:
+            password_hash = await password_hasher.hash_password(password)
+        except PasswordHasherBusyError:
+            logger.info("Password hasher busy, rehash deferred user_id=%s", user.id)
+            return user
+        await update_password_hash(db, user, password_hash)
+    return user
+
+async def register_user(db, email: str, password: str) -> UserORM:
+    """
+    Register a new user with email and password.
+    - Hash password and store user in database.
+    - Raise EmailAlreadyInUseError if email is already registered.
+    """
+    password_hash = await password_hasher.hash_password(password)
+    try:
+        user = await create_user(db, email=email, password_hash=password_hash)
+    except ValueError as e:
+        if "email already in use" in str(e).lower():
+            raise EmailAlreadyInUseError()
+        raise
+    return user
+
+async def resolve_current_user(db, subject: str | None) -> UserPublic:
+    """
+    Resolve the current user from the subject of a verified JWT token.
+    - Read the user from the user cache or the database.
+    - Raise InvalidCredentialsError if the subject is not a user ID or user not found (misses are not cached).
+    """
+    try:
+        user_id = UUID(subject)
+    except (TypeError, ValueError):
+        raise InvalidCredentialsError()
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    epoch = user_cache.epoch
+    user_row = await get_user_by_id(db, user_id)
+    if user_row is None:
+        raise InvalidCredentialsError()
+    user = user_orm_to_public(user_row)
+    user_cache.put(user, epoch)
+    return user
+
+
+def _hash_refresh_token(token: str) -> str:
+    # Refresh tokens are 256 random bits, so a fast hash is enough to store them (no bcrypt)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+async def _add_refresh_token(db, user_id: UUID, family_id: UUID, now: datetime) -> str:
+    token = secrets.token_urlsafe(32)
+    add_refresh_token(
+        db,
+        user_id=user_id,
+        family_id=family_id,
+        token_hash=_hash_refresh_token(token),
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    )
+    await db.commit()
+    return token
+
+async def issue_refresh_token(db, user_id: UUID) -> str:
+    """
+    Start a new refresh token family (one per login) and return its first token.
+    """
+    return await _add_refresh_token(db, user_id, uuid4(), datetime.now(timezone.utc))
+
+async def rotate_refresh_token(db, token: str) -> tuple[UUID, str]:
+    """
+    Exchange a refresh token for the next one in its family.
+    - Return (user_id, new refresh token); the presented token cannot be used again
+    - A token presented after it was already exchanged is treated as stolen: revoke its whole family
+    - Raise InvalidRefreshTokenError if the token is unknown, expired, revoked or reused
+    """
+    now = datetime.now(timezone.utc)
+    token_hash = _hash_refresh_token(token)
+    claimed = await claim_refresh_token(db, token_hash, now)
+    if claimed is None:
+        stored = await get_refresh_token(db, token_hash)
+        if stored is not None and stored.used_at is not None and stored.revoked_at is None:
+            revoked = await revoke_refresh_token_family(db, stored.family_id, now)
+            logger.warning("Refresh token reuse, revoked family user_id=%s tokens=%d", stored.user_id, revoked)
+        raise InvalidRefreshTokenError()
+    user_id, family_id = claimed
+    return user_id, await _add_refresh_token(db, user_id, family_id, now)
+
+async def revoke_refresh_token(db, token: str) -> None:
+    """
+    Log out: revoke the family of a refresh token (unknown tokens are ignored).
+    """
+    stored = await get_refresh_token(db, _hash_refresh_token(token))
+    if stored is not None:
+        await revoke_refresh_token_family(db, stored.family_id, datetime.now(timezone.utc))
@@ -0,0 +1,58 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.refresh_token_orm import RefreshTokenORM
+
+
+def add_refresh_token(
+    db: AsyncSession, *, user_id: UUID, family_id: UUID, token_hash: str, expires_at: datetime
+) -> None:
+    """
+    Stage a new refresh token row; the caller commits.
+    """
+    db.add(RefreshTokenORM(user_id=user_id, family_id=family_id, token_hash=token_hash, expires_at=expires_at))
+
+
+async def claim_refresh_token(db: AsyncSession, token_hash: str, now: datetime) -> tuple[UUID, UUID] | None:
+    """
+    Mark a live refresh token as used, atomically (unique index lookup, one round trip).
+    - Return (user_id, family_id), or None if the token is unknown, expired, already used or revoked
+    - Two concurrent claims of one token cannot both succeed
+    """
+    result = await db.execute(
+        update(RefreshTokenORM)
+        .where(
+            RefreshTokenORM.token_hash == token_hash,
+            RefreshTokenORM.used_at.is_(None),
+            RefreshTokenORM.revoked_at.is_(None),
+            RefreshTokenORM.expires_at > now,
+        )
+        .values(used_at=now)
+        .returning(RefreshTokenORM.user_id, RefreshTokenORM.family_id)
+        .execution_options(synchronize_session=False)
+    )
+    row = result.one_or_none()
+    return (row.user_id, row.family_id) if row is not None else None
+
+
+async def get_refresh_token(db: AsyncSession, token_hash: str) -> RefreshTokenORM | None:
+    result = await db.execute(select(RefreshTokenORM).where(RefreshTokenORM.token_hash == token_hash))
+    return result.scalar_one_or_none()
+
+
+async def revoke_refresh_token_family(db: AsyncSession, family_id: UUID, now: datetime) -> int:
+    """
+    Revoke every live token of a family (one login session) and commit.
+    - Return the number of tokens revoked
+    """
+    result = await db.execute(
+        update(RefreshTokenORM)
+        .where(RefreshTokenORM.family_id == family_id, RefreshTokenORM.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
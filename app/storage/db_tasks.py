@@ -1,86 +1,443 @@
-from uuid import UUID
-from sqlalchemy import select
+from uuid import UUID, uuid4
+from sqlalchemy import select, insert, update, delete, values, column, literal, union_all, tuple_, and_, or_
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table, case, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PG_UUID
+from sqlalchemy.engine import Dialect
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
-from datetime import datetime
+from sqlalchemy import Select, Insert, Update, Delete
+from sqlalchemy.schema import CreateTable
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import Counter
+from datetime import datetime, timezone
 import logging
 
-from app.models.task import TaskUpdate, TaskStatus
-from app.db.models.task_orm import TaskORM
+from app.models.task import TaskCreate, TaskUpdate, TaskBatchUpdate, TaskStatus, TaskSort
+from app.db.models.task_orm import TaskORM, TASKS_SEARCH_CONFIG, TASKS_SEARCH_VECTOR_COLUMN
+from app.db.models.user_orm import UserORM
 
 logger = logging.getLogger(__name__)
 
-def list_tasks(db: Session, user_id: UUID) -> List[TaskORM]:
+def _keyset_after(column, after: Tuple[object, UUID], descending: bool):
+    """
+    Build the WHERE clause selecting rows positioned after a keyset.
+    Ascending sorts put NULLs last and descending sorts put them first, which
+    is the order a btree index yields when scanned forwards or backwards.
+    """
+    value, task_id = after
+    if descending:
+        if value is None:
+            return or_(and_(column.is_(None), TaskORM.id < task_id), column.is_not(None))
+        return tuple_(column, TaskORM.id) < tuple_(value, task_id)
+    if value is None:
+        return and_(column.is_(None), TaskORM.id > task_id)
+    clause = tuple_(column, TaskORM.id) > tuple_(value, task_id)
+    if column.expression.nullable:
+        clause = or_(clause, column.is_(None))
+    return clause
+
+
+def list_tasks_query(
+    user_id: UUID,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[object, UUID]] = None,
+    sort: TaskSort = TaskSort.created_at,
+    status: Optional[TaskStatus] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: bool = False
+    ) -> Select:
+    """
+    Build the task listing query.
+    - Filter by status, due date range and/or overdue (pending and past due)
+    - Order by the sort field, ties broken by id
+    - If after is given, only select tasks positioned after that (value, id) keyset
+    - If limit is given, select at most limit tasks
+    Index use (owner-scoped indexes in app.db.models.task_orm):
+    - Index range scan in sort order, so page cost does not grow with depth: any sort
+      without filters, status with the created_at sort, a due date range with the
+      due_date sort, and overdue or status=pending with the due_date sort (partial index)
+    - Filtered scan plus sort of the owner's matching rows: status with the title,
+      updated_at or due_date sort (other than pending), a due date range with any other
+      sort, and overdue with any other sort (the partial index narrows the rows)
+    """
+    column = getattr(TaskORM, sort.field)
     query = select(TaskORM).where(TaskORM.owner_id == user_id)
-    result = db.execute(query)
-    return result.scalars().all()
 
-def create_task(
-    db: Session, 
-    *, 
-    owner_id: UUID,
-    title: str, 
-    description: Optional[str], 
-    status: str, 
-    due_date: Optional[datetime]
-    ) -> TaskORM:
-    """
-    Create a new task.
-    - Create new task instance
-    - Store task in database
-    - Return task
-    """
-    
-    task = TaskORM(
-        owner_id=owner_id, 
-        title=title,
-        description=description,
-        status=TaskStatus(status),
-        due_date=due_date
+    if overdue:
+        query = query.where(
+            TaskORM.status == TaskStatus.pending.value,
+            TaskORM.due_date < datetime.now(timezone.utc),
         )
-    
-    db.add(task)
-    try:
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        raise ValueError("Integrity error")
-    
-    db.refresh(task)
-    return task
+    if status is not None:
+        query = query.where(TaskORM.status == status.value)
+    if due_after is not None:
+        query = query.where(TaskORM.due_date >= due_after)
+    if due_before is not None:
+        query = query.where(TaskORM.due_date < due_before)
+
+    if after is not None:
+        query = query.where(_keyset_after(column, after, sort.descending))
+
+    if sort.descending:
+        query = query.order_by(column.desc().nulls_first(), TaskORM.id.desc())
+    else:
+        query = query.order_by(column.asc().nulls_last(), TaskORM.id.asc())
 
+    if limit is not None:
+        query = query.limit(limit)
+    return query
 
-def get_task_by_id(db: Session, task_id: UUID, user_id: UUID) -> Optional[TaskORM]:
-    query = select(TaskORM).where(TaskORM.id == task_id, TaskORM.owner_id == user_id)
-    task = db.execute(query).scalar_one_or_none()
-    if not task:
-        return None
-    return task
 
+def _like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
-def update_task(db: Session, task_id: UUID, data: TaskUpdate, owner_id: UUID) -> Optional[TaskORM]:
-    task = get_task_by_id(db, task_id=task_id, user_id=owner_id)
-    if not task:
-        return None
 
-    updates = data.model_dump(exclude_unset=True)
+def search_tasks_query(
+    dialect_name: str,
+    user_id: UUID,
+    q: str,
+    *,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[float, UUID]] = None
+    ) -> Select:
+    """
+    Build the task search query, selecting (task, rank) best match first.
+    - PostgreSQL: full-text match on the generated search_vector (web search syntax),
+      plus substring and trigram-similar title matches for prefixes and typos;
+      rank = ts_rank_cd + title similarity
+    - Other backends (SQLite in tests): case-insensitive substring match, title hits first
+    - Order by rank descending, ties broken by id
+    - If after is given, only select tasks positioned after that (rank, id) keyset
+    Every predicate is served by an owner-scoped GIN index, so matching never leaves
+    the user's own rows; ranking only touches the matches.
+    """
+    pattern = _like_pattern(q)
+    title_hit = TaskORM.title.ilike(pattern, escape="\\")
+    if dialect_name == "postgresql":
+        vector = literal_column(f"{TaskORM.__tablename__}.{TASKS_SEARCH_VECTOR_COLUMN}", TSVECTOR)
+        ts_query = func.websearch_to_tsquery(literal_column(f"'{TASKS_SEARCH_CONFIG}'::regconfig"), q)
+        match = or_(vector.op("@@")(ts_query), title_hit, TaskORM.title.op("%")(q))
+        rank = (func.ts_rank_cd(vector, ts_query) + func.similarity(TaskORM.title, q)).cast(Float)
+    else:
+        match = or_(title_hit, TaskORM.description.ilike(pattern, escape="\\"))
+        rank = case((title_hit, 1.0), else_=0.5).cast(Float)
+
+    rank_label = rank.label("rank")
+    query = select(TaskORM, rank_label).where(TaskORM.owner_id == user_id, match)
+    if after is not None:
+        after_rank, after_id = after
+        query = query.where(or_(rank < after_rank, and_(rank == after_rank, TaskORM.id > after_id)))
+    query = query.order_by(rank_label.desc(), TaskORM.id.asc())
 
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def get_task_query(task_id: UUID, user_id: UUID) -> Select:
+    return select(TaskORM).where(TaskORM.id == task_id, TaskORM.owner_id == user_id)
+
+
+def insert_task_stmt(
+    *,
+    owner_id: UUID,
+    title: str,
+    description: Optional[str],
+    status: str,
+    due_date: Optional[datetime]
+    ) -> Insert:
+    """
+    INSERT ... RETURNING the stored row (one round trip, no refresh).
+    """
+    return (
+        insert(TaskORM)
+        .values(
+            owner_id=owner_id,
+            title=title,
+            description=description,
+            status=TaskStatus(status).value,
+            due_date=due_date
+            )
+        .returning(TaskORM)
+    )
+
+
+def update_values(data: TaskUpdate) -> dict:
+    """
+    Column values for a partial update (only the fields the client sent).
+    """
+    updates = data.model_dump(exclude_unset=True, exclude={"id"})
     if "status" in updates and updates["status"] is not None:
         updates["status"] = updates["status"].value
+    return updates
 
-    for field, value in updates.items():
-        setattr(task, field, value) # if value is None, column is cleared
 
-    db.commit()
-    db.refresh(task)
-    return task
+def update_task_stmt(task_id: UUID, owner_id: UUID, updates: dict) -> Update:
+    """
+    Owner-scoped UPDATE ... RETURNING the new row (one round trip, no refresh).
+    - If a value is None, column is cleared
+    - Returned values overwrite any copy of the task already loaded in the session
+    """
+    return (
+        update(TaskORM)
+        .where(TaskORM.id == task_id, TaskORM.owner_id == owner_id)
+        .values(**updates)
+        .returning(TaskORM)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+def delete_task_stmt(task_id: UUID, owner_id: UUID) -> Delete:
+    """
+    Owner-scoped DELETE ... RETURNING the deleted task's status (one round trip).
+    """
+    return (
+        delete(TaskORM)
+        .where(TaskORM.id == task_id, TaskORM.owner_id == owner_id)
+        .returning(TaskORM.status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def task_statuses_query(owner_id: UUID, task_ids: List[UUID]) -> Select:
+    """
+    Current (id, status) of tasks about to change status, locked until commit so the
+    counter deltas computed from them stay correct under concurrent writes.
+    """
+    return (
+        select(TaskORM.id, TaskORM.status)
+        .where(TaskORM.owner_id == owner_id, TaskORM.id.in_(task_ids))
+        .with_for_update()
+    )
+
+
+# users column holding the task count for each status
+STATUS_COUNTERS = {
+    TaskStatus.pending.value: UserORM.pending_tasks,
+    TaskStatus.completed.value: UserORM.completed_tasks,
+}
 
 
-def delete_task(db: Session, task_id: UUID, user_id: UUID) -> bool:
-    task = get_task_by_id(db, task_id=task_id, user_id=user_id)
-    if not task:
-        return False
-    db.delete(task)
+def status_delta(added: Iterable[str] = (), removed: Iterable[str] = ()) -> Counter:
+    """
+    Net change in task count per status.
+    """
+    delta = Counter(added)
+    delta.subtract(removed)
+    return delta
+
+
+def bump_tasks_version_stmt(owner_id: UUID, delta: Optional[Counter] = None) -> Update:
+    """
+    Advance the owner's tasks_version so cached task reads (ETags) are invalidated,
+    and apply the write's net change to the per-status task counters.
+    Runs in the same transaction as the task write it accompanies.
+    """
+    values = {UserORM.tasks_version: UserORM.tasks_version + 1}
+    for task_status, change in (delta or {}).items():
+        if change:
+            counter = STATUS_COUNTERS[task_status]
+            values[counter] = counter + change
+    return (
+        update(UserORM)
+        .where(UserORM.id == owner_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def task_summary_query(user_id: UUID) -> Select:
+    """
+    Build the task summary query: stored counters plus the overdue count.
+    - Overdue depends on the clock, so it is counted on read (range scan of the
+      partial pending-by-due-date index), never stored
+    """
+    overdue = (
+        select(func.count())
+        .select_from(TaskORM)
+        .where(
+            TaskORM.owner_id == user_id,
+            TaskORM.status == TaskStatus.pending.value,
+            TaskORM.due_date < datetime.now(timezone.utc),
+        )
+        .scalar_subquery()
+    )
+    return select(UserORM.pending_tasks, UserORM.completed_tasks, overdue.label("overdue")).where(UserORM.id == user_id)
+
+
+def reconcile_task_counters_stmt(user_ids: List[UUID]) -> Update:
+    """
+    Recompute the task counters of the given users from tasks.
+    - Only rows that drifted are written; RETURNING their ids
+    """
+    def count(task_status: str):
+        return (
+            select(func.count())
+            .select_from(TaskORM)
+            .where(TaskORM.owner_id == UserORM.id, TaskORM.status == task_status)
+            .scalar_subquery()
+        )
+
+    recounted = {counter: count(task_status) for task_status, counter in STATUS_COUNTERS.items()}
+    return (
+        update(UserORM)
+        .where(UserORM.id.in_(user_ids), or_(*(counter != value for counter, value in recounted.items())))
+        .values(recounted)
+        .returning(UserORM.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_task_counters(db: Session, user_ids: List[UUID]) -> List[UUID]:
+    """
+    Recompute stored task counters from tasks for the given users and commit.
+    - Return ids of users whose counters had drifted
+    """
+    drifted = list(db.scalars(reconcile_task_counters_stmt(user_ids)))
     db.commit()
-    return True
+    return drifted
+
+
+def _values_table(dialect_name: str, columns: list, rows: list[tuple], name: str):
+    """
+    Inline table of literal rows to join against in a single statement.
+    - PostgreSQL: (VALUES ...) AS name (col, ...)
+    - Other backends (SQLite in tests) lack column aliases on VALUES, so use SELECT ... UNION ALL
+    """
+    if dialect_name == "postgresql":
+        return values(*columns, name=name).data(rows)
+    selects = [
+        select(*(literal(value, type_=col.type).label(col.name) for col, value in zip(columns, row)))
+        for row in rows
+    ]
+    return union_all(*selects).subquery(name)
+
+
+def insert_tasks_stmt(owner_id: UUID, items: List[TaskCreate]) -> Tuple[Insert, List[dict]]:
+    """
+    One multi-row INSERT ... RETURNING and its parameter rows; rows come back in input order.
+    """
+    rows = [
+        {
+            "owner_id": owner_id,
+            "title": item.title,
+            "description": item.description,
+            "status": item.status.value,
+            "due_date": item.due_date,
+        }
+        for item in items
+    ]
+    return insert(TaskORM).returning(TaskORM, sort_by_parameter_order=True), rows
+
+
+def update_tasks_stmts(dialect_name: str, owner_id: UUID, items: List[TaskBatchUpdate]) -> list:
+    """
+    Statements applying partial updates, one UPDATE ... FROM (VALUES ...) RETURNING per
+    distinct set of changed fields. Ids missing from the returned rows were not found.
+    """
+    groups: Dict[tuple, list] = {}
+    for item in items:
+        updates = update_values(item)
+        fields = tuple(sorted(updates))
+        groups.setdefault(fields, []).append((item.id, *(updates[f] for f in fields)))
+
+    stmts = []
+    for fields, rows in groups.items():
+        if not fields:
+            # Nothing to change, just report whether the tasks exist
+            ids = [row[0] for row in rows]
+            stmts.append(select(TaskORM).where(TaskORM.owner_id == owner_id, TaskORM.id.in_(ids)))
+            continue
+        columns = [column("id", TaskORM.id.type)] + [column(f, getattr(TaskORM, f).type) for f in fields]
+        v = _values_table(dialect_name, columns, rows, name="v")
+        stmts.append(
+            update(TaskORM)
+            .where(TaskORM.id == v.c.id, TaskORM.owner_id == owner_id)
+            .values({f: v.c[f] for f in fields})
+            .returning(TaskORM)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+    return stmts
+
+
+def delete_tasks_stmt(owner_id: UUID, task_ids: List[UUID]) -> Delete:
+    return (
+        delete(TaskORM)
+        .where(TaskORM.owner_id == owner_id, TaskORM.id.in_(task_ids))
+        .returning(TaskORM.id, TaskORM.status)
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Session-local staging table for COPY-based imports (PostgreSQL only), dropped at commit.
+# Not part of Base.metadata, so it never appears in create_all() or migrations.
+task_import_staging = Table(
+    "task_import_staging",
+    MetaData(),
+    Column("id", PG_UUID(as_uuid=True)),
+    Column("title", String),
+    Column("description", String),
+    Column("status", String),
+    Column("due_date", DateTime(timezone=True)),
+    Column("created_at", DateTime(timezone=True)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+IMPORT_COLUMNS = [col.name for col in task_import_staging.columns]
+
+
+def supports_copy(dialect: Dialect) -> bool:
+    """
+    COPY FROM STDIN is only reachable through psycopg's copy API.
+    """
+    return dialect.name == "postgresql" and dialect.driver.startswith("psycopg")
+
+
+def import_rows(items: List[TaskCreate]) -> List[dict]:
+    """
+    Column values for imported tasks, keyed by IMPORT_COLUMNS.
+    - id and created_at are generated here, as the ORM defaults would, so both load paths agree
+    """
+    return [
+        {
+            "id": uuid4(),
+            "title": item.title,
+            "description": item.description,
+            "status": item.status.value,
+            "due_date": item.due_date,
+            "created_at": datetime.now(timezone.utc),
+        }
+        for item in items
+    ]
+
+
+def create_import_staging_stmt() -> CreateTable:
+    return CreateTable(task_import_staging)
+
+
+def copy_import_staging_sql() -> str:
+    return f"COPY {task_import_staging.name} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN"
+
+
+def insert_from_staging_stmt(owner_id: UUID) -> Insert:
+    """
+    Move staged rows into tasks for one owner (INSERT ... SELECT).
+    """
+    staged = task_import_staging.c
+    return insert(TaskORM).from_select(
+        ["owner_id", *IMPORT_COLUMNS],
+        select(literal(owner_id, type_=TaskORM.owner_id.type), *(staged[name] for name in IMPORT_COLUMNS)),
+    )
+
+
+def clear_import_staging_stmt() -> Delete:
+    return delete(task_import_staging)
+
+
+def insert_import_rows_stmt(owner_id: UUID, rows: List[dict]) -> Insert:
+    """
+    One multi-row INSERT ... VALUES, the import path for backends without COPY.
+    """
+    return insert(TaskORM).values([{"owner_id": owner_id, **row} for row in rows])
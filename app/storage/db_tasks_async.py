@@ -0,0 +1,233 @@
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+from datetime import datetime
+import logging
+
+from app.models.task import TaskCreate, TaskUpdate, TaskBatchUpdate
+from app.db.models.task_orm import TaskORM
+from app.storage.db_tasks import (
+    list_tasks_query,
+    search_tasks_query,
+    get_task_query,
+    insert_task_stmt,
+    update_values,
+    update_task_stmt,
+    delete_task_stmt,
+    insert_tasks_stmt,
+    update_tasks_stmts,
+    delete_tasks_stmt,
+    bump_tasks_version_stmt,
+    task_statuses_query,
+    task_summary_query,
+    status_delta,
+    supports_copy,
+    import_rows,
+    create_import_staging_stmt,
+    copy_import_staging_sql,
+    insert_from_staging_stmt,
+    clear_import_staging_stmt,
+    insert_import_rows_stmt,
+    IMPORT_COLUMNS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Async executors for the statements built in app.storage.db_tasks. Only
+# maintenance scripts run those statements on the sync engine.
+
+
+async def list_tasks(db: AsyncSession, user_id: UUID, **filters) -> List[TaskORM]:
+    """
+    List a user's tasks (see list_tasks_query for filters, sorting and paging).
+    """
+    result = await db.execute(list_tasks_query(user_id, **filters))
+    return result.scalars().all()
+
+
+async def stream_tasks(db: AsyncSession, user_id: UUID, *, batch_size: int) -> AsyncIterator[Sequence[TaskORM]]:
+    """
+    Stream all of a user's tasks in (created_at, id) order, batch_size rows at a time.
+    - Rows come from a server-side cursor, so memory use does not grow with the task count
+    """
+    query = list_tasks_query(user_id).execution_options(yield_per=batch_size)
+    result = await db.stream(query)
+    async for partition in result.scalars().partitions():
+        yield partition
+
+
+async def search_tasks(db: AsyncSession, user_id: UUID, q: str, **paging) -> List[Tuple[TaskORM, float]]:
+    """
+    Search a user's tasks (see search_tasks_query), returning (task, rank) pairs.
+    """
+    query = search_tasks_query(db.get_bind().dialect.name, user_id, q, **paging)
+    return [(task, rank) for task, rank in await db.execute(query)]
+
+
+async def get_task_summary(db: AsyncSession, user_id: UUID) -> Optional[Tuple[int, int, int]]:
+    """
+    Return (pending, completed, overdue) task counts for a user, or None if the user does not exist.
+    """
+    row = (await db.execute(task_summary_query(user_id))).one_or_none()
+    return tuple(row) if row is not None else None
+
+
+async def create_task(
+    db: AsyncSession,
+    *,
+    owner_id: UUID,
+    title: str,
+    description: Optional[str],
+    status: str,
+    due_date: Optional[datetime]
+    ) -> TaskORM:
+    """
+    Create a new task.
+    - INSERT ... RETURNING the stored row
+    - Commit and return task
+    """
+    stmt = insert_task_stmt(
+        owner_id=owner_id,
+        title=title,
+        description=description,
+        status=status,
+        due_date=due_date
+        )
+    try:
+        task = (await db.execute(stmt)).scalar_one()
+        await db.execute(bump_tasks_version_stmt(owner_id, status_delta(added=[task.status])))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Integrity error")
+    return task
+
+
+async def get_task_by_id(db: AsyncSession, task_id: UUID, user_id: UUID) -> Optional[TaskORM]:
+    task = (await db.execute(get_task_query(task_id, user_id))).scalar_one_or_none()
+    if not task:
+        return None
+    return task
+
+
+async def update_task(db: AsyncSession, task_id: UUID, data: TaskUpdate, owner_id: UUID) -> Optional[TaskORM]:
+    """
+    Update an existing task.
+    - Owner-scoped UPDATE ... RETURNING the new row
+    - Return None if no row matched (missing or owned by another user)
+    """
+    updates = update_values(data)
+    if not updates:
+        # Nothing to change, behave like a read
+        return await get_task_by_id(db, task_id=task_id, user_id=owner_id)
+
+    previous = {}
+    if updates.get("status") is not None:
+        previous = dict((await db.execute(task_statuses_query(owner_id, [task_id]))).all())
+    task = (await db.execute(update_task_stmt(task_id, owner_id, updates))).scalar_one_or_none()
+    if not task:
+        await db.rollback()
+        return None
+    delta = status_delta(added=[task.status], removed=[previous[task.id]]) if previous else None
+    await db.execute(bump_tasks_version_stmt(owner_id, delta))
+    await db.commit()
+    return task
+
+
+async def delete_task(db: AsyncSession, task_id: UUID, user_id: UUID) -> bool:
+    """
+    Delete a task.
+    - Owner-scoped DELETE ... RETURNING status
+    - Return False if no row matched
+    """
+    deleted_status = (await db.execute(delete_task_stmt(task_id, user_id))).scalar_one_or_none()
+    if deleted_status is None:
+        await db.rollback()
+        return False
+    await db.execute(bump_tasks_version_stmt(user_id, status_delta(removed=[deleted_status])))
+    await db.commit()
+    return True
+
+
+async def apply_task_batch(
+    db: AsyncSession,
+    *,
+    owner_id: UUID,
+    creates: List[TaskCreate],
+    updates: List[TaskBatchUpdate],
+    deletes: List[UUID]
+    ) -> Tuple[List[TaskORM], Dict[UUID, TaskORM], Set[UUID]]:
+    """
+    Apply a batch of task mutations in one transaction.
+    - Creates, then updates, then deletes (one statement per kind)
+    - Return (created tasks in input order, updated tasks by id, deleted ids)
+    - Everything is rolled back if any statement fails
+    """
+    created: List[TaskORM] = []
+    updated: Dict[UUID, TaskORM] = {}
+    deleted: Dict[UUID, str] = {}
+    previous: Dict[UUID, str] = {}
+    try:
+        if creates:
+            stmt, rows = insert_tasks_stmt(owner_id, creates)
+            created = list(await db.scalars(stmt, rows))
+        status_changes = [item.id for item in updates if item.status is not None]
+        if status_changes:
+            previous = dict((await db.execute(task_statuses_query(owner_id, status_changes))).all())
+        for stmt in update_tasks_stmts(db.get_bind().dialect.name, owner_id, updates):
+            updated.update((task.id, task) for task in await db.scalars(stmt))
+        if deletes:
+            deleted = dict((await db.execute(delete_tasks_stmt(owner_id, deletes))).all())
+        if created or updated or deleted:
+            changed = [task_id for task_id in previous if task_id in updated]
+            delta = status_delta(
+                added=[task.status for task in created] + [updated[task_id].status for task_id in changed],
+                removed=[previous[task_id] for task_id in changed] + list(deleted.values()),
+            )
+            await db.execute(bump_tasks_version_stmt(owner_id, delta))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Integrity error")
+    return created, updated, set(deleted)
+
+
+async def _copy_rows(db: AsyncSession, rows: List[dict]) -> None:
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    async with raw_connection.driver_connection.cursor() as cursor:
+        async with cursor.copy(copy_import_staging_sql()) as copy:
+            for row in rows:
+                await copy.write_row(tuple(row[name] for name in IMPORT_COLUMNS))
+
+
+async def import_tasks(db: AsyncSession, *, owner_id: UUID, chunks: AsyncIterator[List[TaskCreate]]) -> int:
+    """
+    Bulk-load validated tasks in a single transaction.
+    - PostgreSQL (psycopg): COPY each chunk into a temporary staging table, then INSERT ... SELECT into tasks
+    - Other backends: one multi-row INSERT per chunk
+    - Chunks are consumed as they arrive, so the upload is never held in memory whole
+    - Return the number of imported tasks
+    """
+    use_copy = supports_copy(db.get_bind().dialect)
+    imported = status_delta()
+    try:
+        if use_copy:
+            await db.execute(create_import_staging_stmt())
+        async for items in chunks:
+            rows = import_rows(items)
+            if use_copy:
+                await _copy_rows(db, rows)
+                await db.execute(insert_from_staging_stmt(owner_id))
+                await db.execute(clear_import_staging_stmt())
+            else:
+                await db.execute(insert_import_rows_stmt(owner_id, rows))
+            imported.update(row["status"] for row in rows)
+        if imported:
+            await db.execute(bump_tasks_version_stmt(owner_id, imported))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Integrity error")
+    return imported.total()
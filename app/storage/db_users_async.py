@@ -0,0 +1,64 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from uuid import UUID
+import logging
+
+from app.db.models.user_orm import UserORM
+
+
+logger = logging.getLogger(__name__)
+
+
+async def create_user(db: AsyncSession, *, email: str, password_hash: str) -> UserORM:
+    user = UserORM(
+        email=email,
+        password_hash=password_hash
+    )
+
+    db.add(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("Email already in use")
+
+    await db.refresh(user)
+    return user
+
+
+async def get_user_by_id(db: AsyncSession, user_id: UUID) -> UserORM | None:
+    return await db.get(UserORM, user_id)
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> UserORM | None:
+    user_email = email.strip().lower()
+    result = await db.execute(select(UserORM).where(UserORM.email == user_email).limit(1))
+    return result.scalar_one_or_none()
+
+
+async def get_tasks_version(db: AsyncSession, user_id: UUID) -> int | None:
+    """
+    Current tasks_version for a user (primary key lookup, no task rows touched).
+    """
+    result = await db.execute(select(UserORM.tasks_version).where(UserORM.id == user_id))
+    return result.scalar_one_or_none()
+
+
+async def update_password_hash(db: AsyncSession, user: UserORM, password_hash: str) -> bool:
+    """
+    Replace a user's password hash if it is still the one that was verified, then commit.
+    - Return False (nothing written) if the password changed concurrently
+    """
+    result = await db.execute(
+        update(UserORM)
+        .where(UserORM.id == user.id, UserORM.password_hash == user.password_hash)
+        .values(password_hash=password_hash)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount != 1:
+        return False
+    set_committed_value(user, "password_hash", password_hash)
+    return True
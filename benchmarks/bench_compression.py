@@ -0,0 +1,91 @@
+"""
+Measure response compression cost and savings per coding and level.
+
+Serialises a task list the way the API does (TaskPublic models through
+FastAPI's JSONResponse; NDJSON for the export) and compresses it with
+the encoders CompressionMiddleware uses: gzip at every level, plus br
+and zstd when the optional brotli / zstandard packages are installed.
+Reports the best-of-N compression time, output size and throughput, to
+pick COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY /
+COMPRESSION_ZSTD_LEVEL.
+
+Usage:
+    python benchmarks/bench_compression.py [--tasks 5000] [--repeat 5]
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.middleware.compression import DEFAULT_LEVELS, ENCODERS
+from app.models.task import TaskPublic, TaskStatus
+
+LEVELS = {"gzip": range(1, 10), "br": range(0, 12), "zstd": (1, 3, 6, 9, 19)}
+
+
+def make_tasks(count: int) -> list[TaskPublic]:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    statuses = list(TaskStatus)
+    return [
+        TaskPublic(
+            id=uuid.uuid4(),
+            title=f"Task {i}: follow up on ticket #{1000 + i}",
+            description=f"Check the status of item {i} and update the owner." if i % 3 else None,
+            status=statuses[i % len(statuses)],
+            due_date=now + timedelta(days=i % 30) if i % 2 else None,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def payloads(tasks: list[TaskPublic]) -> dict[str, bytes]:
+    encoded = jsonable_encoder(tasks)
+    return {
+        "json list": JSONResponse(encoded).body,
+        "ndjson export": "".join(json.dumps(task) + "\n" for task in encoded).encode(),
+    }
+
+
+def best_time(encoding: str, level: int, body: bytes, repeat: int) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoder = ENCODERS[encoding](level)
+        compressed = encoder.compress(body) + encoder.finish()
+        best = min(best, time.perf_counter() - start)
+        size = len(compressed)
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"codings available: {', '.join(ENCODERS)}")
+    for name, body in payloads(make_tasks(args.tasks)).items():
+        print(f"\n{name}: {args.tasks} tasks, {len(body) / 1024:.1f} KB")
+        print(f"{'coding':<8}{'level':>6}{'ms':>10}{'KB':>10}{'ratio':>8}{'MB/s':>9}")
+        for encoding in ENCODERS:
+            for level in LEVELS[encoding]:
+                seconds, size = best_time(encoding, level, body, args.repeat)
+                marker = "  (default)" if level == DEFAULT_LEVELS[encoding] else ""
+                print(
+                    f"{encoding:<8}{level:>6}{seconds * 1000:>10.2f}{size / 1024:>10.1f}"
+                    f"{len(body) / size:>8.1f}{len(body) / seconds / 1e6:>9.0f}{marker}"
+                )
+
+
+if __name__ == "__main__":
+    main()
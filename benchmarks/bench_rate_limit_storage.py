@@ -0,0 +1,97 @@
+"""
+Measure the per-check cost of the rate limit storages.
+
+Times SlidingWindowCounterRateLimiter.hit (what slowapi calls for each
+limit on each request) and the bare storage call, for memory:// and
+shm:// (app.core.rate_limit_storage), over a rotating set of keys. With
+--processes N, N processes hit the same shm:// table at once to show
+lock contention. With --redis-uri, limits' redis:// storage is timed too
+against that server (its rate limit keys are deleted afterwards); a check
+there costs one network round trip.
+
+Usage:
+    python benchmarks/bench_rate_limit_storage.py [--checks 200000] [--keys 1000] [--processes 1]
+        [--redis-uri redis://localhost:6379/0]
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+import app.core.rate_limit_storage  # noqa: F401  registers shm://
+
+LIMIT = parse("1000000000/minute")
+
+
+def time_checks(uri: str, checks: int, keys: int) -> tuple[float, float]:
+    storage = storage_from_string(uri)
+    limiter = SlidingWindowCounterRateLimiter(storage)
+    identifiers = [f"user:{i}" for i in range(keys)]
+    raw_keys = [LIMIT.key_for(identifier) for identifier in identifiers]
+
+    start = time.perf_counter()
+    for i in range(checks):
+        limiter.hit(LIMIT, identifiers[i % keys])
+    strategy_us = (time.perf_counter() - start) / checks * 1e6
+
+    start = time.perf_counter()
+    for i in range(checks):
+        storage.acquire_sliding_window_entry(raw_keys[i % keys], LIMIT.amount, LIMIT.get_expiry())
+    storage_us = (time.perf_counter() - start) / checks * 1e6
+    return strategy_us, storage_us
+
+
+def _worker(uri: str, checks: int, keys: int, results) -> None:
+    results.put(time_checks(uri, checks, keys))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--checks", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--redis-uri", default="", help="Also time redis:// against this server")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        shm_uri = f"shm://{Path(tmpdir) / 'rate-limit'}"
+        print(f"{'storage':<12}{'processes':>10}{'hit() us':>12}{'storage us':>12}")
+        strategy_us, storage_us = time_checks("memory://", args.checks, args.keys)
+        print(f"{'memory://':<12}{1:>10}{strategy_us:>12.2f}{storage_us:>12.2f}")
+
+        if args.processes <= 1:
+            strategy_us, storage_us = time_checks(shm_uri, args.checks, args.keys)
+        else:
+            context = multiprocessing.get_context("fork")
+            results = context.Queue()
+            workers = [
+                context.Process(target=_worker, args=(shm_uri, args.checks, args.keys, results))
+                for _ in range(args.processes)
+            ]
+            for worker in workers:
+                worker.start()
+            timings = [results.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            strategy_us = sum(t[0] for t in timings) / len(timings)
+            storage_us = sum(t[1] for t in timings) / len(timings)
+        print(f"{'shm://':<12}{args.processes:>10}{strategy_us:>12.2f}{storage_us:>12.2f}")
+
+    if args.redis_uri:
+        # Round trips are far slower than shm://, so fewer checks give a stable figure
+        checks = min(args.checks, 20_000)
+        strategy_us, storage_us = time_checks(args.redis_uri, checks, args.keys)
+        print(f"{'redis://':<12}{1:>10}{strategy_us:>12.2f}{storage_us:>12.2f}")
+        storage_from_string(args.redis_uri).reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Delete refresh tokens that can no longer be exchanged.
+
+Rotation leaves one used row behind per refresh, and every login starts a new
+family, so the table only grows. Tokens are kept for --keep-days after they
+expire or are revoked, which leaves reuse detection working for stolen tokens
+presented shortly after. Deletes run in batches, one short transaction each.
+
+Usage:
+    python scripts/purge_refresh_tokens.py [--keep-days 7] [--batch-size 5000]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, or_, select
+
+from app.db.models.refresh_token_orm import RefreshTokenORM
+from app.db.session import SessionLocal
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep-days", type=int, default=7)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.keep_days)
+    # Used tokens are kept until they expire like live ones: reuse detection needs them
+    purgeable = or_(RefreshTokenORM.expires_at < cutoff, RefreshTokenORM.revoked_at < cutoff)
+    purged = 0
+    with SessionLocal() as db:
+        while True:
+            batch = select(RefreshTokenORM.id).where(purgeable).limit(args.batch_size)
+            result = db.execute(delete(RefreshTokenORM).where(RefreshTokenORM.id.in_(batch.scalar_subquery())))
+            db.commit()
+            purged += result.rowcount
+            if result.rowcount < args.batch_size:
+                break
+
+    print(f"Purged {purged} refresh tokens.")
+
+
+if __name__ == "__main__":
+    main()
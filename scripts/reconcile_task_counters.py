@@ -0,0 +1,51 @@
+"""
+Recompute users' stored task counters (pending_tasks, completed_tasks) from tasks.
+
+Counters are maintained by every task write, so this only finds drift caused by
+writes that bypass the app (manual SQL, restores). Users are processed in pages,
+one short transaction each, so the job can run against a live database.
+
+Usage:
+    python scripts/reconcile_task_counters.py [--batch-size 1000]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select
+
+from app.db.models.user_orm import UserORM
+from app.db.session import SessionLocal
+from app.storage.db_tasks import reconcile_task_counters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    checked = 0
+    drifted = 0
+    last_id = None
+    with SessionLocal() as db:
+        while True:
+            query = select(UserORM.id).order_by(UserORM.id).limit(args.batch_size)
+            if last_id is not None:
+                query = query.where(UserORM.id > last_id)
+            user_ids = list(db.scalars(query))
+            if not user_ids:
+                break
+            fixed = reconcile_task_counters(db, user_ids)
+            for user_id in fixed:
+                print(f"Reconciled task counters for user_id={user_id}")
+            checked += len(user_ids)
+            drifted += len(fixed)
+            last_id = user_ids[-1]
+
+    print(f"Checked {checked} users, {drifted} had drifted.")
+
+
+if __name__ == "__main__":
+    main()
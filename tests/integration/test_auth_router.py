@@ -1,3 +1,6 @@
+import pytest
+
+
 class TestRegisterEndpoint:
     def test_register_returns_201_with_public_user(self, client):
         resp = client.post("/api/auth/register", json={"email": "new@example.com", "password": "password123"})
@@ -26,6 +29,23 @@ class TestLoginEndpoint:
         assert body["token_type"] == "bearer"
         assert body["access_token"]
 
+    def test_login_upgrades_password_hash_cost(self, client, db_session, make_user, monkeypatch):
+        from app.auth import security
+
+        user = make_user(email="user@example.com", password="correct-password")
+        old_hash = user.password_hash
+        monkeypatch.setattr(security, "_rounds", security.hash_rounds(old_hash) + 1)
+
+        resp = client.post("/api/auth/login", json={"email": "user@example.com", "password": "correct-password"})
+        assert resp.status_code == 200
+        db_session.expire_all()
+        new_hash = db_session.get(type(user), user.id).password_hash
+        assert new_hash != old_hash
+        assert security.hash_rounds(new_hash) == security._rounds
+        # The new hash still verifies the same password
+        resp = client.post("/api/auth/login", json={"email": "user@example.com", "password": "correct-password"})
+        assert resp.status_code == 200
+
     def test_login_wrong_password_returns_401(self, client, make_user):
         make_user(email="user@example.com", password="correct-password")
         resp = client.post("/api/auth/login", json={"email": "user@example.com", "password": "wrong-password"})
@@ -50,3 +70,138 @@ class TestMeEndpoint:
         resp = client.get("/api/auth/me", headers=auth_headers(user.id))
         assert resp.status_code == 200
         assert resp.json()["email"] == "user@example.com"
+
+
+class TestCurrentUserCache:
+    def test_repeat_requests_skip_user_lookup(self, client, make_user, auth_headers, fresh_user_cache):
+        user = make_user()
+        headers = auth_headers(user.id)
+        hits, misses = fresh_user_cache.hits, fresh_user_cache.misses
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        assert (fresh_user_cache.hits - hits, fresh_user_cache.misses - misses) == (1, 1)
+
+    def test_invalidated_user_is_looked_up_again(self, client, db_session, make_user, auth_headers, fresh_user_cache):
+        user = make_user()
+        headers = auth_headers(user.id)
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        db_session.delete(user)
+        db_session.commit()
+        fresh_user_cache.invalidate(user.id)     # What the users trigger's NOTIFY does in every worker
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    def test_unknown_users_are_not_cached(self, client, auth_headers, fresh_user_cache):
+        import uuid
+
+        headers = auth_headers(uuid.uuid4())
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+        assert fresh_user_cache.snapshot()["size"] == 0
+
+
+class TestTokenVerification:
+    def test_token_is_verified_once_per_request(self, client, make_user, auth_headers, monkeypatch):
+        from app.auth import jwt as jwt_module
+
+        calls = []
+        decode = jwt_module.decode_access_token
+        monkeypatch.setattr(jwt_module, "decode_access_token", lambda token: calls.append(token) or decode(token))
+        monkeypatch.setattr(jwt_module, "verified_tokens", jwt_module.VerifiedTokenCache(16))
+
+        headers = auth_headers(make_user().id)
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        assert len(calls) == 1
+        # The same token on a later request skips signature verification entirely
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        assert len(calls) == 1
+
+
+class TestPasswordHasherBackpressure:
+    @pytest.fixture()
+    def saturated_hasher(self, monkeypatch):
+        from app.auth.password_hasher import password_hasher
+
+        monkeypatch.setattr(password_hasher, "in_flight", password_hasher.workers + password_hasher.max_queue)
+        return password_hasher
+
+    def test_login_fails_fast_when_queue_is_full(self, client, make_user, saturated_hasher):
+        make_user(email="user@example.com", password="correct-password")
+        resp = client.post("/api/auth/login", json={"email": "user@example.com", "password": "correct-password"})
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "1"
+        assert resp.json()["error"] == "service_unavailable"
+
+    def test_register_fails_fast_when_queue_is_full(self, client, saturated_hasher):
+        resp = client.post("/api/auth/register", json={"email": "new@example.com", "password": "s3cret-pass"})
+        assert resp.status_code == 503
+
+
+class TestRefreshEndpoint:
+    @pytest.fixture()
+    def login(self, client, make_user):
+        make_user(email="user@example.com", password="correct-password")
+
+        def _login() -> dict:
+            resp = client.post("/api/auth/login", json={"email": "user@example.com", "password": "correct-password"})
+            assert resp.status_code == 200
+            return resp.json()
+
+        return _login
+
+    def refresh(self, client, refresh_token):
+        return client.post("/api/auth/refresh", json={"refresh_token": refresh_token})
+
+    def test_login_returns_refresh_token(self, login):
+        tokens = login()
+        assert tokens["refresh_token"]
+        assert tokens["expires_in"] > 0
+
+    def test_refresh_rotates_tokens_without_bcrypt(self, client, login):
+        from app.auth.password_hasher import password_hasher
+
+        tokens = login()
+        hashed = password_hasher.completed
+        resp = self.refresh(client, tokens["refresh_token"])
+        assert resp.status_code == 200
+        renewed = resp.json()
+        assert renewed["refresh_token"] != tokens["refresh_token"]
+        assert password_hasher.completed == hashed
+        me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {renewed['access_token']}"})
+        assert me.json()["email"] == "user@example.com"
+
+    def test_reuse_revokes_the_whole_family(self, client, login):
+        tokens = login()
+        renewed = self.refresh(client, tokens["refresh_token"]).json()
+
+        assert self.refresh(client, tokens["refresh_token"]).status_code == 401
+        # The token issued by the legitimate rotation is revoked too
+        assert self.refresh(client, renewed["refresh_token"]).status_code == 401
+
+    def test_reuse_leaves_other_sessions_alone(self, client, login):
+        first, second = login(), login()
+        self.refresh(client, first["refresh_token"])
+        self.refresh(client, first["refresh_token"])
+        assert self.refresh(client, second["refresh_token"]).status_code == 200
+
+    def test_expired_refresh_token_returns_401(self, client, db_session, login):
+        from datetime import datetime, timedelta, timezone
+
+        from app.db.models.refresh_token_orm import RefreshTokenORM
+
+        tokens = login()
+        db_session.query(RefreshTokenORM).update({"expires_at": datetime.now(timezone.utc) - timedelta(seconds=1)})
+        db_session.commit()
+        assert self.refresh(client, tokens["refresh_token"]).status_code == 401
+
+    def test_unknown_refresh_token_returns_401(self, client):
+        resp = self.refresh(client, "not-a-refresh-token")
+        assert resp.status_code == 401
+        assert resp.json()["error"] == "unauthorized"
+
+    def test_logout_revokes_session(self, client, login):
+        tokens = login()
+        renewed = self.refresh(client, tokens["refresh_token"]).json()
+        assert client.post("/api/auth/logout", json={"refresh_token": renewed["refresh_token"]}).status_code == 204
+        assert self.refresh(client, renewed["refresh_token"]).status_code == 401
+        # Unknown or already revoked tokens are accepted, so logout can always be retried
+        assert client.post("/api/auth/logout", json={"refresh_token": "unknown"}).status_code == 204
@@ -0,0 +1,10 @@
+class TestHealth:
+    def test_live(self, client):
+        resp = client.get("/api/health/live")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ok"}
+
+    def test_ready_checks_the_database(self, client):
+        resp = client.get("/api/health/ready")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ok"}
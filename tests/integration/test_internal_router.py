@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+
+from app.core.settings import get_settings
+
+
+@pytest.fixture()
+def settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ENV", "DEV")
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "")
+    return settings
+
+
+class TestPoolEndpoint:
+    def test_reports_instrumented_pools(self, client, settings):
+        resp = client.get("/api/internal/pool")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert isinstance(data["pid"], int)
+        primary = data["pools"]["primary"]
+        assert {"pool_size", "checked_out", "idle", "overflow", "timeouts", "invalidations"} <= primary.keys()
+        assert primary["checkout_wait_seconds"]["buckets"]["+Inf"] == primary["checkout_wait_seconds"]["count"]
+
+    def test_hidden_in_prod_without_token(self, client, settings, monkeypatch):
+        monkeypatch.setattr(settings, "ENV", "PROD")
+        assert client.get("/api/internal/pool").status_code == 404
+
+    def test_token_is_required_when_configured(self, client, settings, monkeypatch):
+        monkeypatch.setattr(settings, "ENV", "PROD")
+        monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "ops-token")
+        assert client.get("/api/internal/pool").status_code == 403
+        assert client.get("/api/internal/pool", headers={"X-Internal-Token": "wrong"}).status_code == 403
+        assert client.get("/api/internal/pool", headers={"X-Internal-Token": "ops-token"}).status_code == 200
+
+
+class TestQueryMetrics:
+    def test_request_log_reports_database_work(self, client, make_user, auth_headers, caplog):
+        user = make_user()
+        with caplog.at_level(logging.INFO, logger="request"):
+            resp = client.get("/api/tasks", headers=auth_headers(user.id))
+        assert resp.status_code == 200
+        line = next(record.getMessage() for record in caplog.records if record.name == "request")
+        assert "GET /api/tasks -> 200" in line
+        assert "db_queries=" in line and "db_queries=0 " not in line
+        assert "db_ms=" in line
+
+    def test_reports_statements_by_route(self, client, settings, make_user, auth_headers):
+        user = make_user()
+        client.get("/api/tasks/summary", headers=auth_headers(user.id))
+
+        queries = client.get("/api/internal/queries").json()["queries"]
+        summary = [row for row in queries if row["route"] == "GET /api/tasks/summary"]
+        assert summary
+        assert all(row["seconds"]["count"] >= 1 for row in summary)
+
+
+class TestUserCacheEndpoint:
+    def test_reports_cache_counters(self, client, settings, make_user, auth_headers):
+        user = make_user()
+        before = client.get("/api/internal/user-cache").json()["user_cache"]
+        client.get("/api/auth/me", headers=auth_headers(user.id))
+        client.get("/api/auth/me", headers=auth_headers(user.id))
+
+        stats = client.get("/api/internal/user-cache").json()["user_cache"]
+        assert (stats["hits"] - before["hits"], stats["misses"] - before["misses"]) == (1, 1)
+        assert stats["size"] == 1
+        assert 0 < stats["hit_ratio"] <= 1
+
+
+class TestMetricsEndpoint:
+    def test_prometheus_by_route_template(self, client, make_user, make_task, auth_headers, settings):
+        user = make_user()
+        task = make_task(user.id)
+        client.get(f"/api/tasks/{task.id}", headers=auth_headers(user.id))
+
+        resp = client.get("/api/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'http_requests_total{method="GET",route="/api/tasks/{task_id}",status="2xx"}' in resp.text
+        assert str(task.id) not in resp.text
+        assert "http_requests_in_flight 1" in resp.text    # this request
+
+    def test_hidden_in_prod_without_token(self, client, settings, monkeypatch):
+        monkeypatch.setattr(settings, "ENV", "PROD")
+        assert client.get("/api/metrics").status_code == 404
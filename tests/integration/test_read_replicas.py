@@ -0,0 +1,117 @@
+from contextlib import ExitStack
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models.user_orm import UserORM
+from app.db.routing import ReadRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture()
+def replica_path(tmp_path):
+    """Second SQLite file standing in for a replica that has not caught up on anything."""
+    path = tmp_path / "replica.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return path
+
+
+@pytest.fixture()
+def routed_client(db_session, db_path, replica_path, clock, monkeypatch):
+    """Factory: TestClient on the real get_async_db, routed between the test DB (primary) and a replica."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.db import session as db_session_module
+    from app.auth.user_cache import user_cache
+
+    # These tests observe routing through user lookups, so every lookup must reach a database
+    monkeypatch.setattr(user_cache, "max_size", 0)
+
+    with ExitStack() as stack:
+        def _routed_client(replica_url=f"sqlite+aiosqlite:///{replica_path}"):
+            primary_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+            replica_engine = create_async_engine(replica_url)
+            router = ReadRouter(
+                async_sessionmaker(bind=primary_engine, autoflush=False, expire_on_commit=False),
+                [async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)],
+                sticky_s=5,
+                retry_s=30,
+                clock=clock,
+            )
+            monkeypatch.setattr(db_session_module, "db_router", router)
+            test_client = stack.enter_context(TestClient(app))
+            # Callbacks run before the client closes, while its event loop is still up
+            stack.callback(test_client.portal.call, replica_engine.dispose)
+            stack.callback(test_client.portal.call, primary_engine.dispose)
+            return test_client, router
+
+        yield _routed_client
+
+
+def copy_user_to_replica(replica_path, user):
+    engine = create_engine(f"sqlite:///{replica_path}")
+    with Session(engine) as db:
+        db.add(UserORM(id=user.id, email=user.email, password_hash=user.password_hash))
+        db.commit()
+    engine.dispose()
+
+
+class TestReadRouting:
+    def test_reads_use_replica_once_read_your_writes_window_ends(
+        self, routed_client, replica_path, make_user, auth_headers, clock
+    ):
+        user = make_user()
+        copy_user_to_replica(replica_path, user)
+        client, _ = routed_client()
+        headers = auth_headers(user.id)
+
+        assert client.post("/api/tasks", json={"title": "fresh"}, headers=headers).status_code == 201
+        # Pinned to the primary right after the write
+        assert [t["title"] for t in client.get("/api/tasks", headers=headers).json()] == ["fresh"]
+
+        clock.now += 6
+        # The replica stand-in never received the write
+        assert client.get("/api/tasks", headers=headers).json() == []
+
+    def test_writes_always_use_primary(self, routed_client, make_user, auth_headers):
+        # User only exists on the primary, so authentication proves which database was used
+        user = make_user()
+        client, _ = routed_client()
+        resp = client.post("/api/tasks", json={"title": "t"}, headers=auth_headers(user.id))
+        assert resp.status_code == 201
+
+    def test_registration_pins_new_user_to_primary(self, routed_client, auth_headers, clock):
+        client, _ = routed_client()
+        user = client.post("/api/auth/register", json={"email": "new@example.com", "password": "s3cret-pass"}).json()
+        headers = auth_headers(user["id"])
+
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        clock.now += 6
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    def test_unhealthy_replica_falls_back_to_primary(self, routed_client, tmp_path, make_user, make_task, auth_headers):
+        user = make_user()
+        make_task(user.id, title="on primary")
+        client, router = routed_client(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+
+        resp = client.get("/api/tasks", headers=auth_headers(user.id))
+        assert resp.status_code == 200
+        assert [t["title"] for t in resp.json()] == ["on primary"]
+        assert router.read_candidates(None) == [router.primary]
@@ -1,5 +1,11 @@
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
+from app.core.settings import get_settings
+
 
 @pytest.fixture()
 def owner(make_user):
@@ -31,6 +37,451 @@ class TestListTasks:
         titles = [t["title"] for t in resp.json()]
         assert titles == ["mine"]
 
+    def test_returns_tasks_oldest_first(self, client, headers):
+        for title in ("first", "second", "third"):
+            client.post("/api/tasks", json={"title": title}, headers=headers)
+
+        resp = client.get("/api/tasks", headers=headers)
+        assert [t["title"] for t in resp.json()] == ["first", "second", "third"]
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_pages_follow_next_cursor(self, client, headers):
+        for i in range(5):
+            client.post("/api/tasks", json={"title": f"task {i}"}, headers=headers)
+
+        titles = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            resp = client.get("/api/tasks", params=params, headers=headers)
+            assert resp.status_code == 200
+            assert len(resp.json()) <= 2
+            titles.extend(t["title"] for t in resp.json())
+            pages += 1
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert pages == 3
+        assert titles == [f"task {i}" for i in range(5)]
+
+    def test_without_limit_uses_default_page_size(self, client, headers, owner, make_task):
+        page_size = get_settings().TASKS_PAGE_SIZE_DEFAULT
+        for i in range(page_size + 1):
+            make_task(owner.id, title=f"task {i}")
+
+        resp = client.get("/api/tasks", headers=headers)
+        assert resp.status_code == 200
+        assert len(resp.json()) == page_size
+        cursor = resp.headers["X-Next-Cursor"]
+
+        resp = client.get("/api/tasks", params={"cursor": cursor}, headers=headers)
+        assert len(resp.json()) == 1
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_invalid_cursor_returns_400(self, client, headers):
+        resp = client.get("/api/tasks", params={"cursor": "not-a-cursor"}, headers=headers)
+        assert resp.status_code == 400
+
+    @pytest.mark.parametrize("parts", [
+        ["created_at", "d", "2026-01-01T00:00:00+00:00", 1],
+        ["created_at", "s", "abc", "00000000-0000-0000-0000-000000000001"],
+        ["created_at", "f", 1.5, "00000000-0000-0000-0000-000000000001"],
+    ])
+    def test_tampered_cursor_returns_400(self, client, headers, parts):
+        cursor = base64.urlsafe_b64encode(json.dumps(parts).encode()).decode()
+        resp = client.get("/api/tasks", params={"cursor": cursor}, headers=headers)
+        assert resp.status_code == 400
+
+    def test_limit_above_max_returns_422(self, client, headers):
+        resp = client.get("/api/tasks", params={"limit": 100000}, headers=headers)
+        assert resp.status_code == 422
+
+    def test_openapi_still_documents_task_list(self, client):
+        paths = client.get("/openapi.json").json()["paths"]
+        for path in ("/api/tasks", "/api/tasks/search"):
+            schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+            assert schema["type"] == "array"
+            assert schema["items"] == {"$ref": "#/components/schemas/TaskPublic"}
+
+
+class TestListTasksFilteringAndSorting:
+    @pytest.fixture()
+    def tasks(self, owner, make_task):
+        now = datetime.now(timezone.utc)
+        make_task(owner.id, title="b overdue", due_date=now - timedelta(days=2))
+        make_task(owner.id, title="a soon", due_date=now + timedelta(days=1))
+        make_task(owner.id, title="d later", due_date=now + timedelta(days=10))
+        make_task(owner.id, title="c done", status="completed", due_date=now - timedelta(days=1))
+        make_task(owner.id, title="e undated")
+
+    def _titles(self, client, headers, **params):
+        resp = client.get("/api/tasks", params=params, headers=headers)
+        assert resp.status_code == 200
+        return [t["title"] for t in resp.json()]
+
+    def test_filter_by_status(self, client, headers, tasks):
+        assert self._titles(client, headers, status="completed") == ["c done"]
+
+    def test_overdue_only_returns_pending_past_due(self, client, headers, tasks):
+        assert self._titles(client, headers, overdue="true") == ["b overdue"]
+
+    def test_due_date_range(self, client, headers, tasks):
+        now = datetime.now(timezone.utc)
+        titles = self._titles(
+            client,
+            headers,
+            due_after=now.isoformat(),
+            due_before=(now + timedelta(days=5)).isoformat(),
+        )
+        assert titles == ["a soon"]
+
+    def test_sort_by_title_descending(self, client, headers, tasks):
+        assert self._titles(client, headers, sort="-title") == ["e undated", "d later", "c done", "b overdue", "a soon"]
+
+    def test_sort_by_due_date_puts_undated_last(self, client, headers, tasks):
+        titles = self._titles(client, headers, sort="due_date")
+        assert titles == ["b overdue", "c done", "a soon", "d later", "e undated"]
+
+    @pytest.mark.parametrize("sort", ["due_date", "-due_date", "updated_at", "-title"])
+    def test_pagination_matches_unpaginated_order(self, client, headers, tasks, sort):
+        expected = self._titles(client, headers, sort=sort)
+
+        titles = []
+        params = {"sort": sort, "limit": 2}
+        while True:
+            resp = client.get("/api/tasks", params=params, headers=headers)
+            titles.extend(t["title"] for t in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            params["cursor"] = cursor
+
+        assert titles == expected
+
+    def test_cursor_from_other_sort_returns_400(self, client, headers, tasks):
+        resp = client.get("/api/tasks", params={"sort": "title", "limit": 1}, headers=headers)
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = client.get("/api/tasks", params={"sort": "due_date", "cursor": cursor}, headers=headers)
+        assert resp.status_code == 400
+
+    def test_unknown_sort_returns_422(self, client, headers):
+        resp = client.get("/api/tasks", params={"sort": "owner_id"}, headers=headers)
+        assert resp.status_code == 422
+
+
+class TestConditionalGet:
+    def test_list_returns_etag(self, client, headers):
+        resp = client.get("/api/tasks", headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["ETag"]
+        assert resp.headers["Cache-Control"] == "private, no-cache"
+
+    def test_list_matching_etag_returns_304(self, client, headers):
+        client.post("/api/tasks", json={"title": "Task"}, headers=headers)
+        etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+
+        resp = client.get("/api/tasks", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers.get_list("ETag") == [etag]
+
+    def test_compressed_list_revalidates_with_weak_etag(self, client, headers):
+        client.post("/api/tasks:batch", json={"create": [{"title": f"task {i}"} for i in range(30)]}, headers=headers)
+        resp = client.get("/api/tasks", headers={**headers, "Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert resp.headers["ETag"].startswith('W/"')
+        assert len(resp.json()) == 30
+
+        resp = client.get("/api/tasks", headers={**headers, "If-None-Match": resp.headers["ETag"]})
+        assert resp.status_code == 304
+
+    def test_list_etag_changes_after_write(self, client, headers):
+        created = client.post("/api/tasks", json={"title": "Task"}, headers=headers).json()
+        etags = [client.get("/api/tasks", headers=headers).headers["ETag"]]
+
+        client.patch(f"/api/tasks/{created['id']}", json={"title": "Renamed"}, headers=headers)
+        etags.append(client.get("/api/tasks", headers=headers).headers["ETag"])
+        client.post("/api/tasks:batch", json={"create": [{"title": "More"}]}, headers=headers)
+        etags.append(client.get("/api/tasks", headers=headers).headers["ETag"])
+        client.delete(f"/api/tasks/{created['id']}", headers=headers)
+        etags.append(client.get("/api/tasks", headers=headers).headers["ETag"])
+
+        assert len(set(etags)) == 4
+        resp = client.get("/api/tasks", headers={**headers, "If-None-Match": etags[0]})
+        assert resp.status_code == 200
+
+    def test_list_etag_depends_on_query(self, client, headers):
+        default = client.get("/api/tasks", headers=headers).headers["ETag"]
+        filtered = client.get("/api/tasks", params={"status": "completed"}, headers=headers).headers["ETag"]
+        assert default != filtered
+
+    def test_list_etag_is_per_user(self, client, headers, make_user, auth_headers):
+        etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+        other = make_user(email="other6@example.com")
+        resp = client.get("/api/tasks", headers={**auth_headers(other.id), "If-None-Match": etag})
+        assert resp.status_code == 200
+
+    def test_overdue_list_is_not_cached(self, client, headers):
+        resp = client.get("/api/tasks", params={"overdue": "true"}, headers=headers)
+        assert "ETag" not in resp.headers
+
+    def test_detail_matching_etag_returns_304(self, client, headers):
+        created = client.post("/api/tasks", json={"title": "Task"}, headers=headers).json()
+        first = client.get(f"/api/tasks/{created['id']}", headers=headers)
+        etag = first.headers["ETag"]
+
+        resp = client.get(f"/api/tasks/{created['id']}", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+
+        client.patch(f"/api/tasks/{created['id']}", json={"status": "completed"}, headers=headers)
+        resp = client.get(f"/api/tasks/{created['id']}", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "completed"
+
+
+class TestTaskSummary:
+    def test_requires_auth(self, client):
+        resp = client.get("/api/tasks/summary")
+        assert resp.status_code == 401
+
+    def test_empty_summary(self, client, headers):
+        resp = client.get("/api/tasks/summary", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == {"pending": 0, "completed": 0, "overdue": 0, "total": 0}
+
+    def test_tracks_every_write_path(self, client, headers):
+        first = client.post("/api/tasks", json={"title": "one"}, headers=headers).json()
+        client.post("/api/tasks:batch", json={"create": [{"title": "two"}, {"title": "three", "status": "completed"}]}, headers=headers)
+        client.post("/api/tasks/import", content=b'{"title": "four"}\n{"title": "five", "status": "completed"}\n', headers=headers)
+        client.patch(f"/api/tasks/{first['id']}", json={"status": "completed"}, headers=headers)
+
+        summary = client.get("/api/tasks/summary", headers=headers).json()
+        assert summary == {"pending": 2, "completed": 3, "overdue": 0, "total": 5}
+
+        client.delete(f"/api/tasks/{first['id']}", headers=headers)
+        summary = client.get("/api/tasks/summary", headers=headers).json()
+        assert (summary["completed"], summary["total"]) == (2, 4)
+
+        tasks = client.get("/api/tasks", headers=headers).json()
+        assert summary["pending"] == sum(t["status"] == "pending" for t in tasks)
+
+    def test_counts_overdue_pending_tasks(self, client, headers, owner, make_task):
+        past = datetime.now(timezone.utc) - timedelta(days=1)
+        make_task(owner.id, title="late", due_date=past)
+        make_task(owner.id, title="late but done", status="completed", due_date=past)
+
+        resp = client.get("/api/tasks/summary", headers=headers)
+        assert resp.json()["overdue"] == 1
+
+    def test_only_counts_own_tasks(self, client, headers, make_user, auth_headers):
+        other = make_user(email="other10@example.com")
+        client.post("/api/tasks", json={"title": "theirs"}, headers=auth_headers(other.id))
+
+        resp = client.get("/api/tasks/summary", headers=headers)
+        assert resp.json()["total"] == 0
+
+
+class TestSearchTasks:
+    def test_requires_auth(self, client):
+        resp = client.get("/api/tasks/search", params={"q": "x"})
+        assert resp.status_code == 401
+
+    def test_matches_title_and_description_title_hits_first(self, client, headers):
+        client.post("/api/tasks", json={"title": "Call plumber", "description": "about the invoice"}, headers=headers)
+        client.post("/api/tasks", json={"title": "Pay Invoice"}, headers=headers)
+        client.post("/api/tasks", json={"title": "Unrelated"}, headers=headers)
+
+        resp = client.get("/api/tasks/search", params={"q": "invoice"}, headers=headers)
+        assert resp.status_code == 200
+        assert [t["title"] for t in resp.json()] == ["Pay Invoice", "Call plumber"]
+
+    def test_only_searches_own_tasks(self, client, headers, make_user, auth_headers):
+        client.post("/api/tasks", json={"title": "report mine"}, headers=headers)
+        other = make_user(email="other9@example.com")
+        client.post("/api/tasks", json={"title": "report theirs"}, headers=auth_headers(other.id))
+
+        resp = client.get("/api/tasks/search", params={"q": "report"}, headers=headers)
+        assert [t["title"] for t in resp.json()] == ["report mine"]
+
+    def test_like_wildcards_are_literal(self, client, headers):
+        client.post("/api/tasks", json={"title": "Raise 50% deposit"}, headers=headers)
+        client.post("/api/tasks", json={"title": "Raise 500 deposit"}, headers=headers)
+
+        resp = client.get("/api/tasks/search", params={"q": "50%"}, headers=headers)
+        assert [t["title"] for t in resp.json()] == ["Raise 50% deposit"]
+
+    def test_paginates_with_cursor(self, client, headers):
+        client.post("/api/tasks:batch", json={"create": [{"title": f"match {i}"} for i in range(5)]}, headers=headers)
+        client.post("/api/tasks", json={"title": "other", "description": "match in description"}, headers=headers)
+
+        seen = []
+        params = {"q": "match", "limit": 2}
+        while True:
+            resp = client.get("/api/tasks/search", params=params, headers=headers)
+            seen.extend(t["title"] for t in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params["cursor"] = cursor
+        assert len(seen) == 6 and len(set(seen)) == 6
+        assert seen[-1] == "other"
+
+    def test_conditional_get(self, client, headers):
+        client.post("/api/tasks", json={"title": "findme"}, headers=headers)
+        first = client.get("/api/tasks/search", params={"q": "findme"}, headers=headers)
+        resp = client.get("/api/tasks/search", params={"q": "findme"}, headers={**headers, "If-None-Match": first.headers["ETag"]})
+        assert resp.status_code == 304
+
+    def test_blank_query_returns_422(self, client, headers):
+        assert client.get("/api/tasks/search", params={"q": "  "}, headers=headers).status_code == 422
+        assert client.get("/api/tasks/search", headers=headers).status_code == 422
+
+    def test_list_cursor_is_rejected(self, client, headers):
+        for i in range(2):
+            client.post("/api/tasks", json={"title": f"t{i}"}, headers=headers)
+        list_cursor = client.get("/api/tasks", params={"limit": 1}, headers=headers).headers["X-Next-Cursor"]
+        resp = client.get("/api/tasks/search", params={"q": "t", "cursor": list_cursor}, headers=headers)
+        assert resp.status_code == 400
+
+
+class TestExportTasks:
+    def test_requires_auth(self, client):
+        resp = client.get("/api/tasks/export")
+        assert resp.status_code == 401
+
+    def test_ndjson_export_streams_all_tasks(self, client, headers, make_user, auth_headers):
+        import json
+
+        for i in range(5):
+            client.post("/api/tasks", json={"title": f"task {i}", "description": "notes"}, headers=headers)
+        other = make_user(email="other7@example.com")
+        client.post("/api/tasks", json={"title": "theirs"}, headers=auth_headers(other.id))
+
+        resp = client.get("/api/tasks/export", headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        assert 'filename="tasks.ndjson"' in resp.headers["content-disposition"]
+
+        rows = [json.loads(line) for line in resp.text.splitlines()]
+        assert [r["title"] for r in rows] == [f"task {i}" for i in range(5)]
+        listed = client.get("/api/tasks", headers=headers).json()
+        assert rows == listed
+
+    def test_csv_export_has_task_public_columns(self, client, headers):
+        import csv
+        import io
+
+        client.post("/api/tasks", json={"title": "Task, with comma", "description": "line1\nline2"}, headers=headers)
+
+        resp = client.get("/api/tasks/export", params={"format": "csv"}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(resp.text)))
+        assert list(rows[0].keys()) == ["id", "title", "description", "status", "due_date", "created_at", "updated_at"]
+        assert rows[0]["title"] == "Task, with comma"
+        assert rows[0]["description"] == "line1\nline2"
+
+    def test_export_spans_multiple_batches(self, client, headers, monkeypatch):
+        import json
+        from app.routers import tasks as tasks_router
+
+        monkeypatch.setattr(tasks_router.settings, "TASKS_EXPORT_BATCH_SIZE", 2)
+        client.post("/api/tasks:batch", json={"create": [{"title": f"t{i}"} for i in range(5)]}, headers=headers)
+
+        resp = client.get("/api/tasks/export", headers=headers)
+        assert [json.loads(line)["title"] for line in resp.text.splitlines()] == [f"t{i}" for i in range(5)]
+
+    def test_export_is_compressed_when_accepted(self, client, headers):
+        client.post("/api/tasks:batch", json={"create": [{"title": f"t{i}"} for i in range(50)]}, headers=headers)
+
+        resp = client.get("/api/tasks/export", headers={**headers, "Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert len(resp.text.splitlines()) == 50
+
+    def test_empty_csv_export_has_header_only(self, client, headers):
+        resp = client.get("/api/tasks/export", params={"format": "csv"}, headers=headers)
+        assert resp.text == "id,title,description,status,due_date,created_at,updated_at\n"
+
+    def test_unknown_format_returns_422(self, client, headers):
+        resp = client.get("/api/tasks/export", params={"format": "xml"}, headers=headers)
+        assert resp.status_code == 422
+
+
+class TestImportTasks:
+    def test_requires_auth(self, client):
+        resp = client.post("/api/tasks/import", content=b'{"title": "t"}\n')
+        assert resp.status_code == 401
+
+    def test_ndjson_import_reports_bad_lines(self, client, headers):
+        body = b'{"title": "first"}\n{"title": ""}\n{"title": "second", "status": "completed"}\nnope\n'
+        resp = client.post("/api/tasks/import", content=body, headers=headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["imported"] == 2
+        assert data["failed"] == 2
+        assert [e["line"] for e in data["errors"]] == [2, 4]
+
+        tasks = client.get("/api/tasks", headers=headers).json()
+        assert [(t["title"], t["status"]) for t in tasks] == [("first", "pending"), ("second", "completed")]
+
+    def test_csv_import(self, client, headers):
+        due = (datetime.now(timezone.utc) + timedelta(days=3)).isoformat()
+        body = f"title,description,due_date\nPlan,\"a, b\",{due}\nShip,,\n".encode("utf-8")
+        resp = client.post("/api/tasks/import", params={"format": "csv"}, content=body, headers=headers)
+        assert resp.json() == {"imported": 2, "failed": 0, "errors": []}
+
+        tasks = client.get("/api/tasks", headers=headers).json()
+        assert [(t["title"], t["description"], t["due_date"] is not None) for t in tasks] == [
+            ("Plan", "a, b", True),
+            ("Ship", None, False),
+        ]
+
+    def test_export_round_trips_through_import(self, client, headers, make_user, auth_headers):
+        client.post("/api/tasks:batch", json={"create": [{"title": f"t{i}"} for i in range(3)]}, headers=headers)
+        exported = client.get("/api/tasks/export", params={"format": "csv"}, headers=headers).content
+
+        other_headers = auth_headers(make_user(email="importer@example.com").id)
+        resp = client.post("/api/tasks/import", params={"format": "csv"}, content=exported, headers=other_headers)
+        assert resp.json()["imported"] == 3
+
+        mine = client.get("/api/tasks", headers=headers).json()
+        theirs = client.get("/api/tasks", headers=other_headers).json()
+        assert [t["title"] for t in theirs] == [t["title"] for t in mine]
+        assert {t["id"] for t in theirs}.isdisjoint(t["id"] for t in mine)
+
+    def test_import_spans_multiple_chunks(self, client, headers, monkeypatch):
+        from app.routers import tasks as tasks_router
+
+        monkeypatch.setattr(tasks_router.settings, "TASKS_IMPORT_CHUNK_SIZE", 2)
+        body = b"".join(b'{"title": "t%d"}\n' % i for i in range(5))
+        resp = client.post("/api/tasks/import", content=body, headers=headers)
+        assert resp.json()["imported"] == 5
+        assert [t["title"] for t in client.get("/api/tasks", headers=headers).json()] == [f"t{i}" for i in range(5)]
+
+    def test_import_invalidates_list_etag(self, client, headers):
+        etag = client.get("/api/tasks", headers=headers).headers["ETag"]
+        client.post("/api/tasks/import", content=b'{"title": "t"}\n', headers=headers)
+        resp = client.get("/api/tasks", headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+
+    def test_csv_without_title_column_returns_400(self, client, headers):
+        resp = client.post("/api/tasks/import", params={"format": "csv"}, content=b"name\nx\n", headers=headers)
+        assert resp.status_code == 400
+
+    def test_too_many_rows_returns_413_and_imports_nothing(self, client, headers, monkeypatch):
+        from app.routers import tasks as tasks_router
+
+        monkeypatch.setattr(tasks_router.settings, "TASKS_IMPORT_CHUNK_SIZE", 1)
+        monkeypatch.setattr(tasks_router.settings, "TASKS_IMPORT_MAX_ROWS", 2)
+        resp = client.post("/api/tasks/import", content=b'{"title": "t"}\n' * 3, headers=headers)
+        assert resp.status_code == 413
+        assert client.get("/api/tasks", headers=headers).json() == []
+
 
 class TestCreateTask:
     def test_create_returns_201_with_task(self, client, headers):
@@ -83,6 +534,26 @@ class TestUpdateTask:
         resp = client.patch(f"/api/tasks/{uuid.uuid4()}", json={"title": "Updated"}, headers=headers)
         assert resp.status_code == 404
 
+    def test_update_other_users_task_returns_404(self, client, headers, make_user, auth_headers):
+        created = client.post("/api/tasks", json={"title": "Task"}, headers=headers).json()
+        other = make_user(email="other4@example.com")
+        resp = client.patch(f"/api/tasks/{created['id']}", json={"title": "Hijacked"}, headers=auth_headers(other.id))
+        assert resp.status_code == 404
+        assert client.get(f"/api/tasks/{created['id']}", headers=headers).json()["title"] == "Task"
+
+    def test_update_can_clear_description(self, client, headers):
+        created = client.post("/api/tasks", json={"title": "Task", "description": "notes"}, headers=headers).json()
+        resp = client.patch(f"/api/tasks/{created['id']}", json={"description": None}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.json()["description"] is None
+        assert resp.json()["title"] == "Task"
+
+    def test_empty_update_returns_task_unchanged(self, client, headers):
+        created = client.post("/api/tasks", json={"title": "Task"}, headers=headers).json()
+        resp = client.patch(f"/api/tasks/{created['id']}", json={}, headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == created
+
 
 class TestDeleteTask:
     def test_delete_existing_task(self, client, headers):
@@ -98,3 +569,108 @@ class TestDeleteTask:
 
         resp = client.delete(f"/api/tasks/{uuid.uuid4()}", headers=headers)
         assert resp.status_code == 404
+
+    def test_delete_other_users_task_returns_404(self, client, headers, make_user, auth_headers):
+        created = client.post("/api/tasks", json={"title": "Task"}, headers=headers).json()
+        other = make_user(email="other5@example.com")
+        resp = client.delete(f"/api/tasks/{created['id']}", headers=auth_headers(other.id))
+        assert resp.status_code == 404
+        assert client.get(f"/api/tasks/{created['id']}", headers=headers).status_code == 200
+
+
+class TestBatchTasks:
+    def test_requires_auth(self, client):
+        resp = client.post("/api/tasks:batch", json={"create": [{"title": "Task"}]})
+        assert resp.status_code == 401
+
+    def test_creates_in_request_order(self, client, headers):
+        resp = client.post(
+            "/api/tasks:batch",
+            json={"create": [{"title": "one"}, {"title": "two", "status": "completed"}, {"title": "three"}]},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        created = resp.json()["created"]
+        assert [c["status"] for c in created] == ["created"] * 3
+        assert [c["task"]["title"] for c in created] == ["one", "two", "three"]
+        assert created[1]["task"]["status"] == "completed"
+
+        listed = client.get("/api/tasks", headers=headers).json()
+        assert [t["title"] for t in listed] == ["one", "two", "three"]
+
+    def test_updates_and_deletes_report_per_item_results(self, client, headers, make_user, auth_headers):
+        import uuid
+
+        a = client.post("/api/tasks", json={"title": "a"}, headers=headers).json()
+        b = client.post("/api/tasks", json={"title": "b", "description": "keep"}, headers=headers).json()
+        c = client.post("/api/tasks", json={"title": "c"}, headers=headers).json()
+        other = make_user(email="other3@example.com")
+        theirs = client.post("/api/tasks", json={"title": "theirs"}, headers=auth_headers(other.id)).json()
+        missing = str(uuid.uuid4())
+
+        resp = client.post(
+            "/api/tasks:batch",
+            json={
+                "update": [
+                    {"id": a["id"], "title": "a2"},
+                    {"id": b["id"], "status": "completed"},
+                    {"id": theirs["id"], "title": "hijacked"},
+                    {"id": missing, "title": "nope"},
+                ],
+                "delete": [c["id"], theirs["id"]],
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+
+        assert [u["status"] for u in body["updated"]] == ["updated", "updated", "not_found", "not_found"]
+        assert body["updated"][0]["task"]["title"] == "a2"
+        assert body["updated"][1]["task"]["status"] == "completed"
+        assert body["updated"][1]["task"]["description"] == "keep"
+        assert [d["status"] for d in body["deleted"]] == ["deleted", "not_found"]
+
+        assert client.get(f"/api/tasks/{c['id']}", headers=headers).status_code == 404
+        their_task = client.get(f"/api/tasks/{theirs['id']}", headers=auth_headers(other.id)).json()
+        assert their_task["title"] == "theirs"
+
+    def test_invalid_item_rejects_whole_batch(self, client, headers):
+        resp = client.post(
+            "/api/tasks:batch",
+            json={"create": [{"title": "fine"}, {"title": "   "}]},
+            headers=headers,
+        )
+        assert resp.status_code == 422
+        assert client.get("/api/tasks", headers=headers).json() == []
+
+    def test_duplicate_update_ids_return_422(self, client, headers):
+        created = client.post("/api/tasks", json={"title": "Task"}, headers=headers).json()
+        resp = client.post(
+            "/api/tasks:batch",
+            json={"update": [{"id": created["id"], "title": "x"}, {"id": created["id"], "title": "y"}]},
+            headers=headers,
+        )
+        assert resp.status_code == 422
+
+    def test_too_many_operations_returns_422(self, client, headers):
+        limit = get_settings().TASKS_BATCH_MAX_OPERATIONS
+        resp = client.post(
+            "/api/tasks:batch",
+            json={"create": [{"title": f"t{i}"} for i in range(limit + 1)]},
+            headers=headers,
+        )
+        assert resp.status_code == 422
+        assert f"more than {limit} operations" in resp.json()["details"][0]["msg"]
+
+    def test_too_many_operations_in_total_returns_422_before_items_are_validated(self, client, headers):
+        limit = get_settings().TASKS_BATCH_MAX_OPERATIONS
+        # Invalid items would add one error each if they were validated
+        resp = client.post(
+            "/api/tasks:batch",
+            json={"create": [{"title": ""}] * limit, "delete": ["not-a-uuid"]},
+            headers=headers,
+        )
+        assert resp.status_code == 422
+        errors = resp.json()["details"]
+        assert len(errors) == 1
+        assert f"more than {limit} operations" in errors[0]["msg"]
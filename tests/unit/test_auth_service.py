@@ -1,53 +1,65 @@
+import uuid
+
 import pytest
 
 from app.core.errors import EmailAlreadyInUseError, InvalidCredentialsError
-from app.services.auth_service import authenticate_user, register_user, resolve_current_user
+from app.services.auth_service_async import authenticate_user, register_user, resolve_current_user
 
 
 class TestAuthenticateUser:
-    def test_correct_credentials_returns_user(self, db_session, make_user):
+    def test_correct_credentials_returns_user(self, run_async_db, make_user):
         user = make_user(email="user@example.com", password="correct-password")
-        result = authenticate_user(db_session, email="user@example.com", password="correct-password")
+        result = run_async_db(lambda db: authenticate_user(db, email="user@example.com", password="correct-password"))
         assert result.id == user.id
 
-    def test_wrong_password_raises_invalid_credentials(self, db_session, make_user):
+    def test_wrong_password_raises_invalid_credentials(self, run_async_db, make_user):
         make_user(email="user@example.com", password="correct-password")
         with pytest.raises(InvalidCredentialsError):
-            authenticate_user(db_session, email="user@example.com", password="wrong-password")
+            run_async_db(lambda db: authenticate_user(db, email="user@example.com", password="wrong-password"))
 
-    def test_unknown_email_raises_invalid_credentials(self, db_session):
+    def test_unknown_email_raises_invalid_credentials(self, run_async_db):
         with pytest.raises(InvalidCredentialsError):
-            authenticate_user(db_session, email="nobody@example.com", password="whatever")
+            run_async_db(lambda db: authenticate_user(db, email="nobody@example.com", password="whatever"))
+
+    def test_rehashes_at_current_cost_on_login(self, db_session, run_async_db, make_user, monkeypatch):
+        from app.auth import security
+
+        user = make_user(email="user@example.com", password="correct-password")
+        monkeypatch.setattr(security, "_rounds", security.hash_rounds(user.password_hash) + 1)
+
+        result = run_async_db(lambda db: authenticate_user(db, email="user@example.com", password="correct-password"))
+        db_session.expire_all()
+        assert security.hash_rounds(db_session.get(type(user), user.id).password_hash) == security._rounds
+        again = run_async_db(lambda db: authenticate_user(db, email="user@example.com", password="correct-password"))
+        assert again.id == result.id
 
 
 class TestRegisterUser:
-    def test_creates_user_with_hashed_password(self, db_session):
-        user = register_user(db_session, email="new@example.com", password="s3cret-pass")
+    def test_creates_user_with_hashed_password(self, run_async_db):
+        user = run_async_db(lambda db: register_user(db, email="new@example.com", password="s3cret-pass"))
         assert user.email == "new@example.com"
         assert user.password_hash != "s3cret-pass"
 
-    def test_duplicate_email_raises_email_already_in_use(self, db_session, make_user):
+    def test_duplicate_email_raises_email_already_in_use(self, run_async_db, make_user):
         make_user(email="taken@example.com")
         with pytest.raises(EmailAlreadyInUseError):
-            register_user(db_session, email="taken@example.com", password="another-pass")
+            run_async_db(lambda db: register_user(db, email="taken@example.com", password="another-pass"))
 
 
 class TestResolveCurrentUser:
-    def test_valid_token_resolves_user(self, db_session, make_user, auth_headers):
+    def test_subject_of_existing_user_resolves_user(self, run_async_db, make_user):
         user = make_user()
-        headers = auth_headers(user.id)
-        token = headers["Authorization"].removeprefix("Bearer ")
-        resolved = resolve_current_user(db_session, token)
+        resolved = run_async_db(lambda db: resolve_current_user(db, str(user.id)))
         assert resolved.id == user.id
 
-    def test_garbage_token_raises_invalid_credentials(self, db_session):
+    def test_subject_that_is_not_a_user_id_raises_invalid_credentials(self, run_async_db):
         with pytest.raises(InvalidCredentialsError):
-            resolve_current_user(db_session, "not-a-real-token")
+            run_async_db(lambda db: resolve_current_user(db, "not-a-user-id"))
 
-    def test_token_for_nonexistent_user_raises_invalid_credentials(self, db_session, auth_headers):
-        import uuid
+    def test_missing_subject_raises_invalid_credentials(self, run_async_db):
+        with pytest.raises(InvalidCredentialsError):
+            run_async_db(lambda db: resolve_current_user(db, None))
 
-        headers = auth_headers(uuid.uuid4())
-        token = headers["Authorization"].removeprefix("Bearer ")
+    def test_subject_of_nonexistent_user_raises_invalid_credentials(self, run_async_db):
         with pytest.raises(InvalidCredentialsError):
-            resolve_current_user(db_session, token)
+            run_async_db(lambda db: resolve_current_user(db, str(uuid.uuid4())))
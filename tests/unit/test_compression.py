@@ -0,0 +1,113 @@
+import gzip
+import json
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware.compression import CompressionMiddleware, allow_stream_compression
+
+ROWS = [{"id": i, "title": f"Task {i}", "status": "pending"} for i in range(200)]
+
+
+async def _large(request):
+    return JSONResponse(ROWS, headers={"ETag": '"v1"'})
+
+
+async def _small(request):
+    return JSONResponse({"ok": True})
+
+
+async def _image(request):
+    return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+
+async def _encoded(request):
+    return Response(gzip.compress(b"x" * 5000), media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+
+def _rows():
+    for row in ROWS:
+        yield json.dumps(row) + "\n"
+
+
+async def _stream(request):
+    return StreamingResponse(_rows(), media_type="application/x-ndjson")
+
+
+async def _stream_opt_in(request):
+    allow_stream_compression(request)
+    return StreamingResponse(_rows(), media_type="application/x-ndjson")
+
+
+def _client() -> TestClient:
+    app = Starlette(routes=[
+        Route("/large", _large),
+        Route("/small", _small),
+        Route("/image", _image),
+        Route("/encoded", _encoded),
+        Route("/stream", _stream),
+        Route("/stream-opt-in", _stream_opt_in),
+        Route("/text", lambda request: PlainTextResponse("x" * 5000)),
+    ])
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=1024,
+        content_types=["application/json", "application/x-ndjson"],
+        levels={"gzip": 1},
+    )
+    return TestClient(app)
+
+
+def _get(path: str, accept_encoding: str = "gzip"):
+    # httpx decodes gzip transparently, so the raw stream is read to check the bytes on the wire
+    with _client().stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as resp:
+        return resp, b"".join(resp.iter_raw())
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_json(self):
+        resp, raw = _get("/large")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert int(resp.headers["content-length"]) == len(raw)
+        assert json.loads(gzip.decompress(raw)) == ROWS
+
+    def test_strong_etag_becomes_weak(self):
+        resp, _ = _get("/large")
+        assert resp.headers["etag"] == 'W/"v1"'
+
+    def test_identity_when_not_accepted(self):
+        for accept_encoding in ("identity", "gzip;q=0"):
+            resp, raw = _get("/large", accept_encoding)
+            assert "content-encoding" not in resp.headers
+            assert resp.headers["etag"] == '"v1"'
+            assert json.loads(raw) == ROWS
+
+    def test_small_bodies_are_not_compressed(self):
+        resp, raw = _get("/small")
+        assert "content-encoding" not in resp.headers
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert json.loads(raw) == {"ok": True}
+
+    def test_only_allow_listed_types(self):
+        for path in ("/image", "/text"):
+            resp, _ = _get(path)
+            assert "content-encoding" not in resp.headers
+
+    def test_already_encoded_is_untouched(self):
+        resp, raw = _get("/encoded")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw) == b"x" * 5000
+
+    def test_streams_are_not_compressed_by_default(self):
+        resp, raw = _get("/stream")
+        assert "content-encoding" not in resp.headers
+        assert raw == "".join(_rows()).encode()
+
+    def test_streams_compressed_when_opted_in(self):
+        resp, raw = _get("/stream-opt-in")
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        assert gzip.decompress(raw) == "".join(_rows()).encode()
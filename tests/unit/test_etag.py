@@ -0,0 +1,31 @@
+from app.api.etag import etag_matches, make_etag
+
+
+class TestMakeEtag:
+    def test_is_quoted_and_deterministic(self):
+        etag = make_etag("tasks", 1, "abc")
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag("tasks", 1, "abc")
+
+    def test_changes_with_parts(self):
+        assert make_etag("tasks", 1) != make_etag("tasks", 2)
+
+
+class TestEtagMatches:
+    def test_missing_header_does_not_match(self):
+        assert not etag_matches(None, '"abc"')
+
+    def test_exact_match(self):
+        assert etag_matches('"abc"', '"abc"')
+
+    def test_match_in_list(self):
+        assert etag_matches('"xyz", "abc"', '"abc"')
+
+    def test_weak_validator_matches(self):
+        assert etag_matches('W/"abc"', '"abc"')
+
+    def test_wildcard_matches(self):
+        assert etag_matches("*", '"abc"')
+
+    def test_different_tag_does_not_match(self):
+        assert not etag_matches('"xyz"', '"abc"')
@@ -0,0 +1,45 @@
+from app.core.http import encoding_qvalues, negotiate_encoding
+
+SUPPORTED = ("zstd", "br", "gzip")
+
+
+class TestEncodingQvalues:
+    def test_parses_q_values(self):
+        assert encoding_qvalues("gzip, deflate;q=0.5, br;q=0") == {"gzip": 1.0, "deflate": 0.5, "br": 0.0}
+
+    def test_ignores_invalid_q_values_and_case(self):
+        assert encoding_qvalues("GZIP;q=1.0, br;q=oops, zstd;q=2") == {"gzip": 1.0}
+
+
+class TestNegotiateEncoding:
+    def test_no_header_means_identity(self):
+        assert negotiate_encoding(None, SUPPORTED) is None
+        assert negotiate_encoding("", SUPPORTED) is None
+
+    def test_highest_q_value_wins(self):
+        assert negotiate_encoding("gzip;q=1, br;q=0.1", SUPPORTED) == "gzip"
+        assert negotiate_encoding("gzip;q=0.8, zstd;q=0.9", SUPPORTED) == "zstd"
+
+    def test_ties_go_to_server_preference(self):
+        assert negotiate_encoding("gzip, br", SUPPORTED) == "br"
+        assert negotiate_encoding("gzip;q=0.5, br;q=0.5, zstd;q=0.5", SUPPORTED) == "zstd"
+
+    def test_zero_q_refuses_a_coding(self):
+        assert negotiate_encoding("gzip, deflate, br;q=0", SUPPORTED) == "gzip"
+        assert negotiate_encoding("br;q=0", SUPPORTED) is None
+
+    def test_wildcard_covers_every_supported_coding(self):
+        assert negotiate_encoding("*", SUPPORTED) == "zstd"
+        assert negotiate_encoding("*", ("br", "gzip")) == "br"
+
+    def test_wildcard_does_not_override_named_codings(self):
+        assert negotiate_encoding("zstd;q=0, *", SUPPORTED) == "br"
+        assert negotiate_encoding("gzip, *;q=0.5", SUPPORTED) == "gzip"
+        assert negotiate_encoding("gzip, *;q=0", SUPPORTED) == "gzip"
+
+    def test_only_unsupported_codings(self):
+        assert negotiate_encoding("deflate, compress", SUPPORTED) is None
+
+    def test_preferred_identity_keeps_response_uncompressed(self):
+        assert negotiate_encoding("identity, gzip;q=0.5", SUPPORTED) is None
+        assert negotiate_encoding("identity;q=0.5, gzip", SUPPORTED) == "gzip"
@@ -0,0 +1,81 @@
+import pytest
+from jose import JWTError, jwt
+
+from app.auth import jwt as jwt_module
+from app.auth.jwt import VerifiedToken, VerifiedTokenCache, create_access_token, verify_access_token
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def decodes(monkeypatch):
+    """Count full signature verifications; start from an empty verified-token cache."""
+    calls = []
+    decode = jwt_module.decode_access_token
+
+    def _counting_decode(token):
+        calls.append(token)
+        return decode(token)
+
+    monkeypatch.setattr(jwt_module, "decode_access_token", _counting_decode)
+    monkeypatch.setattr(jwt_module, "verified_tokens", VerifiedTokenCache(16))
+    return calls
+
+
+class TestVerifyAccessToken:
+    def test_repeat_verifications_reuse_the_first(self, decodes):
+        token = create_access_token(user_id="user-1")
+        assert verify_access_token(token).subject == "user-1"
+        assert verify_access_token(token).subject == "user-1"
+        assert len(decodes) == 1
+
+    def test_tampered_token_is_verified_again(self, decodes):
+        token = create_access_token(user_id="user-1")
+        verify_access_token(token)
+        with pytest.raises(JWTError):
+            verify_access_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+        assert len(decodes) == 2
+
+    def test_invalid_tokens_are_not_cached(self, decodes):
+        for _ in range(2):
+            with pytest.raises(JWTError):
+                verify_access_token("not-a-token")
+        assert len(decodes) == 2
+
+
+class TestVerifiedTokenCache:
+    def test_entries_are_served_until_exp(self):
+        clock = FakeClock()
+        cache = VerifiedTokenCache(16, clock=clock)
+        verified = VerifiedToken("token", {"sub": "user-1", "exp": clock.now + 60})
+        cache.put(verified)
+        assert cache.get("token") is verified
+        clock.now += 60
+        assert cache.get("token") is None
+
+    def test_tokens_without_exp_are_not_cached(self):
+        cache = VerifiedTokenCache(16)
+        cache.put(VerifiedToken("token", {"sub": "user-1"}))
+        assert cache.get("token") is None
+
+    def test_evicts_least_recently_used(self):
+        clock = FakeClock()
+        cache = VerifiedTokenCache(2, clock=clock)
+        claims = {"exp": clock.now + 60}
+        for token in ("a", "b"):
+            cache.put(VerifiedToken(token, claims))
+        cache.get("a")
+        cache.put(VerifiedToken("c", claims))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_expired_token_is_rejected_by_verification(self, decodes):
+        token = jwt.encode({"sub": "user-1", "exp": 1}, jwt_module.SECRET_KEY, algorithm=jwt_module.ALGORITHM)
+        with pytest.raises(JWTError):
+            verify_access_token(token)
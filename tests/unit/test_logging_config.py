@@ -0,0 +1,93 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from app.core.logging_config import (
+    JsonFormatter,
+    RequestLogContext,
+    RequestLogFilter,
+    _ContextQueueHandler,
+    current_request_log,
+)
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture()
+def request_context():
+    context = RequestLogContext("req-1", {"state": {"user_id": "user-1"}})
+    token = current_request_log.set(context)
+    yield context
+    current_request_log.reset(token)
+
+
+class TestRequestLogFilter:
+    def test_stamps_request_context(self, request_context):
+        record = _record()
+        assert RequestLogFilter().filter(record)
+        assert record.request_id == "req-1"
+        assert record.user_id == "user-1"
+
+    def test_outside_a_request_is_kept(self):
+        assert RequestLogFilter(sample_rate=0.0).filter(_record())
+
+    def test_unsampled_request_drops_info(self, request_context):
+        log_filter = RequestLogFilter(sample_rate=0.0, slow_request_ms=1000)
+        assert not log_filter.filter(_record())
+        assert not log_filter.filter(_record(status_code=200, duration_ms=5.0))
+        assert log_filter.dropped == 2
+
+    def test_errors_warnings_and_slow_requests_are_kept(self, request_context):
+        log_filter = RequestLogFilter(sample_rate=0.0, slow_request_ms=1000)
+        assert log_filter.filter(_record(logging.WARNING))
+        assert log_filter.filter(_record(status_code=404, duration_ms=5.0))
+        assert log_filter.filter(_record(status_code=200, duration_ms=1500.0))
+
+    def test_sampling_decision_is_per_request(self, request_context, monkeypatch):
+        log_filter = RequestLogFilter(sample_rate=0.5)
+        monkeypatch.setattr("app.core.logging_config.random.random", lambda: 0.1)
+        assert log_filter.filter(_record())
+        monkeypatch.setattr("app.core.logging_config.random.random", lambda: 0.9)
+        assert log_filter.filter(_record(status_code=200, duration_ms=1.0))
+        assert request_context.sampled is True
+
+
+class TestJsonFormatter:
+    def test_includes_request_fields(self):
+        record = _record(request_id="req-1", user_id="user-1", status_code=201, duration_ms=3.5)
+        data = json.loads(JsonFormatter().format(record))
+        assert data["message"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["logger"] == "app.test"
+        assert data["request_id"] == "req-1"
+        assert data["user_id"] == "user-1"
+        assert data["status_code"] == 201
+        assert data["duration_ms"] == 3.5
+        assert "db_queries" not in data
+
+
+class TestQueueHandler:
+    def test_renders_message_and_keeps_traceback_separate(self):
+        log_queue = queue.SimpleQueue()
+        handler = _ContextQueueHandler(log_queue)
+        try:
+            raise ValueError("bad")
+        except ValueError:
+            record = logging.LogRecord("app.test", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info())
+        handler.handle(record)
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "failed x"
+        assert queued.args is None
+        assert queued.exc_info is None
+        assert "ValueError: bad" in queued.exc_text
+        data = json.loads(JsonFormatter().format(queued))
+        assert data["message"] == "failed x"
+        assert "ValueError: bad" in data["exc_info"]
@@ -0,0 +1,119 @@
+import logging
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.auth.jwt import create_access_token
+from app.middleware.auth_context import AuthContextMiddleware
+from app.middleware.request_logging import RequestLoggingMiddleware
+from app.middleware.security_headers import CONTENT_SECURITY_POLICY, SecurityHeadersMiddleware
+
+
+async def _state(request):
+    verified = request.state.verified_token
+    return JSONResponse({
+        "request_id": request.state.request_id,
+        "user_id": request.state.user_id,
+        "subject": verified.subject if verified else None,
+    })
+
+
+async def _framed(request):
+    return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+
+async def _stream(request):
+    async def chunks():
+        yield b"a"
+        request.app.state.events.append("body sent")
+        yield b"b"
+    return StreamingResponse(chunks(), status_code=201)
+
+
+async def _boom(request):
+    raise RuntimeError("boom")
+
+
+def _client(enable_csp: bool = False) -> TestClient:
+    app = Starlette(routes=[
+        Route("/state", _state),
+        Route("/framed", _framed),
+        Route("/stream", _stream),
+        Route("/boom", _boom),
+    ])
+    app.state.events = []
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware, enable_csp=enable_csp)
+    app.add_middleware(AuthContextMiddleware)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestSecurityHeaders:
+    def test_adds_headers(self):
+        resp = _client().get("/state")
+        assert resp.headers["X-Content-Type-Options"] == "nosniff"
+        assert resp.headers["Referrer-Policy"] == "strict-origin-when-cross-origin"
+        assert "Content-Security-Policy" not in resp.headers
+
+    def test_replaces_app_headers(self):
+        resp = _client().get("/framed")
+        assert resp.headers.get_list("X-Frame-Options") == ["DENY"]
+
+    def test_csp_when_enabled(self):
+        assert _client(enable_csp=True).get("/state").headers["Content-Security-Policy"] == CONTENT_SECURITY_POLICY
+
+
+class TestRequestLogging:
+    def test_echoes_request_id(self):
+        resp = _client().get("/state", headers={"X-Request-ID": "req-42"})
+        assert resp.headers["X-Request-ID"] == "req-42"
+        assert resp.json()["request_id"] == "req-42"
+
+    def test_generates_request_id(self):
+        resp = _client().get("/state")
+        assert resp.headers["X-Request-ID"] == resp.json()["request_id"]
+
+    def test_logs_when_response_starts(self, caplog):
+        client = _client()
+        events = client.app.state.events
+
+        class Recorder(logging.Handler):
+            def emit(self, record):
+                events.append("logged")
+
+        recorder = Recorder()
+        logging.getLogger("request").addHandler(recorder)
+        try:
+            with caplog.at_level(logging.INFO, logger="request"):
+                resp = client.get("/stream", headers={"X-Request-ID": "req-s"})
+        finally:
+            logging.getLogger("request").removeHandler(recorder)
+        assert resp.status_code == 201
+        assert resp.content == b"ab"
+        assert "GET /stream -> 201" in caplog.text
+        assert "request_id=req-s" in caplog.text
+        assert events == ["logged", "body sent"]
+
+    def test_logs_unhandled_errors(self, caplog):
+        with caplog.at_level(logging.INFO, logger="request"):
+            resp = _client().get("/boom", headers={"X-Request-ID": "req-e"})
+        assert resp.status_code == 500
+        assert "GET /boom -> 500" in caplog.text
+        assert "request_id=req-e" in caplog.text
+
+
+class TestAuthContext:
+    def test_valid_token_sets_user(self):
+        token = create_access_token(user_id="user-1")
+        data = _client().get("/state", headers={"Authorization": f"Bearer {token}"}).json()
+        assert data["user_id"] == "user-1"
+        assert data["subject"] == "user-1"
+
+    def test_missing_or_invalid_token(self):
+        client = _client()
+        assert client.get("/state").json()["user_id"] is None
+        data = client.get("/state", headers={"Authorization": "Bearer not-a-jwt"}).json()
+        assert data["user_id"] is None
+        assert data["subject"] is None
@@ -0,0 +1,55 @@
+import base64
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.api.pagination import decode_cursor, encode_cursor
+from app.core.errors import InvalidCursorError
+
+
+def raw_cursor(*parts) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(parts)).encode()).decode().rstrip("=")
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize("sort_key, value", [
+        ("created_at", datetime(2026, 1, 1, tzinfo=timezone.utc)),
+        ("-due_date", None),
+        ("title", "abc"),
+        ("rank", 0.5),
+    ])
+    def test_decodes_what_it_encodes(self, sort_key, value):
+        task_id = uuid4()
+        assert decode_cursor(encode_cursor(sort_key, value, task_id), sort_key) == (value, task_id)
+
+
+class TestRejectsTamperedCursors:
+    def test_other_sort_key(self):
+        cursor = encode_cursor("title", "abc", uuid4())
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "-title")
+
+    @pytest.mark.parametrize("task_id", [1, ["x"], None, {"a": 1}])
+    def test_task_id_not_a_string(self, task_id):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(raw_cursor("title", "s", "abc", task_id), "title")
+
+    @pytest.mark.parametrize("sort_key, kind, value", [
+        ("created_at", "s", "abc"),
+        ("created_at", "f", 1.5),
+        ("created_at", "n", None),
+        ("title", "d", "2026-01-01T00:00:00"),
+        ("-due_date", "s", "abc"),
+        ("rank", "s", "abc"),
+        ("created_at", "d", 12),
+    ])
+    def test_value_kind_must_match_sort_column(self, sort_key, kind, value):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(raw_cursor(sort_key, kind, value, str(uuid4())), sort_key)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", raw_cursor(1, 2), raw_cursor("title", "s", "abc", "not-a-uuid"), "é"])
+    def test_malformed(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "title")
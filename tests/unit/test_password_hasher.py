@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.auth.password_hasher import PasswordHasher
+from app.core.errors import PasswordHasherBusyError
+
+
+@pytest.fixture()
+def hasher():
+    hasher = PasswordHasher(workers=1, max_queue=1)
+    yield hasher
+    hasher.shutdown()
+
+
+class TestPasswordHasher:
+    def test_hash_and_verify_round_trip(self, hasher):
+        async def scenario():
+            password_hash = await hasher.hash_password("correct-password")
+            return (
+                await hasher.verify_password("correct-password", password_hash),
+                await hasher.verify_password("wrong-password", password_hash),
+            )
+
+        assert asyncio.run(scenario()) == (True, False)
+        snapshot = hasher.snapshot()
+        assert snapshot["completed"] == 3
+        assert snapshot["hash_seconds"]["count"] == 3
+        assert snapshot["in_flight"] == 0
+
+    def test_rejects_when_workers_and_queue_are_full(self, hasher):
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(hasher.submit(release.wait))
+            queued = asyncio.ensure_future(hasher.submit(release.wait))
+            await asyncio.sleep(0)
+            assert (hasher.in_flight, hasher.queue_depth) == (2, 1)
+            with pytest.raises(PasswordHasherBusyError):
+                await hasher.submit(release.wait)
+            release.set()
+            await asyncio.gather(running, queued)
+
+        asyncio.run(scenario())
+        assert hasher.rejected == 1
+        assert hasher.completed == 2
+        # The queued job waited for the running one to finish
+        assert hasher.queue_wait.snapshot()["count"] == 2
+
+    def test_failed_jobs_are_not_counted_as_completed(self, hasher):
+        def broken():
+            raise ValueError("invalid salt")
+
+        async def scenario():
+            with pytest.raises(ValueError):
+                await hasher.submit(broken)
+
+        asyncio.run(scenario())
+        assert (hasher.completed, hasher.failed, hasher.in_flight) == (0, 1, 0)
+        assert hasher.snapshot()["failed"] == 1
+
+    def test_cancelled_request_keeps_the_slot_until_the_thread_is_done(self, hasher):
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait()
+
+        async def scenario():
+            running = asyncio.ensure_future(hasher.submit(slow))
+            queued = asyncio.ensure_future(hasher.submit(slow))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+
+            running.cancel()
+            queued.cancel()
+            await asyncio.gather(running, queued, return_exceptions=True)
+            # The queued job never started; the running one still occupies its thread
+            assert hasher.in_flight == 1
+            queued = asyncio.ensure_future(hasher.submit(slow))
+            await asyncio.sleep(0)
+            with pytest.raises(PasswordHasherBusyError):
+                await hasher.submit(slow)
+
+            release.set()
+            await queued
+            while hasher.in_flight:
+                await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        assert (hasher.completed, hasher.failed) == (2, 0)
@@ -0,0 +1,65 @@
+import bcrypt
+import pytest
+
+from app.auth import security
+from app.auth.security import calibrate_rounds, hash_password, hash_rounds, needs_rehash
+
+
+def bcrypt_hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+@pytest.fixture()
+def rounds(monkeypatch):
+    """Set the current bcrypt cost; fixed=False behaves as if it had been calibrated."""
+
+    def _rounds(value: int, fixed: bool = True):
+        monkeypatch.setattr(security, "_rounds", value)
+        monkeypatch.setattr(security.settings, "BCRYPT_ROUNDS", value if fixed else 0)
+
+    return _rounds
+
+
+class TestHashRounds:
+    def test_reads_cost_from_hash(self):
+        assert hash_rounds(bcrypt_hash("pw", 5)) == 5
+
+    def test_not_a_bcrypt_hash(self):
+        assert hash_rounds("plain") is None
+
+    def test_new_hashes_use_current_cost(self, rounds):
+        rounds(5)
+        assert hash_rounds(hash_password("pw")) == 5
+
+
+class TestNeedsRehash:
+    def test_fixed_cost_rehashes_any_difference(self, rounds):
+        rounds(5)
+        assert not needs_rehash(bcrypt_hash("pw", 5))
+        assert needs_rehash(bcrypt_hash("pw", 4))
+        assert needs_rehash(bcrypt_hash("pw", 6))
+
+    def test_calibrated_cost_tolerates_one_round(self, rounds):
+        rounds(6, fixed=False)
+        assert not needs_rehash(bcrypt_hash("pw", 5))
+        assert not needs_rehash(bcrypt_hash("pw", 7))
+        assert needs_rehash(bcrypt_hash("pw", 4))
+
+    def test_never_calibrates(self, monkeypatch):
+        monkeypatch.setattr(security, "_rounds", None)
+        monkeypatch.setattr(security.settings, "BCRYPT_ROUNDS", 0)
+        monkeypatch.setattr(security, "calibrate_rounds", lambda target_ms: pytest.fail("calibrated on the caller's thread"))
+        assert not needs_rehash(bcrypt_hash("pw", 4))
+        assert needs_rehash("plain")
+
+
+class TestCalibrateRounds:
+    def test_stays_within_bounds(self):
+        assert calibrate_rounds(0.001) == security.MIN_CALIBRATED_ROUNDS
+        assert calibrate_rounds(10**9) == security.MAX_CALIBRATED_ROUNDS
+
+    def test_each_doubling_of_target_adds_a_round(self, monkeypatch):
+        monkeypatch.setattr(security, "MIN_CALIBRATED_ROUNDS", 4)
+        times = iter([0.0, 0.010] * security.CALIBRATION_SAMPLES)   # 10ms per hash at CALIBRATION_ROUNDS
+        monkeypatch.setattr(security.time, "perf_counter", lambda: next(times))
+        assert calibrate_rounds(80) == security.CALIBRATION_ROUNDS + 3
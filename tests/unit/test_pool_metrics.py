@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.db.pool_metrics import TimedQueuePool, instrument_pool
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+    def test_tracks_checkouts_and_pool_state(self, engine):
+        metrics = instrument_pool(engine, "test")
+        with engine.connect():
+            snapshot = metrics.snapshot(engine.pool)
+            assert (snapshot["checked_out"], snapshot["idle"]) == (1, 0)
+        with engine.connect():
+            pass
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert (snapshot["checked_out"], snapshot["idle"]) == (0, 1)
+        assert snapshot["checkouts"] == 2
+        assert snapshot["connects"] == 1
+        assert snapshot["checkout_wait_seconds"]["count"] == 2
+        assert snapshot["checkout_wait_seconds"]["buckets"]["+Inf"] == 2
+
+    def test_counts_timeouts_and_their_wait(self, engine):
+        metrics = instrument_pool(engine, "test")
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["timeouts"] == 1
+        assert snapshot["checkout_wait_seconds"]["sum"] >= 0.05
+        # The timed-out checkout waited at least pool_timeout, so it is above the 0.025s bucket
+        assert snapshot["checkout_wait_seconds"]["buckets"]["0.025"] == 1
+
+    def test_counts_invalidations(self, engine):
+        metrics = instrument_pool(engine, "test")
+        with engine.connect() as conn:
+            conn.invalidate()
+        assert metrics.snapshot(engine.pool)["invalidations"] == 1
+
+    def test_metrics_survive_dispose(self, engine):
+        metrics = instrument_pool(engine, "test")
+        with engine.connect():
+            pass
+        engine.dispose()
+        with engine.connect():
+            pass
+        assert engine.pool.metrics is metrics
+        assert metrics.snapshot(engine.pool)["checkouts"] == 2
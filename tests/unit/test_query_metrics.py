@@ -0,0 +1,111 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db import query_metrics
+from app.db.query_metrics import (
+    OTHER_STATEMENT,
+    UNROUTED,
+    RequestQueryStats,
+    current_request_queries,
+    fingerprint,
+    instrument_queries,
+    route_label,
+)
+
+
+class _Route:
+    path = "/api/tasks/{task_id}"
+
+
+@pytest.fixture(autouse=True)
+def query_histograms(monkeypatch):
+    histograms = {}
+    monkeypatch.setattr(query_metrics, "QUERY_METRICS", histograms)
+    return histograms
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def request_stats():
+    stats = RequestQueryStats({"method": "GET", "route": _Route()}, "req-1")
+    token = current_request_queries.set(stats)
+    yield stats
+    current_request_queries.reset(token)
+
+
+class TestFingerprint:
+    def test_replaces_literals_and_placeholders(self):
+        assert fingerprint("SELECT *\n  FROM tasks WHERE id = %(id_1)s AND title = 'x''y' LIMIT 10") == (
+            "SELECT * FROM tasks WHERE id = ? AND title = ? LIMIT ?"
+        )
+
+    def test_collapses_in_lists_and_multi_row_values(self):
+        assert fingerprint("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == "SELECT ? FROM t WHERE id IN (?, ...)"
+        assert fingerprint("INSERT INTO t (a, b) VALUES ($1, $2), ($3, $4)") == (
+            "INSERT INTO t (a, b) VALUES (?, ...), ..."
+        )
+
+    def test_keeps_identifiers_with_digits(self):
+        assert fingerprint("SELECT tasks_1.id FROM tasks AS tasks_1") == "SELECT tasks_1.id FROM tasks AS tasks_1"
+
+
+class TestRouteLabel:
+    def test_uses_route_template(self):
+        assert route_label({"method": "PATCH", "route": _Route()}) == "PATCH /api/tasks/{task_id}"
+
+    def test_unrouted(self):
+        assert route_label(None) == UNROUTED
+        assert route_label({"method": "GET", "path": "/missing"}) == UNROUTED
+
+
+class TestInstrumentQueries:
+    def test_counts_request_statements_by_route(self, engine, request_stats, query_histograms):
+        instrument_queries(engine, slow_query_s=0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+        assert request_stats.count == 2
+        assert request_stats.total_s > 0
+        histogram = query_histograms[("GET /api/tasks/{task_id}", "SELECT ?")]
+        assert histogram.snapshot()["count"] == 2
+
+    def test_statements_outside_a_request_are_unrouted(self, engine, query_histograms):
+        instrument_queries(engine, slow_query_s=0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert list(query_histograms) == [(UNROUTED, "SELECT ?")]
+
+    def test_failed_statements_are_timed(self, engine, request_stats, query_histograms):
+        instrument_queries(engine, slow_query_s=0)
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            conn.execute(text("SELECT 1"))
+            assert not conn.info.get("query_start_s")
+        assert request_stats.count == 2
+
+    def test_histogram_count_is_bounded(self, engine, request_stats, query_histograms, monkeypatch):
+        monkeypatch.setattr(query_metrics, "MAX_QUERY_HISTOGRAMS", 1)
+        instrument_queries(engine, slow_query_s=0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 1 WHERE 1 = 1"))
+        assert ("GET /api/tasks/{task_id}", OTHER_STATEMENT) in query_histograms
+        assert len(query_histograms) == 2
+
+    def test_logs_slow_queries(self, engine, request_stats, caplog):
+        instrument_queries(engine, slow_query_s=1e-9)
+        with caplog.at_level(logging.WARNING, logger="sql.slow"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        assert "route=GET /api/tasks/{task_id} request_id=req-1: SELECT ?" in caplog.text
@@ -0,0 +1,136 @@
+import multiprocessing
+import socket
+from types import SimpleNamespace
+
+import pytest
+from limits import parse
+from limits.errors import ConfigurationError
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from slowapi import Limiter
+from slowapi.middleware import SlowAPIMiddleware
+from slowapi.util import get_remote_address
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import rate_limit_storage
+from app.core.rate_limit_storage import GROUP_SLOTS, SharedMemoryStorage
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=6000.0)
+    monkeypatch.setattr(rate_limit_storage, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest.fixture()
+def uri(tmp_path):
+    return f"shm://{tmp_path / 'rate-limit'}?slots=64"
+
+
+def _hit_many(uri, hits, results):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    item = parse("100/minute")
+    results.put(sum(limiter.hit(item, "user:1") for _ in range(hits)))
+
+
+class TestSharedMemoryStorage:
+    def test_registered_scheme(self, uri):
+        storage = storage_from_string(uri)
+        assert isinstance(storage, SharedMemoryStorage)
+        assert storage.slots == 64
+
+    def test_sliding_window_allows_up_to_the_limit(self, uri, clock):
+        storage = storage_from_string(uri)
+        assert all(storage.acquire_sliding_window_entry("k", 3, 60) for _ in range(3))
+        assert not storage.acquire_sliding_window_entry("k", 3, 60)
+        assert storage.get_sliding_window("k", 60) == (0, 0.0, 3, 120.0)
+
+    def test_previous_window_is_weighted(self, uri, clock):
+        storage = storage_from_string(uri)
+        for _ in range(4):
+            storage.acquire_sliding_window_entry("k", 4, 60)
+        clock.now += 90     # halfway through the next window: previous counts as 2
+        assert storage.get_sliding_window("k", 60) == (4, 30.0, 0, 90.0)
+        assert storage.acquire_sliding_window_entry("k", 4, 60)
+        assert storage.acquire_sliding_window_entry("k", 4, 60)
+        assert not storage.acquire_sliding_window_entry("k", 4, 60)
+        clock.now += 120    # both windows stale
+        assert storage.get_sliding_window("k", 60)[::2] == (0, 0)
+
+    def test_instances_share_the_file(self, uri, clock):
+        first, second = SharedMemoryStorage(uri), SharedMemoryStorage(uri)
+        assert first.acquire_sliding_window_entry("k", 2, 60)
+        assert second.acquire_sliding_window_entry("k", 2, 60)
+        assert not first.acquire_sliding_window_entry("k", 2, 60)
+
+    def test_limit_holds_across_processes(self, uri):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [context.Process(target=_hit_many, args=(uri, 60, results)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert sum(results.get() for _ in workers) == 100
+
+    def test_fixed_window_counters(self, uri, clock):
+        storage = storage_from_string(uri)
+        assert storage.incr("k", 60) == 1
+        assert storage.incr("k", 60, amount=2) == 3
+        assert storage.get("k") == 3
+        assert storage.get_expiry("k") == clock.now + 60
+        clock.now += 61
+        assert storage.get("k") == 0
+        storage.incr("k", 60)
+        storage.clear("k")
+        assert storage.get("k") == 0
+
+    def test_full_group_evicts_the_slot_closest_to_expiry(self, tmp_path, clock):
+        storage = SharedMemoryStorage(f"shm://{tmp_path / 'small'}?slots={GROUP_SLOTS}")
+        for i in range(GROUP_SLOTS):
+            storage.incr(f"k{i}", 60 + i)
+        storage.incr("new", 60)
+        assert storage.evictions == 1
+        assert storage.get("k0") == 0
+        assert storage.get("new") == 1
+        assert storage.get(f"k{GROUP_SLOTS - 1}") == 1
+
+    def test_needs_a_path(self):
+        with pytest.raises(ConfigurationError, match="file path"):
+            storage_from_string("shm://")
+
+
+@pytest.fixture()
+def unreachable_redis_uri():
+    # A port nothing listens on: every connection is refused at once
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    return f"redis://127.0.0.1:{port}/0?socket_timeout=0.1&socket_connect_timeout=0.1"
+
+
+class TestNetworkedStorageFallback:
+    @pytest.mark.filterwarnings("ignore:The 'warn' method is deprecated")   # slowapi's fallback log call
+    def test_limits_with_in_memory_counters_while_the_server_is_down(self, unreachable_redis_uri):
+        pytest.importorskip("redis")
+        limiter = Limiter(
+            key_func=get_remote_address,
+            default_limits=["2/minute"],
+            strategy="sliding-window-counter",
+            storage_uri=unreachable_redis_uri,
+            in_memory_fallback_enabled=True,
+        )
+
+        async def ok(request):
+            return PlainTextResponse("ok")
+
+        app = Starlette(routes=[Route("/", ok)])
+        app.state.limiter = limiter
+        app.add_middleware(SlowAPIMiddleware)
+        client = TestClient(app)
+
+        assert [client.get("/").status_code for _ in range(3)] == [200, 200, 429]
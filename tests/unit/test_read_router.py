@@ -0,0 +1,180 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from limits.errors import StorageError
+from limits.storage import storage_from_string
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core import rate_limit_storage
+from app.core.errors import PinStoreError
+from app.core.pin_store import LimitsPinStore, read_your_writes_pin_store
+from app.core.rate_limit_storage import SharedMemoryStorage
+from app.core.settings import get_settings
+from app.db.routing import ReadRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+def make_router(clock, replicas=2, pin_store=None):
+    primary = object()
+    replica_factories = [object() for _ in range(replicas)]
+    router = ReadRouter(primary, replica_factories, sticky_s=5, retry_s=30, pin_store=pin_store, clock=clock)
+    return router, primary, replica_factories
+
+
+class BrokenPinStore:
+    def pin(self, user_key, ttl_s):
+        raise PinStoreError()
+
+    def is_pinned(self, user_key):
+        raise PinStoreError()
+
+
+class BrokenStorage:
+    def clear(self, key):
+        raise StorageError(OSError("down"))
+
+    def incr(self, key, expiry, amount=1):
+        raise StorageError(OSError("down"))
+
+    def get(self, key):
+        raise StorageError(OSError("down"))
+
+
+class TestReadCandidates:
+    def test_without_replicas_reads_use_primary(self, clock):
+        router, primary, _ = make_router(clock, replicas=0)
+        assert router.read_candidates("user") == [primary]
+
+    def test_round_robin_with_primary_last(self, clock):
+        router, primary, (r0, r1) = make_router(clock)
+        assert router.read_candidates(None) == [r0, r1, primary]
+        assert router.read_candidates(None) == [r1, r0, primary]
+        assert router.read_candidates(None) == [r0, r1, primary]
+
+    def test_pinned_user_reads_primary_until_window_ends(self, clock):
+        router, primary, (r0, r1) = make_router(clock)
+        router.pin("writer")
+        assert router.read_candidates("writer") == [primary]
+        assert router.read_candidates("someone-else")[0] in (r0, r1)
+
+        clock.now += 5
+        assert router.read_candidates("writer")[-1] is primary
+        assert len(router.read_candidates("writer")) == 3
+
+    def test_expired_pins_are_dropped(self, clock):
+        router, _, _ = make_router(clock)
+        router.pin("a")
+        clock.now += 10
+        router.pin("b")
+        assert list(router._pinned) == ["b"]
+
+    def test_down_replica_is_skipped_until_retry(self, clock):
+        router, primary, (r0, r1) = make_router(clock)
+        router.mark_down(r0)
+        assert router.read_candidates(None) == [r1, primary]
+        assert router.read_candidates(None) == [r1, primary]
+
+        clock.now += 30
+        assert r0 in router.read_candidates(None)
+
+
+class TestOpenReadSession:
+    def test_falls_back_when_replica_cannot_connect(self, tmp_path, clock):
+        async def scenario():
+            primary_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+            broken_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+            primary = async_sessionmaker(bind=primary_engine)
+            broken = async_sessionmaker(bind=broken_engine)
+            router = ReadRouter(primary, [broken], sticky_s=5, retry_s=30, clock=clock)
+
+            db = await router.open_read_session(None)
+            try:
+                assert db.get_bind() is primary_engine.sync_engine
+            finally:
+                await db.close()
+            assert router.read_candidates(None) == [primary]
+
+            await primary_engine.dispose()
+            await broken_engine.dispose()
+
+        asyncio.run(scenario())
+
+
+class TestSharedPins:
+    @pytest.fixture()
+    def storage_clock(self, monkeypatch):
+        storage_clock = SimpleNamespace(now=6000.0)
+        monkeypatch.setattr(rate_limit_storage, "time", SimpleNamespace(time=lambda: storage_clock.now))
+        return storage_clock
+
+    @pytest.fixture()
+    def uri(self, tmp_path):
+        return f"shm://{tmp_path / 'read-your-writes'}?slots=64"
+
+    def test_pin_is_seen_by_every_worker(self, clock, uri, storage_clock):
+        # Each worker maps the file on its own, as separate processes do
+        writer, _, _ = make_router(clock, pin_store=LimitsPinStore(storage_from_string(uri)))
+        reader, reader_primary, _ = make_router(clock, pin_store=LimitsPinStore(storage_from_string(uri)))
+
+        writer.pin("user")
+        assert reader.read_candidates("user") == [reader_primary]
+        assert len(reader.read_candidates("someone-else")) == 3
+
+        storage_clock.now += 5
+        assert len(reader.read_candidates("user")) == 3
+
+    def test_repeated_write_restarts_the_window(self, clock, uri, storage_clock):
+        writer, _, _ = make_router(clock, pin_store=LimitsPinStore(storage_from_string(uri)))
+        reader, _, _ = make_router(clock, pin_store=LimitsPinStore(storage_from_string(uri)))
+
+        writer.pin("user")
+        storage_clock.now += 4
+        writer.pin("user")
+        storage_clock.now += 4
+        assert reader.is_pinned("user")
+
+    def test_storage_failure_reads_from_primary(self, clock):
+        router, primary, _ = make_router(clock, pin_store=BrokenPinStore())
+        router.pin("writer")
+        assert router.read_candidates("writer") == [primary]
+        assert router.read_candidates("anyone") == [primary]
+
+    def test_storage_errors_are_raised_as_pin_store_errors(self):
+        store = LimitsPinStore(BrokenStorage())
+        with pytest.raises(PinStoreError):
+            store.pin("user", 5)
+        with pytest.raises(PinStoreError):
+            store.is_pinned("user")
+
+
+class TestReadYourWritesPinStore:
+    def settings(self, **update):
+        return get_settings().model_copy(update={"DATABASE_REPLICA_URLS": "postgresql+psycopg://replica/db", **update})
+
+    def test_per_worker_pins_with_one_worker(self):
+        assert read_your_writes_pin_store(self.settings(WEB_CONCURRENCY=1)) is None
+
+    def test_refuses_per_worker_pins_with_several_workers(self):
+        with pytest.raises(RuntimeError, match="DB_READ_YOUR_WRITES_STORAGE_URI"):
+            read_your_writes_pin_store(self.settings(WEB_CONCURRENCY=4))
+
+    def test_shared_storage_with_several_workers(self, tmp_path):
+        store = read_your_writes_pin_store(self.settings(
+            WEB_CONCURRENCY=4,
+            DB_READ_YOUR_WRITES_STORAGE_URI=f"shm://{tmp_path / 'read-your-writes'}",
+        ))
+        assert isinstance(store.storage, SharedMemoryStorage)
+        assert store.storage.wrap_exceptions
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from app.core.request_metrics import (
+    MAX_ROUTES,
+    OTHER_ROUTE,
+    RequestMetrics,
+    collect,
+    render_prometheus,
+)
+
+# No live process has this pid (above the kernel's pid_max)
+DEAD_PID = 2 ** 23
+
+
+@pytest.fixture()
+def metrics():
+    metrics = RequestMetrics()
+    yield metrics
+    metrics.close()
+
+
+def _record(metrics, method="GET", route="/api/tasks/{task_id}", status_code=200, seconds=0.003):
+    metrics.request_started()
+    metrics.request_finished(method, route, status_code, seconds)
+
+
+class TestRequestMetrics:
+    def test_counts_status_classes_and_buckets(self, metrics):
+        _record(metrics)
+        _record(metrics, status_code=404, seconds=0.3)
+        metrics.request_started()
+
+        snapshot = metrics.snapshot()
+        totals = snapshot.routes[("GET", "/api/tasks/{task_id}")]
+        assert totals.statuses == [0, 1, 0, 1, 0]
+        assert sum(totals.buckets) == 2
+        assert totals.buckets[0] == 1
+        assert totals.sum == pytest.approx(0.303)
+        assert snapshot.in_flight == 1
+
+    def test_routes_beyond_the_limit_share_one_slot(self, metrics):
+        for i in range(MAX_ROUTES + 10):
+            _record(metrics, route=f"/r{i}")
+        snapshot = metrics.snapshot()
+        assert len(snapshot.routes) == MAX_ROUTES
+        assert sum(snapshot.routes[("", OTHER_ROUTE)].statuses) == 11
+
+    def test_reopened_file_keeps_totals(self, tmp_path):
+        path = tmp_path / "requests_1.db"
+        first = RequestMetrics(path)
+        _record(first)
+        first.request_started()
+        first.close()
+
+        second = RequestMetrics(path)
+        _record(second)
+        snapshot = second.snapshot()
+        second.close()
+        assert snapshot.routes[("GET", "/api/tasks/{task_id}")].statuses[1] == 2
+        assert snapshot.in_flight == 0
+
+
+class TestCollect:
+    def test_sums_workers_and_ignores_in_flight_of_exited_ones(self, tmp_path):
+        live = RequestMetrics(tmp_path / f"requests_{os.getpid()}.db")
+        exited = RequestMetrics(tmp_path / f"requests_{DEAD_PID}.db")
+        _record(live)
+        live.request_started()
+        _record(exited, status_code=500)
+        exited.request_started()
+        (tmp_path / "unrelated.txt").write_text("x")
+
+        snapshot = collect(str(tmp_path))
+        live.close()
+        exited.close()
+        assert snapshot.processes == 1
+        assert snapshot.in_flight == 1
+        assert snapshot.routes[("GET", "/api/tasks/{task_id}")].statuses == [0, 1, 0, 0, 1]
+
+
+class TestRenderPrometheus:
+    def test_exposition(self, metrics):
+        _record(metrics, seconds=0.02)
+        text = render_prometheus(metrics.snapshot())
+        labels = 'method="GET",route="/api/tasks/{task_id}"'
+        assert f'http_requests_total{{{labels},status="2xx"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+        assert f"http_request_duration_seconds_count{{{labels}}} 1" in text
+        assert "http_requests_in_flight 0" in text
+        assert text.endswith("\n")
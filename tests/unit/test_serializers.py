@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.api.serializers import task_orm_to_public, task_orm_to_row, tasks_json_response
+from app.db.models.task_orm import TaskORM
+from app.main import app
+from app.models.task import TaskPublic, TaskStatus
+
+
+def make_tasks() -> list[TaskORM]:
+    now = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    return [
+        TaskORM(id=uuid4(), title="Plain", description=None, status="pending", due_date=None, created_at=now, updated_at=None),
+        TaskORM(
+            id=uuid4(),
+            title='Ünïcode "quoted" \\ title',
+            description="line\nbreak",
+            status="completed",
+            due_date=datetime(2026, 3, 2),
+            created_at=now,
+            updated_at=now,
+        ),
+    ]
+
+
+def list_response_field():
+    route = next(route for route in app.routes if getattr(route, "path", None) == "/api/tasks" and "GET" in route.methods)
+    return route.response_field
+
+
+class TestTaskOrmToRow:
+    def test_row_has_task_public_fields(self):
+        task = make_tasks()[1]
+        row = task_orm_to_row(task)
+        assert list(row) == list(TaskPublic.model_fields)
+        assert row["status"] == TaskStatus.completed.value
+
+    def test_does_not_rerun_input_validators(self):
+        task = make_tasks()[0]
+        task.title = "  stored as is  "
+        assert task_orm_to_row(task)["title"] == "  stored as is  "
+
+
+class TestTasksJsonResponse:
+    def test_matches_response_model_path_byte_for_byte(self):
+        tasks = make_tasks()
+        content = asyncio.run(serialize_response(
+            field=list_response_field(),
+            response_content=[task_orm_to_public(task) for task in tasks],
+        ))
+        expected = JSONResponse(content).body
+
+        response = tasks_json_response(tasks, Response())
+        assert response.body == expected
+        assert response.media_type == "application/json"
+
+    def test_empty_list(self):
+        assert tasks_json_response([], Response()).body == b"[]"
+
+    def test_carries_over_endpoint_headers(self):
+        endpoint_response = Response()
+        del endpoint_response.headers["content-length"]
+        endpoint_response.headers["ETag"] = '"v1"'
+        endpoint_response.headers["X-Next-Cursor"] = "abc"
+
+        response = tasks_json_response(make_tasks(), endpoint_response)
+        assert response.headers["etag"] == '"v1"'
+        assert response.headers["x-next-cursor"] == "abc"
+        assert response.headers.getlist("content-length") == [str(len(response.body))]
@@ -0,0 +1,79 @@
+import gzip
+
+import pytest
+
+from app.api.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    StaticAssets,
+)
+
+INDEX = b"<!doctype html><html><body><div id='root'></div></body></html>" * 10
+BUNDLE = b"console.log('taskbeacon');\n" * 100
+
+
+@pytest.fixture()
+def dist(tmp_path):
+    root = tmp_path / "dist"
+    (root / "assets").mkdir(parents=True)
+    (root / "index.html").write_bytes(INDEX)
+    (root / "assets" / "index-abc123.js").write_bytes(BUNDLE)
+    (root / "favicon.ico").write_bytes(b"\x00\x01")
+    (tmp_path / "secret.txt").write_text("outside dist")
+    return root
+
+
+@pytest.fixture()
+def assets(dist):
+    return StaticAssets.scan(dist)
+
+
+def _headers(response) -> dict:
+    return {name.decode(): value.decode() for name, value in response.raw_headers}
+
+
+class TestStaticAssets:
+    def test_hashed_assets_are_immutable(self, assets):
+        response = assets.response("assets/index-abc123.js", None, None)
+        headers = _headers(response)
+        assert response.body == BUNDLE
+        assert headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert headers["content-type"].endswith("javascript; charset=utf-8")
+        assert headers["content-length"] == str(len(BUNDLE))
+        assert headers["vary"] == "Accept-Encoding"
+
+    def test_gzip_variant_is_negotiated(self, assets):
+        response = assets.response("assets/index-abc123.js", None, "gzip, deflate")
+        headers = _headers(response)
+        assert headers["content-encoding"] == "gzip"
+        assert gzip.decompress(response.body) == BUNDLE
+        assert headers["etag"] != _headers(assets.response("assets/index-abc123.js", None, None))["etag"]
+
+    def test_small_files_are_not_compressed(self, assets):
+        headers = _headers(assets.response("favicon.ico", None, "gzip"))
+        assert "content-encoding" not in headers
+        assert "vary" not in headers
+
+    def test_unknown_paths_fall_back_to_index(self, assets):
+        response = assets.response("dashboard/settings", None, None)
+        assert response.body == INDEX
+        assert _headers(response)["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+    def test_missing_hashed_asset_is_404(self, assets):
+        assert assets.response("assets/index-old.js", None, None).status_code == 404
+
+    def test_paths_cannot_leave_dist(self, assets):
+        assert "../secret.txt" not in assets.assets
+        for path in ("../secret.txt", "/%2e%2e/secret.txt", "dashboard/../../secret.txt"):
+            assert assets.response(path, None, None).body == INDEX
+        assert assets.response("assets/../../secret.txt", None, None).status_code == 404
+
+    def test_not_modified(self, assets):
+        etag = _headers(assets.response("index.html", None, "gzip"))["etag"]
+        response = assets.response("index.html", etag, None)
+        assert response.status_code == 304
+        assert response.body == b""
+        assert "content-length" not in _headers(response)
+
+    def test_missing_dist_has_no_assets(self, tmp_path):
+        assert StaticAssets.scan(tmp_path / "missing").response("", None, None).status_code == 404
@@ -0,0 +1,74 @@
+import pytest
+
+from app.models.task import TaskBatchUpdate, TaskCreate, TaskStatus, TaskUpdate
+from app.storage.db_tasks import reconcile_task_counters
+from app.storage.db_tasks_async import apply_task_batch, create_task, delete_task, get_task_summary, update_task
+
+
+@pytest.fixture()
+def counts(run_async_db):
+    def _counts(user_id):
+        pending, completed, _ = run_async_db(lambda db: get_task_summary(db, user_id))
+        return pending, completed
+
+    return _counts
+
+
+class TestCounterMaintenance:
+    def test_create_update_delete_keep_counters_in_step(self, run_async_db, counts, make_user):
+        user = make_user()
+        task = run_async_db(
+            lambda db: create_task(db, owner_id=user.id, title="t", description=None, status="pending", due_date=None)
+        )
+        assert counts(user.id) == (1, 0)
+
+        run_async_db(lambda db: update_task(db, task.id, TaskUpdate(status=TaskStatus.completed), owner_id=user.id))
+        assert counts(user.id) == (0, 1)
+
+        # Same status again is not a transition
+        run_async_db(lambda db: update_task(db, task.id, TaskUpdate(status=TaskStatus.completed), owner_id=user.id))
+        assert counts(user.id) == (0, 1)
+
+        run_async_db(lambda db: delete_task(db, task.id, user.id))
+        assert counts(user.id) == (0, 0)
+
+    def test_batch_applies_net_change(self, run_async_db, counts, make_user):
+        user = make_user()
+        created, _, _ = run_async_db(
+            lambda db: apply_task_batch(
+                db,
+                owner_id=user.id,
+                creates=[TaskCreate(title="a"), TaskCreate(title="b"), TaskCreate(title="c", status=TaskStatus.completed)],
+                updates=[],
+                deletes=[],
+            )
+        )
+        assert counts(user.id) == (2, 1)
+
+        run_async_db(
+            lambda db: apply_task_batch(
+                db,
+                owner_id=user.id,
+                creates=[],
+                updates=[TaskBatchUpdate(id=created[0].id, status=TaskStatus.completed), TaskBatchUpdate(id=created[1].id, title="b2")],
+                deletes=[created[2].id],
+            )
+        )
+        assert counts(user.id) == (1, 1)
+
+
+class TestReconcileTaskCounters:
+    def test_fixes_drifted_users_only(self, db_session, run_async_db, counts, make_user, make_task):
+        drifted = make_user(email="drifted@example.com")
+        in_sync = make_user(email="insync@example.com")
+        # make_task writes rows directly, bypassing the counters
+        make_task(drifted.id, status="pending")
+        make_task(drifted.id, status="completed")
+        run_async_db(
+            lambda db: create_task(db, owner_id=in_sync.id, title="t", description=None, status="pending", due_date=None)
+        )
+
+        assert reconcile_task_counters(db_session, [drifted.id, in_sync.id]) == [drifted.id]
+        assert counts(drifted.id) == (1, 1)
+        assert counts(in_sync.id) == (1, 0)
+        assert reconcile_task_counters(db_session, [drifted.id, in_sync.id]) == []
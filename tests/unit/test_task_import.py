@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.api.task_import import TaskImportReader
+from app.core.errors import ImportLimitExceededError, InvalidImportFileError
+from app.models.task import TaskFileFormat
+
+
+async def _body(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def read(file_format, *chunks, chunk_size=100, max_rows=1000, max_errors=100):
+    reader = TaskImportReader(file_format, chunk_size=chunk_size, max_rows=max_rows, max_errors=max_errors)
+
+    async def collect():
+        return [chunk async for chunk in reader.chunks(_body(*chunks))]
+
+    return reader, asyncio.run(collect())
+
+
+class TestNdjson:
+    def test_lines_split_across_chunks(self):
+        reader, chunks = read(TaskFileFormat.ndjson, b'{"title": "a"}\n{"ti', b'tle": "b"}\r\n', b'{"title": "c"}')
+        assert [t.title for chunk in chunks for t in chunk] == ["a", "b", "c"]
+        assert reader.failed == 0
+
+    def test_invalid_lines_are_reported_with_line_numbers(self):
+        body = b'{"title": "ok"}\n\nnot json\n[1]\n{"title": "  "}\n'
+        reader, chunks = read(TaskFileFormat.ndjson, body)
+        assert [t.title for chunk in chunks for t in chunk] == ["ok"]
+        assert [(e.line, e.error) for e in reader.errors[:2]] == [(3, "invalid JSON"), (4, "expected a JSON object")]
+        assert reader.errors[2].line == 5
+        assert reader.errors[2].error.startswith("title:")
+
+    def test_rows_are_chunked(self):
+        body = b"".join(b'{"title": "t%d"}\n' % i for i in range(5))
+        _, chunks = read(TaskFileFormat.ndjson, body, chunk_size=2)
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    def test_error_list_is_capped_but_all_failures_counted(self):
+        reader, _ = read(TaskFileFormat.ndjson, b"x\n" * 5, max_errors=2)
+        assert reader.failed == 5
+        assert len(reader.errors) == 2
+
+    def test_row_limit(self):
+        with pytest.raises(ImportLimitExceededError):
+            read(TaskFileFormat.ndjson, b'{"title": "t"}\n' * 3, max_rows=2)
+
+    def test_rejects_non_utf8(self):
+        with pytest.raises(InvalidImportFileError):
+            read(TaskFileFormat.ndjson, b'{"title": "\xff"}\n')
+
+
+class TestCsv:
+    def test_header_bom_and_extra_columns(self):
+        body = '﻿id,title,status,created_at\r\n1,Task,completed,2020-01-01\r\n'.encode("utf-8")
+        reader, chunks = read(TaskFileFormat.csv, body)
+        task = chunks[0][0]
+        assert (task.title, task.status.value) == ("Task", "completed")
+
+    def test_quoted_field_spanning_lines(self):
+        body = b'title,description\n"Multi, line","first\nsecond"\nNext,\n'
+        reader, chunks = read(TaskFileFormat.csv, body)
+        tasks = chunks[0]
+        assert [(t.title, t.description) for t in tasks] == [("Multi, line", "first\nsecond"), ("Next", None)]
+
+    def test_bad_rows_report_their_starting_line(self):
+        body = b'title,status\nok,pending\n"a\nb",unknown\nonly-one-field\n'
+        reader, chunks = read(TaskFileFormat.csv, body)
+        assert [t.title for t in chunks[0]] == ["ok"]
+        assert [e.line for e in reader.errors] == [3, 5]
+        assert reader.errors[1].error == "expected 2 fields, got 1"
+
+    def test_header_must_name_title(self):
+        with pytest.raises(InvalidImportFileError):
+            read(TaskFileFormat.csv, b"name,status\nx,pending\n")
+
+    def test_empty_file_is_rejected(self):
+        with pytest.raises(InvalidImportFileError):
+            read(TaskFileFormat.csv, b"")
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.auth.user_cache import UserCache, _handle_notification
+from app.models.user import UserPublic
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+def make_user() -> UserPublic:
+    return UserPublic(id=uuid4(), email="user@example.com", created_at=datetime.now(timezone.utc))
+
+
+class TestUserCache:
+    def test_hit_after_put(self, clock):
+        cache = UserCache(10, 60, clock=clock)
+        user = make_user()
+        assert cache.get(user.id) is None
+        cache.put(user, cache.epoch)
+        assert cache.get(user.id) is user
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = UserCache(10, 60, clock=clock)
+        user = make_user()
+        cache.put(user, cache.epoch)
+        clock.now += 60
+        assert cache.get(user.id) is None
+        assert cache.snapshot()["expirations"] == 1
+        assert cache.snapshot()["size"] == 0
+
+    def test_evicts_least_recently_used(self, clock):
+        cache = UserCache(2, 60, clock=clock)
+        first, second, third = make_user(), make_user(), make_user()
+        cache.put(first, cache.epoch)
+        cache.put(second, cache.epoch)
+        cache.get(first.id)
+        cache.put(third, cache.epoch)
+        assert cache.get(second.id) is None
+        assert cache.get(first.id) is first
+        assert cache.evictions == 1
+
+    def test_invalidate_drops_entry_and_stale_lookups(self, clock):
+        cache = UserCache(10, 60, clock=clock)
+        user = make_user()
+        cache.put(user, cache.epoch)
+        epoch = cache.epoch     # A lookup starts reading the user from the database...
+        cache.invalidate(user.id)
+        cache.put(user, epoch)  # ...and finishes after the invalidation: not stored
+        assert cache.get(user.id) is None
+        assert cache.invalidations == 1
+
+    def test_disabled_when_size_is_zero(self, clock):
+        cache = UserCache(0, 60, clock=clock)
+        user = make_user()
+        cache.put(user, cache.epoch)
+        assert cache.get(user.id) is None
+
+
+class TestNotifications:
+    def test_payload_invalidates_user(self, clock):
+        cache = UserCache(10, 60, clock=clock)
+        user, other = make_user(), make_user()
+        cache.put(user, cache.epoch)
+        cache.put(other, cache.epoch)
+        _handle_notification(cache, str(user.id))
+        assert cache.get(user.id) is None
+        assert cache.get(other.id) is other
+
+    def test_unexpected_payload_clears_cache(self, clock):
+        cache = UserCache(10, 60, clock=clock)
+        user = make_user()
+        cache.put(user, cache.epoch)
+        _handle_notification(cache, "not-a-uuid")
+        assert cache.get(user.id) is None